@@ -74,6 +74,7 @@ INSTALLED_APPS = [
     'crispy_forms',
     'crispy_bootstrap5',
     'phonenumber_field',
+    'rest_framework',
     
     # Local
     'curriculum',
@@ -90,6 +91,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'curriculum.middleware.PerfilActualMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -113,6 +115,8 @@ TEMPLATES = [
                 'django.contrib.messages.context_processors.messages',
                 'django.template.context_processors.media',
                 'django.template.context_processors.static',
+                'curriculum.context_processors.csrf_diferido',
+                'curriculum.context_processors.perfil_actual',
             ],
         },
     },
@@ -205,7 +209,8 @@ if not DEBUG and CLOUDINARY_CONFIGURED:
 else:
     MEDIA_URL = '/media/'
     MEDIA_ROOT = BASE_DIR / 'media'
-    DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
+    # curriculum.storage_backends.LocalFirmadoStorage simula URLs firmadas (como Azure) en local
+    DEFAULT_FILE_STORAGE = config('CV_MEDIA_STORAGE', default='django.core.files.storage.FileSystemStorage')
     if not DEBUG:
         print("⚠️ WARNING: Cloudinary not configured in production!")
 
@@ -216,9 +221,12 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880
 # AUTHENTICATION
 # ====================================
 
-LOGIN_URL = 'login'
-LOGIN_REDIRECT_URL = 'dashboard'
-LOGOUT_REDIRECT_URL = 'home'
+LOGIN_URL = 'curriculum:login'
+LOGIN_REDIRECT_URL = 'curriculum:dashboard'
+LOGOUT_REDIRECT_URL = 'curriculum:home'
+
+# Carga el usuario de la sesión junto con su perfil (ver curriculum.backends)
+AUTHENTICATION_BACKENDS = ['curriculum.backends.PerfilBackend']
 
 # ====================================
 # MESSAGES
@@ -241,6 +249,76 @@ MESSAGE_TAGS = {
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
+# ====================================
+# API REST
+# ====================================
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.AllowAny',
+    ],
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'UNAUTHENTICATED_USER': None,
+}
+
+# ====================================
+# VISITAS A CVS PÚBLICOS
+# ====================================
+
+# Segundos entre cada escritura por lotes de los eventos (visitas y descargas)
+CV_VISITAS_INTERVALO = config('CV_VISITAS_INTERVALO', default=5, cast=int)
+
+# ====================================
+# BORRADORES DE FORMULARIOS
+# ====================================
+
+# Segundos entre cada escritura por lotes de los borradores autoguardados
+CV_BORRADORES_INTERVALO = config('CV_BORRADORES_INTERVALO', default=10, cast=int)
+
+# ====================================
+# CACHÉ
+# ====================================
+
+# Compartida por todos los workers: el sitemap, los contadores de la home y
+# las páginas anónimas se invalidan desde el proceso que guardó el cambio.
+# Con REDIS_URL se usa Redis (paquete redis); si no, una tabla de la base de
+# datos creada con `manage.py createcachetable`.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'cv_cache',
+        }
+    }
+
+# ====================================
+# CACHÉ DE PÁGINAS ANÓNIMAS
+# ====================================
+
+# Segundos que se sirven cacheadas la home, el login y el registro a visitantes anónimos
+CV_CACHE_PAGINAS = config('CV_CACHE_PAGINAS', default=300, cast=int)
+
+# ====================================
+# CACHÉ DE URLS DE MEDIA
+# ====================================
+
+# Segundos que se reutiliza la URL resuelta de un archivo (ver curriculum.cache_media)
+CV_MEDIA_URL_TTL = config('CV_MEDIA_URL_TTL', default=3600, cast=int)
+# Máximo de URLs en memoria por proceso; se descartan las menos usadas
+CV_MEDIA_URL_MAX = config('CV_MEDIA_URL_MAX', default=10000, cast=int)
+
 # ====================================
 # PHONE NUMBER
 # ====================================
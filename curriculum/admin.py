@@ -3,6 +3,7 @@ Configuración del Panel de Administración
 """
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
@@ -13,8 +14,48 @@ from .models import (
     Habilidad,
     Proyecto,
     ReferenciaProfesional,
-    Certificacion
+    Certificacion,
+    HabilidadCanonica,
+    AliasHabilidad,
+    ResumenEventosCV,
+    ContadorGlobal,
+    TareaMedia
 )
+from . import cache_media
+from .imagenes import nombre_miniatura, url_miniatura, version_variantes
+
+
+# ======================================
+# MINIATURAS
+# ======================================
+
+class MiniaturasChangeList(ChangeList):
+    """
+    Resuelve de una vez las URLs de las miniaturas de la página; cada fila
+    las toma luego de cache_media sin firmar su URL
+    """
+    def get_results(self, request):
+        super().get_results(request)
+        campo, ancho = self.model_admin.miniatura
+        archivos = [
+            (getattr(obj, campo), getattr(obj, f'{campo}_variantes'))
+            for obj in self.result_list if getattr(obj, campo)
+        ]
+        if archivos:
+            cache_media.urls(archivos[0][0].storage, {
+                nombre_miniatura(archivo, variantes, ancho): version_variantes(variantes)
+                for archivo, variantes in archivos
+            })
+
+
+class MiniaturasAdminMixin:
+    """
+    Para admins con una columna de vista previa: miniatura = (campo, ancho)
+    """
+    miniatura = None
+
+    def get_changelist(self, request, **kwargs):
+        return MiniaturasChangeList
 
 
 # ======================================
@@ -53,8 +94,32 @@ class ProyectoInline(admin.StackedInline):
 # PERFIL PROFESIONAL ADMIN
 # ======================================
 
+class CompletitudFilter(admin.SimpleListFilter):
+    """
+    Filtra por rango de completitud (usa el índice perfil_completitud_idx)
+    """
+    title = 'completitud'
+    parameter_name = 'completitud'
+    RANGOS = {
+        'baja': ('Menos de 50%', 0, 49),
+        'media': ('50% - 79%', 50, 79),
+        'alta': ('80% - 99%', 80, 99),
+        'completa': ('100%', 100, 100),
+    }
+
+    def lookups(self, request, model_admin):
+        return [(clave, etiqueta) for clave, (etiqueta, _, _) in self.RANGOS.items()]
+
+    def queryset(self, request, queryset):
+        if self.value() in self.RANGOS:
+            _, minimo, maximo = self.RANGOS[self.value()]
+            return queryset.filter(completitud__gte=minimo, completitud__lte=maximo)
+        return queryset
+
+
 @admin.register(PerfilProfesional)
-class PerfilProfesionalAdmin(admin.ModelAdmin):
+class PerfilProfesionalAdmin(MiniaturasAdminMixin, admin.ModelAdmin):
+    miniatura = ('foto', 50)
     list_display = [
         'foto_preview',
         'nombre_completo',
@@ -62,11 +127,13 @@ class PerfilProfesionalAdmin(admin.ModelAdmin):
         'email',
         'titulo_profesional',
         'cv_publico_badge',
+        'completitud',
         'fecha_actualizacion'
     ]
     
     list_filter = [
         'cv_publico',
+        CompletitudFilter,
         'nivel_experiencia',
         'fecha_creacion',
         'pais',
@@ -86,7 +153,8 @@ class PerfilProfesionalAdmin(admin.ModelAdmin):
         'fecha_creacion',
         'fecha_actualizacion',
         'foto_preview_large',
-        'ver_cv_publico'
+        'ver_cv_publico',
+        'completitud'
     ]
     
     fieldsets = (
@@ -132,11 +200,16 @@ class PerfilProfesionalAdmin(admin.ModelAdmin):
             )
         }),
         ('Metadata', {
-            'fields': ('fecha_creacion', 'fecha_actualizacion'),
+            'fields': ('completitud', 'fecha_creacion', 'fecha_actualizacion'),
             'classes': ('collapse',)
         }),
     )
     
+    # El changelist ordena por el índice compuesto (fecha_actualizacion, id)
+    # y evita el COUNT(*) completo de la tabla en cada página
+    ordering = ['-fecha_actualizacion', '-id']
+    show_full_result_count = False
+
     inlines = [
         FormacionAcademicaInline,
         ExperienciaProfesionalInline,
@@ -148,7 +221,7 @@ class PerfilProfesionalAdmin(admin.ModelAdmin):
         if obj.foto:
             return format_html(
                 '<img src="{}" width="50" height="50" style="border-radius: 50%; object-fit: cover;" />',
-                obj.foto.url
+                url_miniatura(obj.foto, obj.foto_variantes, 50)
             )
         return format_html('<div style="width: 50px; height: 50px; background: #ddd; border-radius: 50%;"></div>')
     
@@ -158,7 +231,7 @@ class PerfilProfesionalAdmin(admin.ModelAdmin):
         if obj.foto:
             return format_html(
                 '<img src="{}" width="200" height="200" style="border-radius: 10px; object-fit: cover;" />',
-                obj.foto.url
+                url_miniatura(obj.foto, obj.foto_variantes, 200)
             )
         return 'Sin foto'
     
@@ -361,7 +434,8 @@ class HabilidadAdmin(admin.ModelAdmin):
 # ======================================
 
 @admin.register(Proyecto)
-class ProyectoAdmin(admin.ModelAdmin):
+class ProyectoAdmin(MiniaturasAdminMixin, admin.ModelAdmin):
+    miniatura = ('imagen', 80)
     list_display = [
         'imagen_preview',
         'nombre',
@@ -415,7 +489,7 @@ class ProyectoAdmin(admin.ModelAdmin):
         if obj.imagen:
             return format_html(
                 '<img src="{}" width="80" height="45" style="border-radius: 5px; object-fit: cover;" />',
-                obj.imagen.url
+                url_miniatura(obj.imagen, obj.imagen_variantes, 80)
             )
         return '-'
     
@@ -425,7 +499,7 @@ class ProyectoAdmin(admin.ModelAdmin):
         if obj.imagen:
             return format_html(
                 '<img src="{}" width="400" height="225" style="border-radius: 10px; object-fit: cover;" />',
-                obj.imagen.url
+                url_miniatura(obj.imagen, obj.imagen_variantes, 400)
             )
         return 'Sin imagen'
     
@@ -548,3 +622,68 @@ class CertificacionAdmin(admin.ModelAdmin):
         )
     
     vigencia_badge.short_description = 'Estado'
+
+
+
+# ======================================
+# DICCIONARIO DE HABILIDADES ADMIN
+# ======================================
+
+class AliasHabilidadInline(admin.TabularInline):
+    model = AliasHabilidad
+    extra = 1
+    fields = ['alias_normalizado']
+
+
+@admin.register(HabilidadCanonica)
+class HabilidadCanonicaAdmin(admin.ModelAdmin):
+    list_display = [
+        'nombre',
+        'nombre_normalizado',
+        'total_perfiles_publicos'
+    ]
+
+    search_fields = ['nombre', 'nombre_normalizado', 'alias__alias_normalizado']
+    readonly_fields = ['total_perfiles_publicos']
+    ordering = ['-total_perfiles_publicos', 'nombre']
+
+    inlines = [AliasHabilidadInline]
+
+
+
+# ======================================
+# ANALÍTICA ADMIN
+# ======================================
+
+@admin.register(ResumenEventosCV)
+class ResumenEventosCVAdmin(admin.ModelAdmin):
+    list_display = ['perfil', 'tipo', 'granularidad', 'inicio', 'total']
+    list_filter = ['tipo', 'granularidad']
+    list_select_related = ['perfil']
+    search_fields = ['perfil__nombres', 'perfil__apellidos']
+    readonly_fields = ['perfil', 'tipo', 'granularidad', 'inicio', 'total']
+    date_hierarchy = 'inicio'
+    ordering = ['-inicio']
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ContadorGlobal)
+class ContadorGlobalAdmin(admin.ModelAdmin):
+    list_display = ['nombre', 'valor']
+    readonly_fields = ['nombre', 'valor']
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(TareaMedia)
+class TareaMediaAdmin(admin.ModelAdmin):
+    list_display = ['modelo', 'objeto_id', 'estado', 'intentos', 'fecha_actualizacion']
+    list_filter = ['estado', 'modelo']
+    readonly_fields = ['modelo', 'objeto_id', 'intentos', 'error', 'fecha_creacion', 'fecha_actualizacion']
+    ordering = ['-id']
+
+    def has_add_permission(self, request):
+        return False
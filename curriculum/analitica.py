@@ -0,0 +1,189 @@
+"""
+Analítica de CVs públicos: visitas y descargas del PDF
+
+1. Cada evento se acumula en memoria (curriculum.buffer) y se inserta por
+   lotes en EventoCV, una tabla de solo inserción.
+2. `manage.py agregar_eventos_cv` (periódico, Ej: cron cada 5 minutos)
+   marca los eventos pendientes, los suma en ResumenEventosCV por hora, día
+   y mes y elimina los ya sumados pasada la retención.
+3. El dashboard lee solo los resúmenes: su costo depende del número de
+   intervalos mostrados, no del tráfico.
+"""
+
+import operator
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncHour, TruncDay, TruncMonth
+from django.utils import timezone
+
+from .buffer import BufferEscritura
+from .models import PerfilProfesional, EventoCV, ResumenEventosCV, MarcaAgregacion
+
+
+MARCA = 'eventos_cv'
+RETENCION_DIAS = 30
+RETENCION_HORAS_DIAS = 90
+TAMANO_LOTE = 500
+
+GRANULARIDADES = {
+    'hora': TruncHour,
+    'dia': TruncDay,
+    'mes': TruncMonth,
+}
+
+
+# ======================================
+# REGISTRO DE EVENTOS
+# ======================================
+
+def escribir_eventos(pendientes):
+    """
+    Inserta {(perfil_id, tipo): [fechas]} en EventoCV por lotes
+    """
+    perfil_ids = {perfil_id for perfil_id, _ in pendientes}
+    existentes = set(PerfilProfesional.objects.filter(pk__in=perfil_ids).values_list('pk', flat=True))
+    EventoCV.objects.bulk_create(
+        [
+            EventoCV(perfil_id=perfil_id, tipo=tipo, fecha=fecha)
+            for (perfil_id, tipo), fechas in pendientes.items() if perfil_id in existentes
+            for fecha in fechas
+        ],
+        batch_size=TAMANO_LOTE
+    )
+
+
+buffer_eventos = BufferEscritura(
+    escribir_eventos,
+    combinar=operator.add,
+    intervalo=getattr(settings, 'CV_VISITAS_INTERVALO', 5)
+)
+
+
+def registrar_evento(perfil_id, tipo):
+    buffer_eventos.agregar((perfil_id, tipo), [timezone.now()])
+
+
+# ======================================
+# AGREGACIÓN
+# ======================================
+
+def _sumar_resumenes(granularidad, filas):
+    """
+    Suma [(perfil_id, tipo, inicio, total)] a los resúmenes existentes (upsert)
+    """
+    tabla = connection.ops.quote_name(ResumenEventosCV._meta.db_table)
+    with connection.cursor() as cursor:
+        for inicio in range(0, len(filas), TAMANO_LOTE):
+            lote = filas[inicio:inicio + TAMANO_LOTE]
+            cursor.execute(
+                f"INSERT INTO {tabla} (perfil_id, tipo, granularidad, inicio, total) "
+                f"VALUES {', '.join(['(%s, %s, %s, %s, %s)'] * len(lote))} "
+                f"ON CONFLICT (perfil_id, granularidad, inicio, tipo) DO UPDATE SET "
+                f"total = {tabla}.total + excluded.total",
+                [
+                    dato
+                    for perfil_id, tipo, comienzo, total in lote
+                    for dato in (
+                        perfil_id, tipo, granularidad,
+                        connection.ops.adapt_datetimefield_value(comienzo), total
+                    )
+                ]
+            )
+
+
+def agregar_eventos(retencion_dias=RETENCION_DIAS):
+    """
+    Agrega los eventos nuevos y poda los antiguos.
+
+    Returns:
+        (eventos agregados, eventos eliminados)
+    """
+    ahora = timezone.now()
+
+    with transaction.atomic():
+        # El bloqueo sobre la marca serializa las pasadas concurrentes
+        marca, _ = MarcaAgregacion.objects.select_for_update().get_or_create(nombre=MARCA)
+        # Se marca cada evento en vez de avanzar por id: uno con id menor que
+        # se confirme más tarde sigue pendiente y entra en la siguiente pasada
+        total = EventoCV.objects.filter(agregado__isnull=True).update(agregado=ahora)
+
+        if total:
+            nuevos = EventoCV.objects.filter(agregado=ahora)
+            for granularidad, truncar in GRANULARIDADES.items():
+                filas = list(
+                    nuevos.annotate(comienzo=truncar('fecha'))
+                    .values('perfil_id', 'tipo', 'comienzo')
+                    .annotate(total=Count('id'))
+                    .values_list('perfil_id', 'tipo', 'comienzo', 'total')
+                )
+                _sumar_resumenes(granularidad, filas)
+
+        marca.ultima_pasada = ahora
+        marca.save(update_fields=['ultima_pasada'])
+
+    # Solo se podan eventos ya incluidos en los resúmenes
+    eliminados, _ = EventoCV.objects.filter(
+        fecha__lt=ahora - timedelta(days=retencion_dias),
+        agregado__isnull=False
+    ).delete()
+    ResumenEventosCV.objects.filter(
+        granularidad='hora',
+        inicio__lt=ahora - timedelta(days=RETENCION_HORAS_DIAS)
+    ).delete()
+
+    return total, eliminados
+
+
+# ======================================
+# CONSULTAS PARA EL DASHBOARD
+# ======================================
+
+def total_visitas(perfil):
+    """
+    Visitas al CV público desde los resúmenes mensuales; igual que
+    actividad_diaria, no incluye las aún no agregadas
+    """
+    return ResumenEventosCV.objects.filter(
+        perfil=perfil, granularidad='mes', tipo='visita'
+    ).aggregate(total=Sum('total'))['total'] or 0
+
+
+def actividad_diaria(perfil, dias=14):
+    """
+    Visitas y descargas por día de los últimos `dias` días (desde los resúmenes)
+
+    Returns:
+        dict con 'dias' (lista de {'fecha', 'visita', 'descarga_pdf', 'altura'})
+        y los totales de los últimos 7 días
+    """
+    hoy = timezone.localdate()
+    desde = timezone.make_aware(datetime.combine(hoy - timedelta(days=dias - 1), time.min))
+
+    totales = {}
+    for inicio, tipo, total in ResumenEventosCV.objects.filter(
+        perfil=perfil, granularidad='dia', inicio__gte=desde
+    ).values_list('inicio', 'tipo', 'total'):
+        totales[(timezone.localtime(inicio).date(), tipo)] = total
+
+    serie = []
+    for desplazamiento in range(dias - 1, -1, -1):
+        fecha = hoy - timedelta(days=desplazamiento)
+        serie.append({
+            'fecha': fecha,
+            'visita': totales.get((fecha, 'visita'), 0),
+            'descarga_pdf': totales.get((fecha, 'descarga_pdf'), 0),
+        })
+
+    maximo = max([dia['visita'] for dia in serie] + [1])
+    for dia in serie:
+        dia['altura'] = int(dia['visita'] * 100 / maximo)
+
+    semana = serie[-7:]
+    return {
+        'dias': serie,
+        'visitas_semana': sum(dia['visita'] for dia in semana),
+        'descargas_semana': sum(dia['descarga_pdf'] for dia in semana),
+    }
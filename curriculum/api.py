@@ -0,0 +1,202 @@
+"""
+API REST de solo lectura para CVs públicos (v1)
+
+    GET /api/v1/perfiles/                 Listado paginado por cursor
+    GET /api/v1/perfiles/<slug>/          Detalle de un perfil
+
+Parámetros:
+    fields=slug,nombres,...               Campos del perfil
+    fields[experiencias]=cargo,empresa    Campos de una sección
+    include=experiencias,habilidades      Secciones a incluir
+    cursor=...                            Cursor de la página (listado)
+    limite=20                             Tamaño de página (listado, máx. 100)
+
+Cada respuesta lleva un ETag calculado con la versión de los perfiles;
+con If-None-Match se responde 304 sin cargar ni serializar las secciones.
+"""
+
+import hashlib
+
+from django.db.models import Prefetch, prefetch_related_objects
+from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from .models import PerfilProfesional
+from .paginacion import CursorInvalido, PaginadorKeyset
+from .serializers import PerfilPublicoSerializer, SECCIONES
+
+
+VERSION_API = 'v1'
+POR_PAGINA = 20
+POR_PAGINA_MAXIMO = 100
+
+# Columnas que se cargan siempre (clave, ETag y cursor)
+COLUMNAS_BASE = ['id', 'slug', 'version', 'fecha_actualizacion']
+
+
+def _lista(valor):
+    return [parte.strip() for parte in valor.split(',') if parte.strip()]
+
+
+def _validar(campos, disponibles, parametro):
+    desconocidos = [campo for campo in campos if campo not in disponibles]
+    if desconocidos:
+        raise ValidationError({
+            parametro: f"Campos desconocidos: {', '.join(desconocidos)}. "
+                       f"Disponibles: {', '.join(disponibles)}"
+        })
+    return campos
+
+
+class PerfilesAPIBase(APIView):
+    """
+    Lectura de los parámetros fields/include y construcción del snapshot
+    """
+    incluir_por_defecto = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        parametros = request.query_params
+
+        self.campos = None
+        if 'fields' in parametros:
+            self.campos = _validar(
+                _lista(parametros['fields']),
+                PerfilPublicoSerializer.campos_disponibles(),
+                'fields'
+            )
+
+        if 'include' in parametros:
+            self.incluir = _validar(_lista(parametros['include']), list(SECCIONES), 'include')
+        else:
+            self.incluir = list(self.incluir_por_defecto)
+
+        self.campos_secciones = {}
+        for seccion in self.incluir:
+            parametro = f'fields[{seccion}]'
+            if parametro in parametros:
+                self.campos_secciones[seccion] = _validar(
+                    _lista(parametros[parametro]),
+                    SECCIONES[seccion].campos_disponibles(),
+                    parametro
+                )
+
+    def get_queryset(self):
+        campos = self.campos or PerfilPublicoSerializer.campos_disponibles()
+        columnas = set(COLUMNAS_BASE) | set(PerfilPublicoSerializer.columnas(campos))
+        return PerfilProfesional.objects.filter(cv_publico=True).only(*columnas)
+
+    def precargar_secciones(self, perfiles):
+        """
+        Una consulta por sección incluida, sin importar cuántos perfiles haya
+        """
+        prefetches = []
+        for seccion in self.incluir:
+            serializer = SECCIONES[seccion]
+            campos = self.campos_secciones.get(seccion) or serializer.campos_disponibles()
+            columnas = set(serializer.columnas(campos)) | {'id', 'perfil'}
+            modelo = serializer.Meta.model
+            prefetches.append(Prefetch(seccion, queryset=modelo.objects.only(*columnas)))
+        if prefetches:
+            prefetch_related_objects(perfiles, *prefetches)
+
+    def serializar(self, datos, many=False):
+        return PerfilPublicoSerializer(
+            datos,
+            many=many,
+            campos=self.campos,
+            incluir=self.incluir,
+            campos_secciones=self.campos_secciones,
+            context={'request': self.request}
+        ).data
+
+    def calcular_etag(self, perfiles, *extra):
+        """
+        ETag a partir de (id, versión) de los perfiles y de la forma de la respuesta
+        """
+        partes = [
+            VERSION_API,
+            self.request.accepted_renderer.format,
+            ','.join(self.campos or []),
+            ','.join(self.incluir),
+            repr(sorted(self.campos_secciones.items())),
+            *extra,
+        ]
+        partes.extend(f'{perfil.pk}:{perfil.version}' for perfil in perfiles)
+        return quote_etag(hashlib.md5('|'.join(map(str, partes)).encode()).hexdigest())
+
+    def responder(self, datos, etag):
+        response = Response(datos)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+        return response
+
+    def no_modificado(self, etag):
+        """
+        Devuelve una respuesta 304 si el cliente ya tiene esta representación
+        """
+        etags_cliente = parse_etags(self.request.headers.get('If-None-Match', ''))
+        if etag in etags_cliente or '*' in etags_cliente:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response['ETag'] = etag
+            return response
+        return None
+
+
+class PerfilListAPIView(PerfilesAPIBase):
+    """
+    Listado de perfiles públicos, paginado por cursor
+    """
+
+    def get(self, request):
+        try:
+            por_pagina = max(1, min(POR_PAGINA_MAXIMO, int(request.query_params.get('limite', POR_PAGINA))))
+        except ValueError:
+            por_pagina = POR_PAGINA
+
+        try:
+            pagina = PaginadorKeyset(self.get_queryset(), por_pagina).pagina(
+                request.query_params.get('cursor')
+            )
+        except CursorInvalido as error:
+            # Como CursorPagination de DRF
+            raise NotFound(str(error))
+        perfiles = pagina.objetos
+
+        etag = self.calcular_etag(
+            perfiles, por_pagina, pagina.cursor_siguiente, pagina.cursor_anterior
+        )
+        respuesta_304 = self.no_modificado(etag)
+        if respuesta_304:
+            return respuesta_304
+
+        self.precargar_secciones(perfiles)
+        url = request.build_absolute_uri()
+        return self.responder({
+            'siguiente': replace_query_param(url, 'cursor', pagina.cursor_siguiente) if pagina.tiene_siguiente else None,
+            'anterior': replace_query_param(url, 'cursor', pagina.cursor_anterior) if pagina.tiene_anterior else None,
+            'resultados': self.serializar(perfiles, many=True),
+        }, etag)
+
+
+class PerfilDetailAPIView(PerfilesAPIBase):
+    """
+    Detalle de un perfil público con todas sus secciones por defecto
+    """
+    incluir_por_defecto = tuple(SECCIONES)
+
+    def get(self, request, slug):
+        perfil = get_object_or_404(self.get_queryset(), slug=slug)
+
+        etag = self.calcular_etag([perfil])
+        respuesta_304 = self.no_modificado(etag)
+        if respuesta_304:
+            return respuesta_304
+
+        self.precargar_secciones([perfil])
+        return self.responder(self.serializar(perfil), etag)
@@ -0,0 +1,21 @@
+"""
+Backend de autenticación del sistema de CV
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class PerfilBackend(ModelBackend):
+    """
+    ModelBackend que carga el usuario de la sesión junto con su perfil en
+    una sola consulta, así request.user.perfil (y request.perfil) no
+    consultan de nuevo. Sin perfil, el acceso lanza DoesNotExist sin consulta.
+    """
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related('perfil').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,192 @@
+"""
+Autoguardado de formularios en el servidor
+
+forms.js envía solo los campos que cambiaron ({campo: valor}) unos
+segundos después de que el usuario deja de escribir. Los parches se
+combinan en memoria (curriculum.buffer) por usuario y formulario, así que
+cada borrador se escribe como máximo una vez por CV_BORRADORES_INTERVALO
+segundos, sin importar cuántos parches lleguen. Cada vaciado hace una
+lectura y un único upsert (INSERT ... ON CONFLICT) para todos los
+borradores pendientes.
+
+Restaurar un borrador es una sola consulta, combinada con lo que aún esté
+en el buffer. Al guardar el formulario el borrador se descarta: se vacía y
+se anota la fecha del descarte. Cada campo guarda cuándo se recibió, así
+los parches que otro proceso tenía en su buffer antes del descarte no
+reviven el borrador al escribirse. Un formulario sin borrador (ni fila ni
+parches en este proceso) se envía sin escribir nada.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from .buffer import BufferEscritura
+from .models import BorradorFormulario
+
+
+MAX_CLAVE = 200
+MAX_CAMPOS = 100
+MAX_NOMBRE_CAMPO = 100
+MAX_VALOR = 20000
+RETENCION_DIAS = 30
+
+
+# ======================================
+# ESCRITURA
+# ======================================
+
+def _vigentes(datos, marcas, descarte):
+    """
+    Campos recibidos después del último descarte (los demás son de un
+    formulario que ya se envió)
+    """
+    if descarte is None:
+        return dict(datos)
+    limite = descarte.timestamp()
+    return {campo: valor for campo, valor in datos.items() if marcas.get(campo, 0) > limite}
+
+
+def escribir_borradores(pendientes):
+    """
+    Aplica {(usuario_id, clave): {campo: (valor, marca)}} sobre los borradores guardados
+    """
+    usuario_ids = {usuario_id for usuario_id, _ in pendientes}
+    existentes_usuarios = set(User.objects.filter(pk__in=usuario_ids).values_list('pk', flat=True))
+    guardados = {
+        (usuario_id, clave): (datos, marcas, descarte)
+        for usuario_id, clave, datos, marcas, descarte in BorradorFormulario.objects.filter(
+            usuario_id__in=existentes_usuarios,
+            clave__in={clave for _, clave in pendientes}
+        ).values_list('usuario_id', 'clave', 'datos', 'marcas', 'fecha_descarte')
+    }
+
+    ahora = timezone.now()
+    borradores = []
+    for (usuario_id, clave), cambios in pendientes.items():
+        if usuario_id not in existentes_usuarios:
+            continue
+        datos, marcas, descarte = guardados.get((usuario_id, clave), ({}, {}, None))
+        # Parches de otro proceso anteriores al descarte no reviven el borrador
+        nuevos = _vigentes(
+            {campo: valor for campo, (valor, _) in cambios.items()},
+            {campo: marca for campo, (_, marca) in cambios.items()},
+            descarte
+        )
+        if not nuevos:
+            continue
+        datos = {**_vigentes(datos, marcas, descarte), **nuevos}
+        borradores.append(BorradorFormulario(
+            usuario_id=usuario_id,
+            clave=clave,
+            datos=datos,
+            marcas={campo: cambios[campo][1] if campo in nuevos else marcas.get(campo, 0) for campo in datos},
+            fecha_actualizacion=ahora
+        ))
+
+    # fecha_descarte no se sobrescribe: si un descarte llega entre la lectura
+    # y este upsert, obtener() ignora igual los campos anteriores a él
+    BorradorFormulario.objects.bulk_create(
+        borradores,
+        update_conflicts=True,
+        unique_fields=['usuario', 'clave'],
+        update_fields=['datos', 'marcas', 'fecha_actualizacion']
+    )
+
+
+buffer_borradores = BufferEscritura(
+    escribir_borradores,
+    combinar=lambda anterior, nuevo: {**anterior, **nuevo},
+    intervalo=getattr(settings, 'CV_BORRADORES_INTERVALO', 10)
+)
+
+
+def _validar(clave, cambios):
+    if not isinstance(clave, str) or not clave.startswith('/') or len(clave) > MAX_CLAVE:
+        raise ValueError("Clave de formulario no válida.")
+    if not isinstance(cambios, dict) or not cambios or len(cambios) > MAX_CAMPOS:
+        raise ValueError("Los cambios deben ser un objeto con entre 1 y %d campos." % MAX_CAMPOS)
+    for campo, valor in cambios.items():
+        if not campo or len(campo) > MAX_NOMBRE_CAMPO:
+            raise ValueError("Nombre de campo no válido.")
+        valores = valor if isinstance(valor, list) else [valor]
+        if len(valores) > MAX_CAMPOS or not all(
+            isinstance(v, bool) or (isinstance(v, str) and len(v) <= MAX_VALOR) for v in valores
+        ):
+            raise ValueError(f"Valor no válido para '{campo}'.")
+
+
+def guardar_parche(usuario_id, clave, cambios):
+    """
+    Acumula los campos cambiados de un formulario; se escriben en el siguiente vaciado.
+
+    Raises:
+        ValueError: si la clave o los cambios no son válidos
+    """
+    _validar(clave, cambios)
+    marca = timezone.now().timestamp()
+    buffer_borradores.agregar((usuario_id, clave), {campo: (valor, marca) for campo, valor in cambios.items()})
+
+
+def descartar(usuario_id, clave):
+    """
+    Vacía el borrador de un formulario ya enviado. En lugar de borrar la
+    fila se registra la fecha del descarte: otro proceso puede tener
+    parches pendientes (o un vaciado en curso) que, al escribirse, se
+    ignoran por ser anteriores.
+
+    Si no hay fila ni parches en este buffer no se escribe nada: la mayoría
+    de los envíos no tienen borrador.
+    """
+    pendiente = buffer_borradores.quitar((usuario_id, clave))
+    ahora = timezone.now()
+    actualizados = BorradorFormulario.objects.filter(usuario_id=usuario_id, clave=clave).update(
+        datos={}, marcas={}, fecha_descarte=ahora, fecha_actualizacion=ahora
+    )
+    if actualizados or pendiente is None:
+        return
+    # Los parches quitados pudieron llegar también a otro proceso: la fila
+    # con la fecha del descarte hace que se ignoren al escribirse
+    BorradorFormulario.objects.bulk_create(
+        [BorradorFormulario(
+            usuario_id=usuario_id, clave=clave, datos={}, marcas={},
+            fecha_descarte=ahora, fecha_actualizacion=ahora
+        )],
+        update_conflicts=True,
+        unique_fields=['usuario', 'clave'],
+        update_fields=['datos', 'marcas', 'fecha_descarte', 'fecha_actualizacion']
+    )
+
+
+# ======================================
+# LECTURA
+# ======================================
+
+def obtener(usuario_id, clave):
+    """
+    {campo: valor} del borrador de un formulario ({} si no hay)
+    """
+    datos, marcas, descarte = BorradorFormulario.objects.filter(
+        usuario_id=usuario_id, clave=clave
+    ).values_list('datos', 'marcas', 'fecha_descarte').first() or ({}, {}, None)
+    pendientes = buffer_borradores.pendiente((usuario_id, clave), {})
+    return {
+        **_vigentes(datos, marcas, descarte),
+        **_vigentes(
+            {campo: valor for campo, (valor, _) in pendientes.items()},
+            {campo: marca for campo, (_, marca) in pendientes.items()},
+            descarte
+        )
+    }
+
+
+def purgar(retencion_dias=RETENCION_DIAS):
+    """
+    Elimina los borradores abandonados. Devuelve cuántos se eliminaron.
+    """
+    eliminados, _ = BorradorFormulario.objects.filter(
+        fecha_actualizacion__lt=timezone.now() - timedelta(days=retencion_dias)
+    ).delete()
+    return eliminados
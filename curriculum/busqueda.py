@@ -0,0 +1,258 @@
+"""
+Índice de búsqueda de texto completo para los CVs públicos
+
+El índice vive fuera de los modelos de Django y depende del motor:
+- SQLite: tabla virtual FTS5 (rowid = id del perfil)
+- PostgreSQL: tabla con columna tsvector e índice GIN
+
+Solo se indexan perfiles con cv_publico=True. El índice se mantiene de forma
+incremental desde curriculum.signals; nunca se reconstruye por consulta.
+"""
+
+import re
+
+from django.db import connection
+
+
+TABLA_SQLITE = 'curriculum_busqueda_fts'
+TABLA_POSTGRES = 'curriculum_busqueda'
+
+# Máximo de resultados devueltos por una búsqueda
+LIMITE_RESULTADOS = 500
+
+# Tamaño de los lotes al reindexar muchos perfiles
+TAMANO_LOTE = 500
+
+
+def _terminos(consulta):
+    """
+    Extrae los términos de búsqueda válidos de un texto libre
+    """
+    return re.findall(r'\w+', consulta or '')[:10]
+
+
+def construir_documentos(perfil_ids):
+    """
+    Construye los documentos a indexar para una lista de perfiles
+
+    Returns:
+        dict: {perfil_id: {'titulo', 'resumen', 'habilidades', 'experiencia', 'tecnologias'}}
+        Solo incluye perfiles públicos existentes.
+    """
+    from .models import PerfilProfesional, Habilidad, ExperienciaProfesional, Proyecto
+
+    documentos = {}
+    perfiles = PerfilProfesional.objects.filter(
+        pk__in=perfil_ids, cv_publico=True
+    ).values_list('id', 'titulo_profesional', 'resumen_profesional')
+
+    for perfil_id, titulo, resumen in perfiles:
+        documentos[perfil_id] = {
+            'titulo': titulo or '',
+            'resumen': resumen or '',
+            'habilidades': [],
+            'experiencia': [],
+            'tecnologias': [],
+        }
+
+    if not documentos:
+        return documentos
+
+    ids = list(documentos)
+
+    for perfil_id, nombre in Habilidad.objects.filter(perfil_id__in=ids).values_list('perfil_id', 'nombre'):
+        documentos[perfil_id]['habilidades'].append(nombre)
+
+    for perfil_id, cargo, empresa in ExperienciaProfesional.objects.filter(
+        perfil_id__in=ids
+    ).values_list('perfil_id', 'cargo', 'empresa'):
+        documentos[perfil_id]['experiencia'].extend([cargo, empresa])
+
+    for perfil_id, tecnologias in Proyecto.objects.filter(perfil_id__in=ids).values_list('perfil_id', 'tecnologias'):
+        documentos[perfil_id]['tecnologias'].append(tecnologias)
+
+    for doc in documentos.values():
+        for campo in ('habilidades', 'experiencia', 'tecnologias'):
+            doc[campo] = ' '.join(doc[campo])
+
+    return documentos
+
+
+# ======================================
+# BACKEND: SQLITE FTS5
+# ======================================
+
+class BackendSQLite:
+    """
+    Búsqueda con la extensión FTS5 de SQLite
+    """
+    # Pesos bm25 por columna: titulo, resumen, habilidades, experiencia, tecnologias
+    PESOS = (10.0, 2.0, 5.0, 3.0, 3.0)
+
+    def eliminar(self, cursor, perfil_ids):
+        cursor.executemany(
+            f'DELETE FROM {TABLA_SQLITE} WHERE rowid = %s',
+            [(perfil_id,) for perfil_id in perfil_ids]
+        )
+
+    def guardar(self, cursor, documentos):
+        self.eliminar(cursor, documentos.keys())
+        cursor.executemany(
+            f'INSERT INTO {TABLA_SQLITE} '
+            f'(rowid, titulo, resumen, habilidades, experiencia, tecnologias) '
+            f'VALUES (%s, %s, %s, %s, %s, %s)',
+            [
+                (perfil_id, d['titulo'], d['resumen'], d['habilidades'], d['experiencia'], d['tecnologias'])
+                for perfil_id, d in documentos.items()
+            ]
+        )
+
+    def vaciar(self, cursor):
+        cursor.execute(f'DELETE FROM {TABLA_SQLITE}')
+
+    def buscar(self, cursor, terminos, limite):
+        # Cada término como prefijo entre comillas: evita inyectar sintaxis FTS5
+        expresion = ' '.join(f'"{termino}"*' for termino in terminos)
+        pesos = ', '.join(str(p) for p in self.PESOS)
+        cursor.execute(
+            f'SELECT rowid FROM {TABLA_SQLITE} WHERE {TABLA_SQLITE} MATCH %s '
+            f'ORDER BY bm25({TABLA_SQLITE}, {pesos}) LIMIT %s',
+            [expresion, limite]
+        )
+        return [fila[0] for fila in cursor.fetchall()]
+
+
+# ======================================
+# BACKEND: POSTGRESQL TSVECTOR
+# ======================================
+
+class BackendPostgres:
+    """
+    Búsqueda con tsvector + índice GIN de PostgreSQL
+    """
+    CONFIGURACION = 'spanish'
+
+    def eliminar(self, cursor, perfil_ids):
+        cursor.execute(
+            f'DELETE FROM {TABLA_POSTGRES} WHERE perfil_id = ANY(%s)',
+            [list(perfil_ids)]
+        )
+
+    def guardar(self, cursor, documentos):
+        cfg = self.CONFIGURACION
+        cursor.executemany(
+            f'INSERT INTO {TABLA_POSTGRES} (perfil_id, documento) VALUES (%s, '
+            f"setweight(to_tsvector('{cfg}', %s), 'A') || "
+            f"setweight(to_tsvector('{cfg}', %s), 'B') || "
+            f"setweight(to_tsvector('{cfg}', %s || ' ' || %s), 'C') || "
+            f"setweight(to_tsvector('{cfg}', %s), 'D')) "
+            f'ON CONFLICT (perfil_id) DO UPDATE SET documento = EXCLUDED.documento',
+            [
+                (perfil_id, d['titulo'], d['habilidades'], d['experiencia'], d['tecnologias'], d['resumen'])
+                for perfil_id, d in documentos.items()
+            ]
+        )
+
+    def vaciar(self, cursor):
+        cursor.execute(f'TRUNCATE {TABLA_POSTGRES}')
+
+    def buscar(self, cursor, terminos, limite):
+        cfg = self.CONFIGURACION
+        expresion = ' & '.join(f'{termino}:*' for termino in terminos)
+        cursor.execute(
+            f'SELECT perfil_id FROM {TABLA_POSTGRES}, '
+            f"to_tsquery('{cfg}', %s) AS consulta "
+            f'WHERE documento @@ consulta '
+            f'ORDER BY ts_rank(documento, consulta) DESC LIMIT %s',
+            [expresion, limite]
+        )
+        return [fila[0] for fila in cursor.fetchall()]
+
+
+def obtener_backend():
+    """
+    Devuelve el backend correspondiente al motor configurado en DATABASE_URL
+    """
+    if connection.vendor == 'postgresql':
+        return BackendPostgres()
+    return BackendSQLite()
+
+
+# ======================================
+# API PÚBLICA
+# ======================================
+
+def indexar_perfiles(perfil_ids):
+    """
+    Actualiza el índice para los perfiles indicados.
+    Los perfiles privados o eliminados se retiran del índice.
+    """
+    perfil_ids = list(set(perfil_ids))
+    backend = obtener_backend()
+
+    for inicio in range(0, len(perfil_ids), TAMANO_LOTE):
+        lote = perfil_ids[inicio:inicio + TAMANO_LOTE]
+        documentos = construir_documentos(lote)
+        retirados = [perfil_id for perfil_id in lote if perfil_id not in documentos]
+
+        with connection.cursor() as cursor:
+            if retirados:
+                backend.eliminar(cursor, retirados)
+            if documentos:
+                backend.guardar(cursor, documentos)
+
+
+def indexar_perfil(perfil_id):
+    """
+    Actualiza el índice para un único perfil
+    """
+    indexar_perfiles([perfil_id])
+
+
+def retirar_perfil(perfil_id):
+    """
+    Elimina un perfil del índice
+    """
+    with connection.cursor() as cursor:
+        obtener_backend().eliminar(cursor, [perfil_id])
+
+
+def reconstruir_indice():
+    """
+    Vacía y vuelve a poblar el índice con todos los perfiles públicos.
+    Solo para mantenimiento (comando reindexar_cvs).
+    """
+    from .models import PerfilProfesional
+
+    with connection.cursor() as cursor:
+        obtener_backend().vaciar(cursor)
+
+    total = 0
+    lote = []
+    ids = PerfilProfesional.objects.filter(cv_publico=True).values_list('id', flat=True)
+    for perfil_id in ids.iterator(chunk_size=TAMANO_LOTE):
+        lote.append(perfil_id)
+        if len(lote) >= TAMANO_LOTE:
+            indexar_perfiles(lote)
+            total += len(lote)
+            lote = []
+    if lote:
+        indexar_perfiles(lote)
+        total += len(lote)
+
+    return total
+
+
+def buscar_perfiles(consulta, limite=LIMITE_RESULTADOS):
+    """
+    Busca perfiles públicos por texto libre
+
+    Returns:
+        list: ids de PerfilProfesional ordenados por relevancia
+    """
+    terminos = _terminos(consulta)
+    if not terminos:
+        return []
+
+    with connection.cursor() as cursor:
+        return obtener_backend().buscar(cursor, terminos, limite)
@@ -0,0 +1,107 @@
+"""
+Caché de URLs de archivos media
+
+Con Azure (URLs firmadas) o Cloudinary cada `.url` de una foto, imagen o
+certificado firma o arma la URL, y una página muestra decenas: un
+<picture> con sus versiones son hasta 10 URLs por imagen, y el changelist
+del admin pide una vista previa por fila.
+
+Las URLs se guardan en memoria del proceso (LRU de CV_MEDIA_URL_MAX
+entradas con vencimiento de CV_MEDIA_URL_TTL segundos) con la clave
+(storage, nombre del archivo, versión). Si el storage firma URLs que
+expiran (expiration_secs) el vencimiento baja a la mitad de esa duración,
+para no servir nunca una firma caducada.
+
+Uso:
+    cache_media.url(archivo.storage, archivo.name)
+    cache_media.urls(storage, nombres, version)
+    cache_media.urls(storage, {nombre: version})   # Ej: las de una página de filas
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+_entradas = OrderedDict()
+_bloqueo = threading.Lock()
+
+
+def _clave_storage(storage):
+    # __class__ atraviesa el LazyObject de default_storage
+    clase = storage.__class__
+    ubicacion = getattr(storage, 'azure_container', None) or getattr(storage, 'location', '')
+    return f'{clase.__module__}.{clase.__qualname__}:{ubicacion}'
+
+
+def _duracion(storage):
+    duracion = settings.CV_MEDIA_URL_TTL
+    expiracion = getattr(storage, 'expiration_secs', None)
+    if expiracion:
+        duracion = min(duracion, expiracion // 2)
+    return duracion
+
+
+def urls(storage, nombres, version=''):
+    """
+    URLs de varios archivos del mismo storage; resuelve solo las que faltan.
+
+    Args:
+        storage: storage de los archivos (Ej: perfil.foto.storage)
+        nombres: nombres de los archivos en el storage, o dict nombre -> versión
+        version: parte adicional de la clave, para que un archivo
+            reemplazado con el mismo nombre no reutilice su URL (Ej:
+            imagenes.version_variantes)
+
+    Returns:
+        dict nombre -> URL
+    """
+    base = _clave_storage(storage)
+    ahora = time.monotonic()
+    resultado, faltantes = {}, []
+    if not isinstance(nombres, dict):
+        nombres = dict.fromkeys(nombres, version)
+
+    with _bloqueo:
+        for nombre, version_nombre in nombres.items():
+            clave = (base, nombre, version_nombre)
+            entrada = _entradas.get(clave)
+            if entrada is not None and entrada[1] > ahora:
+                _entradas.move_to_end(clave)
+                resultado[nombre] = entrada[0]
+            else:
+                faltantes.append(nombre)
+
+    if not faltantes:
+        return resultado
+
+    # Fuera del bloqueo: firmar puede ser lento
+    vence = ahora + _duracion(storage)
+    nuevas = {nombre: storage.url(nombre) for nombre in faltantes}
+    with _bloqueo:
+        for nombre, valor in nuevas.items():
+            clave = (base, nombre, nombres[nombre])
+            _entradas[clave] = (valor, vence)
+            _entradas.move_to_end(clave)
+        while len(_entradas) > settings.CV_MEDIA_URL_MAX:
+            _entradas.popitem(last=False)
+
+    resultado.update(nuevas)
+    return resultado
+
+
+def url(storage, nombre, version=''):
+    """
+    URL de un archivo del storage
+    """
+    return urls(storage, [nombre], version)[nombre]
+
+
+def limpiar():
+    """
+    Vacía la caché del proceso (Ej: al cambiar de storage en pruebas)
+    """
+    with _bloqueo:
+        _entradas.clear()
@@ -0,0 +1,77 @@
+"""
+Caché de páginas completas para visitantes anónimos (home, login, registro)
+
+Para un visitante anónimo estas páginas son idénticas salvo por el token
+CSRF y los mensajes flash, así que se guardan renderizadas en la caché:
+
+- El HTML cacheado lleva un marcador en lugar del token CSRF; main.js lo
+  reemplaza pidiendo el token real a /csrf/ (ver context_processors).
+- Si hay mensajes pendientes se renderiza la página sin caché para
+  mostrarlos y consumirlos.
+- Usuarios autenticados y peticiones que no son GET/HEAD nunca pasan por
+  la caché.
+- La clave es la ruta más los parámetros de PARAMETROS_CACHEABLES; con
+  cualquier otro parámetro la página se renderiza sin caché, para que
+  `?x=<aleatorio>` no llene la caché ni la esquive.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.http import urlencode
+from django.utils.cache import patch_vary_headers
+
+
+# Valor que {% csrf_token %} imprime en las páginas cacheadas
+CSRF_PENDIENTE = 'csrf-pendiente'
+
+# Parámetros de la query string que cambian la página (Ej: el `next` del login)
+PARAMETROS_CACHEABLES = {'next'}
+
+
+def _clave(request):
+    parametros = urlencode(sorted(request.GET.lists()), doseq=True)
+    url = f"{request.scheme}://{request.get_host()}{request.path}?{parametros}"
+    return f"pagina_anonima:{hashlib.md5(url.encode('utf-8')).hexdigest()}"
+
+
+def es_cacheable(request):
+    return (
+        request.method in ('GET', 'HEAD')
+        and not request.user.is_authenticated
+        and request.GET.keys() <= PARAMETROS_CACHEABLES
+        and not len(get_messages(request))
+    )
+
+
+def cache_anonima(vista):
+    """
+    Sirve la vista desde la caché a visitantes anónimos sin mensajes pendientes
+    """
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        if not es_cacheable(request):
+            return vista(request, *args, **kwargs)
+
+        clave = _clave(request)
+        guardado = cache.get(clave)
+        if guardado is not None:
+            contenido, tipo = guardado
+            response = HttpResponse(contenido, content_type=tipo)
+        else:
+            request.csrf_diferido = True
+            response = vista(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+            # Solo respuestas completas y sin cookies propias (Ej: no una redirección)
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                cache.set(clave, (response.content, response['Content-Type']), settings.CV_CACHE_PAGINAS)
+
+        # Una caché intermedia no debe servir esta versión a un usuario con sesión
+        patch_vary_headers(response, ['Cookie'])
+        return response
+    return envoltura
@@ -0,0 +1,272 @@
+"""
+Escritura masiva de CVs completos (usuario + perfil + secciones)
+
+Los importadores construyen RegistroCV sin guardar; guardar_registros los
+valida uno por uno y escribe los válidos por lotes con bulk_create dentro
+de una transacción. Un registro inválido se reporta y no detiene el lote.
+
+bulk_create no llama a save() ni dispara señales, así que aquí se replica
+lo que hacen (slug, habilidad canónica, fecha_fin de trabajos actuales,
+contadores globales, estadísticas por sección, completitud) y, al
+confirmar la transacción, despues_de_carga_masiva actualiza las
+estructuras derivadas.
+"""
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from . import busqueda, completitud, contadores, estadisticas, habilidades
+from .models import PerfilProfesional, Habilidad, EstadisticasPerfil
+
+
+TAMANO_LOTE = 200
+
+# Secciones del CV (related_name en PerfilProfesional), en orden de escritura
+SECCIONES_CV = [
+    'formacion_academica',
+    'experiencias',
+    'habilidades',
+    'proyectos',
+    'referencias',
+    'certificaciones',
+]
+
+
+class RegistroCV:
+    """
+    Un CV listo para escribir: instancias sin guardar del perfil y sus secciones
+    """
+    def __init__(self, usuario, perfil, secciones=None, referencia=''):
+        self.usuario = usuario
+        self.usuario_nuevo = usuario.pk is None
+        self.perfil = perfil
+        self.secciones = secciones or {}
+        # Identifica el registro en los errores (Ej: "línea 12")
+        self.referencia = referencia
+
+    def objetos_seccion(self):
+        for seccion in SECCIONES_CV:
+            for objeto in self.secciones.get(seccion, []):
+                yield seccion, objeto
+
+
+class ResultadoCarga:
+    """
+    Perfiles creados y errores por registro de una carga masiva
+    """
+    def __init__(self):
+        self.perfiles = []
+        self.errores = []
+
+    def agregar_error(self, referencia, mensaje):
+        self.errores.append((referencia, mensaje))
+
+    def combinar(self, otro):
+        self.perfiles.extend(otro.perfiles)
+        self.errores.extend(otro.errores)
+
+
+# ======================================
+# VALIDACIÓN
+# ======================================
+
+def _mensajes(error):
+    if hasattr(error, 'error_dict'):
+        return [
+            f"{campo}: {mensaje}" if campo != '__all__' else mensaje
+            for campo, mensajes in error.message_dict.items()
+            for mensaje in mensajes
+        ]
+    return list(error.messages)
+
+
+def _validar_instancia(objeto, exclude):
+    """
+    Igual que full_clean() pero sin consultas de unicidad y sin llamar a
+    clean() cuando los campos ya fallan (clean() asume campos válidos)
+    """
+    try:
+        objeto.clean_fields(exclude=exclude)
+        objeto.clean()
+    except ValidationError as error:
+        return _mensajes(error)
+    return []
+
+
+def validar_registro(registro):
+    """
+    Aplica las reglas de los modelos (campos, validadores, clean()).
+    No consulta la base de datos, así que puede ejecutarse en otro proceso.
+
+    Returns:
+        Lista de mensajes de error (vacía si el registro es válido)
+    """
+    errores = []
+    if registro.usuario_nuevo:
+        errores += [
+            f"usuario.{mensaje}"
+            for mensaje in _validar_instancia(registro.usuario, ['password', 'last_login', 'date_joined'])
+        ]
+    errores += _validar_instancia(registro.perfil, ['usuario', 'slug'])
+
+    posiciones = {}
+    for seccion, objeto in registro.objetos_seccion():
+        posiciones[seccion] = posiciones.get(seccion, 0) + 1
+        errores += [
+            f"{seccion}[{posiciones[seccion]}].{mensaje}"
+            for mensaje in _validar_instancia(objeto, ['perfil', 'canonica'])
+        ]
+    return errores
+
+
+def _descartar_conflictos(lote, resultado):
+    """
+    Descarta registros cuyo usuario ya existe o ya tiene perfil (2 consultas por lote)
+    """
+    nombres = [registro.usuario.username for registro in lote if registro.usuario_nuevo]
+    existentes = set(User.objects.filter(username__in=nombres).values_list('username', flat=True))
+
+    usuario_ids = [registro.usuario.pk for registro in lote if not registro.usuario_nuevo]
+    con_perfil = set(
+        PerfilProfesional.objects.filter(usuario_id__in=usuario_ids).values_list('usuario_id', flat=True)
+    )
+
+    validos, vistos = [], set()
+    for registro in lote:
+        usuario = registro.usuario
+        if registro.usuario_nuevo and (usuario.username in existentes or usuario.username in vistos):
+            resultado.agregar_error(registro.referencia, f"El usuario '{usuario.username}' ya existe.")
+        elif not registro.usuario_nuevo and usuario.pk in con_perfil:
+            resultado.agregar_error(registro.referencia, f"El usuario '{usuario.username}' ya tiene un perfil.")
+        else:
+            vistos.add(usuario.username)
+            validos.append(registro)
+    return validos
+
+
+# ======================================
+# ESCRITURA
+# ======================================
+
+def _escribir_lote(lote, canonicas):
+    """
+    Escribe un lote con un bulk_create por modelo. Devuelve ids de perfil creados.
+    """
+    User.objects.bulk_create([registro.usuario for registro in lote if registro.usuario_nuevo])
+
+    perfiles, conteos = [], []
+    for registro in lote:
+        registro.perfil.usuario = registro.usuario
+        if not registro.perfil.slug:
+            registro.perfil.slug = registro.perfil.generar_slug()
+        fila = EstadisticasPerfil(perfil=registro.perfil)
+        for _, objeto in registro.objetos_seccion():
+            campo = estadisticas.CAMPO_DE_MODELO[type(objeto)]
+            setattr(fila, campo, getattr(fila, campo) + 1)
+        completitud.aplicar(registro.perfil, fila)
+        perfiles.append(registro.perfil)
+        conteos.append(fila)
+    PerfilProfesional.objects.bulk_create(perfiles)
+    contadores.ajustar(perfiles=len(perfiles), cvs_publicos=sum(perfil.cv_publico for perfil in perfiles))
+
+    por_modelo = {}
+    for registro in lote:
+        for seccion, objeto in registro.objetos_seccion():
+            objeto.perfil = registro.perfil
+            if seccion == 'experiencias' and objeto.trabajo_actual:
+                objeto.fecha_fin = None
+            if seccion == 'habilidades':
+                normalizado = habilidades.normalizar_nombre(objeto.nombre)
+                if normalizado not in canonicas:
+                    canonicas[normalizado] = habilidades.resolver_canonica(objeto.nombre)
+                objeto.canonica = canonicas[normalizado]
+            por_modelo.setdefault(type(objeto), []).append(objeto)
+
+    for modelo, objetos in por_modelo.items():
+        modelo.objects.bulk_create(objetos)
+
+    EstadisticasPerfil.objects.bulk_create(conteos)
+
+    return [perfil.pk for perfil in perfiles]
+
+
+def _reiniciar(registro):
+    """
+    Tras un rollback las instancias conservan pk; se limpian para reintentar
+    """
+    objetos = [registro.perfil] + [objeto for _, objeto in registro.objetos_seccion()]
+    if registro.usuario_nuevo:
+        objetos.append(registro.usuario)
+    for objeto in objetos:
+        objeto.pk = None
+        objeto._state.adding = True
+
+
+def guardar_registros(registros, tamano_lote=TAMANO_LOTE, validar=True):
+    """
+    Valida y escribe registros por lotes.
+
+    Cada lote va en su propia transacción. Si un lote falla en la base de
+    datos (Ej: un username creado en paralelo), se reintenta registro por
+    registro para aislar el que falla.
+
+    Args:
+        registros: iterable de RegistroCV
+        validar: False si los registros ya se validaron (Ej: en otro proceso)
+
+    Returns:
+        ResultadoCarga
+    """
+    resultado = ResultadoCarga()
+    validos = []
+    for registro in registros:
+        errores = validar_registro(registro) if validar else []
+        if errores:
+            resultado.agregar_error(registro.referencia, '; '.join(errores))
+        else:
+            validos.append(registro)
+
+    canonicas = {}
+    for inicio in range(0, len(validos), tamano_lote):
+        lote = _descartar_conflictos(validos[inicio:inicio + tamano_lote], resultado)
+        if not lote:
+            continue
+        try:
+            with transaction.atomic():
+                perfil_ids = _escribir_lote(lote, canonicas)
+                _programar_derivados(perfil_ids)
+            resultado.perfiles.extend(perfil_ids)
+        except IntegrityError:
+            canonicas.clear()
+            for registro in lote:
+                _reiniciar(registro)
+                try:
+                    with transaction.atomic():
+                        perfil_ids = _escribir_lote([registro], canonicas)
+                        _programar_derivados(perfil_ids)
+                    resultado.perfiles.extend(perfil_ids)
+                except IntegrityError as error:
+                    canonicas.clear()
+                    resultado.agregar_error(registro.referencia, f"Error de base de datos: {error}")
+
+    return resultado
+
+
+# ======================================
+# ESTRUCTURAS DERIVADAS
+# ======================================
+
+def _programar_derivados(perfil_ids):
+    transaction.on_commit(lambda: despues_de_carga_masiva(perfil_ids))
+
+
+def despues_de_carga_masiva(perfil_ids):
+    """
+    Equivalente por lotes de las señales de curriculum.signals para
+    perfiles escritos sin save() (bulk_create / update)
+    """
+    busqueda.indexar_perfiles(perfil_ids)
+    habilidades.recalcular_facetas(
+        Habilidad.objects.filter(perfil_id__in=perfil_ids).values_list('canonica_id', flat=True).distinct()
+    )
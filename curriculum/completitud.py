@@ -0,0 +1,121 @@
+"""
+Completitud del CV basada en reglas
+
+Cada regla da puntos si se cumple; el porcentaje y el detalle de reglas
+cumplidas se guardan en PerfilProfesional.completitud y
+completitud_detalle. Las reglas solo leen campos del perfil y los conteos de
+EstadisticasPerfil, así que evaluarlas no consulta las secciones.
+
+Se recalcula al guardar el perfil (pre_save) y al crear o eliminar
+registros de sección (ver curriculum.signals). Dashboard, utils y los
+filtros de plantilla leen el valor guardado.
+"""
+
+from collections import namedtuple
+
+from .estadisticas import SECCIONES
+from .models import PerfilProfesional, EstadisticasPerfil
+
+
+Regla = namedtuple('Regla', ['clave', 'descripcion', 'puntos', 'cumple'])
+
+REGLAS = [
+    Regla('foto', 'Agrega una foto de perfil', 1,
+          lambda perfil, stats: bool(perfil.foto)),
+    Regla('resumen', 'Escribe tu resumen profesional', 1,
+          lambda perfil, stats: bool(perfil.resumen_profesional)),
+    Regla('formacion', 'Agrega tu formación académica', 2,
+          lambda perfil, stats: stats.formacion > 0),
+    Regla('experiencia', 'Agrega tu experiencia profesional', 2,
+          lambda perfil, stats: stats.experiencias > 0),
+    Regla('habilidades', 'Agrega tus habilidades', 1,
+          lambda perfil, stats: stats.habilidades > 0),
+    Regla('habilidades_5', 'Agrega al menos 5 habilidades', 1,
+          lambda perfil, stats: stats.habilidades >= 5),
+    Regla('proyectos', 'Agrega un proyecto', 1,
+          lambda perfil, stats: stats.proyectos > 0),
+    Regla('certificaciones', 'Agrega una certificación', 1,
+          lambda perfil, stats: stats.certificaciones > 0),
+]
+
+PUNTOS_TOTALES = sum(regla.puntos for regla in REGLAS)
+
+# Campos del perfil que leen las reglas (para cargar solo lo necesario)
+CAMPOS_PERFIL = ['foto', 'resumen_profesional']
+
+
+def evaluar(perfil, stats):
+    """
+    Returns:
+        (porcentaje, {clave: cumplida})
+    """
+    detalle = {regla.clave: regla.cumple(perfil, stats) for regla in REGLAS}
+    puntos = sum(regla.puntos for regla in REGLAS if detalle[regla.clave])
+    return int(puntos * 100 / PUNTOS_TOTALES), detalle
+
+
+def aplicar(perfil, stats):
+    """
+    Calcula la completitud y la asigna a la instancia (sin guardar)
+    """
+    perfil.completitud, perfil.completitud_detalle = evaluar(perfil, stats)
+
+
+def actualizar(perfil_id):
+    """
+    Recalcula y guarda la completitud de un perfil tras un cambio en sus secciones
+    """
+    stats = EstadisticasPerfil.objects.filter(perfil_id=perfil_id).select_related('perfil').only(
+        *SECCIONES,
+        *[f'perfil__{campo}' for campo in CAMPOS_PERFIL],
+        'perfil__completitud',
+        'perfil__completitud_detalle',
+    ).first()
+    if stats is None:
+        return
+
+    perfil = stats.perfil
+    porcentaje, detalle = evaluar(perfil, stats)
+    if (porcentaje, detalle) != (perfil.completitud, perfil.completitud_detalle):
+        # update() no toca fecha_actualizacion ni dispara las señales del perfil
+        PerfilProfesional.objects.filter(pk=perfil_id).update(
+            completitud=porcentaje, completitud_detalle=detalle
+        )
+
+
+def pendientes(perfil):
+    """
+    Reglas no cumplidas, para sugerir qué completar
+    """
+    return [regla for regla in REGLAS if not perfil.completitud_detalle.get(regla.clave)]
+
+
+def recalcular(perfil_ids=None, tamano_lote=500):
+    """
+    Recalcula la completitud guardada (Ej: tras reparar las estadísticas).
+
+    Returns:
+        número de perfiles corregidos
+    """
+    perfiles = PerfilProfesional.objects.select_related('estadisticas').only(
+        *CAMPOS_PERFIL, 'completitud', 'completitud_detalle',
+        *[f'estadisticas__{campo}' for campo in SECCIONES]
+    ).order_by('pk')
+    if perfil_ids is not None:
+        perfiles = perfiles.filter(pk__in=perfil_ids)
+
+    corregidos = []
+    for perfil in perfiles.iterator(chunk_size=tamano_lote):
+        try:
+            stats = perfil.estadisticas
+        except EstadisticasPerfil.DoesNotExist:
+            stats = EstadisticasPerfil()
+        porcentaje, detalle = evaluar(perfil, stats)
+        if (porcentaje, detalle) != (perfil.completitud, perfil.completitud_detalle):
+            perfil.completitud, perfil.completitud_detalle = porcentaje, detalle
+            corregidos.append(perfil)
+
+    PerfilProfesional.objects.bulk_update(
+        corregidos, ['completitud', 'completitud_detalle'], batch_size=tamano_lote
+    )
+    return len(corregidos)
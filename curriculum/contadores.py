@@ -0,0 +1,83 @@
+"""
+Contadores globales de la página principal (perfiles y CVs públicos)
+
+En lugar de contar la tabla de perfiles en cada visita a la home, cada alta,
+baja o cambio de visibilidad ajusta ContadorGlobal con un UPDATE ... F()
+dentro de la misma transacción (ver curriculum.signals y
+curriculum.carga_masiva). La home lee los dos enteros desde la caché.
+
+`manage.py reconciliar_contadores` (periódico, Ej: cron diario) recalcula
+los valores reales y corrige cualquier desviación, por ejemplo escrituras
+hechas con update() o SQL directo que no pasan por las señales.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from .models import PerfilProfesional, ContadorGlobal
+
+
+CLAVE_CACHE = 'contadores:globales'
+TIEMPO_CACHE = 60
+
+CONSULTAS = {
+    'perfiles': lambda: PerfilProfesional.objects.all(),
+    'cvs_publicos': lambda: PerfilProfesional.objects.filter(cv_publico=True),
+}
+
+
+def _invalidar_cache():
+    transaction.on_commit(lambda: cache.delete(CLAVE_CACHE))
+
+
+def ajustar(**deltas):
+    """
+    Suma los deltas a los contadores, Ej: ajustar(perfiles=1, cvs_publicos=-1)
+    """
+    for nombre, delta in deltas.items():
+        if not delta:
+            continue
+        actualizados = ContadorGlobal.objects.filter(nombre=nombre).update(valor=F('valor') + delta)
+        if not actualizados:
+            # Primer uso: se parte del conteo real (que ya incluye este cambio)
+            ContadorGlobal.objects.get_or_create(
+                nombre=nombre, defaults={'valor': CONSULTAS[nombre]().count()}
+            )
+    _invalidar_cache()
+
+
+def reconciliar():
+    """
+    Recalcula los contadores desde la tabla de perfiles.
+
+    Returns:
+        {nombre: (valor anterior o None, valor real)} de los que estaban desviados
+    """
+    corregidos = {}
+    with transaction.atomic():
+        anteriores = dict(
+            ContadorGlobal.objects.select_for_update()
+            .filter(nombre__in=CONSULTAS).values_list('nombre', 'valor')
+        )
+        for nombre, consulta in CONSULTAS.items():
+            real = consulta().count()
+            if anteriores.get(nombre) != real:
+                ContadorGlobal.objects.update_or_create(nombre=nombre, defaults={'valor': real})
+                corregidos[nombre] = (anteriores.get(nombre), real)
+        _invalidar_cache()
+    return corregidos
+
+
+def obtener():
+    """
+    {'perfiles': n, 'cvs_publicos': n}, desde la caché si está disponible
+    """
+    valores = cache.get(CLAVE_CACHE)
+    if valores is None:
+        valores = dict(ContadorGlobal.objects.filter(nombre__in=CONSULTAS).values_list('nombre', 'valor'))
+        if len(valores) < len(CONSULTAS):
+            reconciliar()
+            valores = dict(ContadorGlobal.objects.filter(nombre__in=CONSULTAS).values_list('nombre', 'valor'))
+        cache.set(CLAVE_CACHE, valores, TIEMPO_CACHE)
+    return valores
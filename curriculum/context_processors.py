@@ -0,0 +1,24 @@
+"""
+Context processors del sistema de CV
+"""
+
+from .cache_paginas import CSRF_PENDIENTE
+
+
+def csrf_diferido(request):
+    """
+    En páginas que se van a cachear para anónimos, {% csrf_token %} imprime
+    un marcador en lugar del token real (que es distinto por visitante).
+    Debe ir después del procesador csrf integrado para reemplazarlo.
+    """
+    if getattr(request, 'csrf_diferido', False):
+        return {'csrf_token': CSRF_PENDIENTE}
+    return {}
+
+
+def perfil_actual(request):
+    """
+    {{ perfil_actual }}: perfil del usuario autenticado sin consultas extra
+    (lo carga PerfilActualMiddleware junto con el usuario)
+    """
+    return {'perfil_actual': getattr(request, 'perfil', None)}
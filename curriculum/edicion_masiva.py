@@ -0,0 +1,180 @@
+"""
+Edición masiva de una sección del CV (Ej: 20 habilidades de una vez)
+
+La sección completa se edita con un model formset: todas las filas se
+validan juntas y se escriben en una transacción con un bulk_create, un
+bulk_update y un DELETE, en lugar de un save()/delete() (y sus señales)
+por fila. guardar() prepara las filas como lo harían save() y pre_save
+(fecha_fin de trabajos actuales, habilidad canónica, imágenes subidas) y
+aplica una sola vez los efectos de post_save/post_delete con
+signals.seccion_modificada, la misma función que usan los receptores.
+"""
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.forms import BaseModelFormSet, ModelChoiceField, modelformset_factory
+
+from . import habilidades, media, signals
+from .forms import (
+    FormacionAcademicaForm,
+    ExperienciaProfesionalForm,
+    HabilidadForm,
+    ProyectoForm,
+    ReferenciaProfesionalForm,
+    CertificacionForm,
+)
+from .models import (
+    FormacionAcademica,
+    ExperienciaProfesional,
+    Habilidad,
+    Proyecto,
+    ReferenciaProfesional,
+    Certificacion,
+)
+
+
+FILAS_NUEVAS = 3
+
+# Sección (related_name en PerfilProfesional) -> (modelo, formulario, título)
+SECCIONES = {
+    'formacion_academica': (FormacionAcademica, FormacionAcademicaForm, 'Formación Académica'),
+    'experiencias': (ExperienciaProfesional, ExperienciaProfesionalForm, 'Experiencia Profesional'),
+    'habilidades': (Habilidad, HabilidadForm, 'Habilidades'),
+    'proyectos': (Proyecto, ProyectoForm, 'Proyectos'),
+    'referencias': (ReferenciaProfesional, ReferenciaProfesionalForm, 'Referencias'),
+    'certificaciones': (Certificacion, CertificacionForm, 'Certificaciones'),
+}
+
+
+class FilaExistenteField(ModelChoiceField):
+    """
+    Campo id del formset que resuelve la fila con las ya cargadas por el
+    formset, sin un queryset.get() por fila al validar
+    """
+    def __init__(self, formset, *args, **kwargs):
+        self.formset = formset
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            objeto = self.formset.fila(self.queryset.model._meta.pk.to_python(value))
+        except ValidationError:
+            objeto = None
+        if objeto is None:
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+        return objeto
+
+
+class SeccionFormSet(BaseModelFormSet):
+    """
+    Formset de una sección limitado a las filas del perfil
+    """
+    def __init__(self, *args, perfil, **kwargs):
+        self.perfil = perfil
+        kwargs.setdefault('queryset', self.model.objects.filter(perfil=perfil))
+        super().__init__(*args, **kwargs)
+
+    def fila(self, pk):
+        """
+        Fila del perfil con esa clave, o None; las mismas instancias que
+        usan los formularios del formset
+        """
+        if not hasattr(self, '_filas'):
+            self._filas = {objeto.pk: objeto for objeto in self.get_queryset()}
+        return self._filas.get(pk)
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        nombre = self.model._meta.pk.name
+        campo = form.fields[nombre]
+        form.fields[nombre] = FilaExistenteField(
+            self, campo.queryset, initial=campo.initial, required=False, widget=campo.widget
+        )
+
+
+def formset_de(seccion):
+    """
+    Clase de formset para la sección, o None si no existe
+    """
+    if seccion not in SECCIONES:
+        return None
+    modelo, formulario, _ = SECCIONES[seccion]
+    return modelformset_factory(
+        modelo, form=formulario, formset=SeccionFormSet, extra=FILAS_NUEVAS, can_delete=True
+    )
+
+
+# ======================================
+# ESCRITURA
+# ======================================
+
+def _preparar(objeto, campos, canonicas):
+    """
+    Lo que harían save() y pre_save en cada fila. Devuelve los campos extra a escribir.
+    """
+    extra = set()
+    if isinstance(objeto, ExperienciaProfesional) and objeto.trabajo_actual:
+        objeto.fecha_fin = None
+        extra.add('fecha_fin')
+    if isinstance(objeto, Habilidad) and (objeto.pk is None or 'nombre' in campos):
+        objeto.canonica = canonicas.get(habilidades.normalizar_nombre(objeto.nombre))
+        extra.add('canonica')
+    if type(objeto) in media.CAMPOS and (objeto.pk is None or media.CAMPOS[type(objeto)] in campos):
+        media.normalizar_subida(objeto)
+        if objeto.pk is not None:
+            extra.add(media.descartar_variantes(objeto))
+    return extra
+
+
+@transaction.atomic
+def guardar(formset):
+    """
+    Escribe un formset ya validado con operaciones por lotes.
+
+    Returns:
+        (creadas, actualizadas, eliminadas)
+    """
+    modelo, perfil = formset.model, formset.perfil
+    formset.save(commit=False)
+    nuevos = formset.new_objects
+    eliminados = formset.deleted_objects
+
+    canonicas = {}
+    if modelo is Habilidad:
+        canonicas = habilidades.resolver_canonicas(
+            [objeto.nombre for objeto in nuevos]
+            + [objeto.nombre for objeto, cambios in formset.changed_objects if 'nombre' in cambios]
+        )
+
+    for objeto in nuevos:
+        objeto.perfil = perfil
+        _preparar(objeto, set(), canonicas)
+    modelo.objects.bulk_create(nuevos)
+
+    modificados, campos = [], set()
+    for objeto, cambios in formset.changed_objects:
+        campos.update(cambios)
+        campos.update(_preparar(objeto, cambios, canonicas))
+        modificados.append(objeto)
+    if modificados:
+        # bulk_update no llama a pre_save(): sin esto no se suben los
+        # archivos nuevos ni se mueve fecha_actualizacion (auto_now)
+        campos_modelo = [
+            campo for campo in modelo._meta.concrete_fields
+            if not campo.primary_key and (campo.name in campos or getattr(campo, 'auto_now', False))
+        ]
+        for objeto in modificados:
+            for campo in campos_modelo:
+                setattr(objeto, campo.attname, campo.pre_save(objeto, False))
+        modelo.objects.bulk_update(modificados, [campo.name for campo in campos_modelo])
+
+    if eliminados:
+        # Por el Collector (ninguna tabla apunta a las secciones: no hay
+        # cascadas); el efecto de las bajas se aplica abajo con el resto
+        with signals.bajas_en_lote():
+            modelo.objects.filter(pk__in=[objeto.pk for objeto in eliminados]).delete()
+
+    signals.seccion_modificada(modelo, perfil.pk, nuevos, modificados, eliminados)
+    return len(nuevos), len(modificados), len(eliminados)
@@ -0,0 +1,111 @@
+"""
+Conteos por sección del CV para el dashboard (EstadisticasPerfil)
+
+Cada alta o baja de un registro de sección suma o resta 1 con un
+UPDATE ... F() en la misma transacción (ver curriculum.signals); los
+borrados en cascada pasan por post_delete y la carga masiva escribe la fila
+ya calculada. `manage.py recalcular_estadisticas` recalcula los conteos
+desde las tablas y corrige desviaciones.
+"""
+
+from django.db.models import Count, F
+
+from .models import (
+    PerfilProfesional,
+    FormacionAcademica,
+    ExperienciaProfesional,
+    Habilidad,
+    Proyecto,
+    ReferenciaProfesional,
+    Certificacion,
+    EstadisticasPerfil,
+)
+
+
+# Campo de EstadisticasPerfil -> modelo de la sección
+SECCIONES = {
+    'formacion': FormacionAcademica,
+    'experiencias': ExperienciaProfesional,
+    'habilidades': Habilidad,
+    'proyectos': Proyecto,
+    'certificaciones': Certificacion,
+    'referencias': ReferenciaProfesional,
+}
+
+CAMPO_DE_MODELO = {modelo: campo for campo, modelo in SECCIONES.items()}
+
+TAMANO_LOTE = 500
+
+
+def calcular(perfil_ids):
+    """
+    Conteos reales {perfil_id: {campo: n}} desde las tablas de secciones
+    """
+    conteos = {perfil_id: dict.fromkeys(SECCIONES, 0) for perfil_id in perfil_ids}
+    for campo, modelo in SECCIONES.items():
+        filas = modelo.objects.filter(perfil_id__in=perfil_ids).values('perfil_id').annotate(
+            total=Count('id')
+        ).values_list('perfil_id', 'total')
+        for perfil_id, total in filas:
+            conteos[perfil_id][campo] = total
+    return conteos
+
+
+def ajustar(perfil_id, modelo, delta):
+    """
+    Suma delta al conteo de la sección del modelo para el perfil
+    """
+    campo = CAMPO_DE_MODELO[modelo]
+    actualizados = EstadisticasPerfil.objects.filter(perfil_id=perfil_id).update(
+        **{campo: F(campo) + delta}
+    )
+    # Sin fila (perfil anterior a esta tabla): se crea con los conteos reales,
+    # salvo en bajas, que pueden ser parte del borrado del propio perfil
+    if not actualizados and delta > 0:
+        EstadisticasPerfil.objects.get_or_create(perfil_id=perfil_id, defaults=calcular([perfil_id])[perfil_id])
+
+
+def obtener(perfil):
+    """
+    EstadisticasPerfil del perfil, creándola si no existe
+    """
+    try:
+        return perfil.estadisticas
+    except EstadisticasPerfil.DoesNotExist:
+        estadisticas, _ = EstadisticasPerfil.objects.get_or_create(
+            perfil=perfil, defaults=calcular([perfil.pk])[perfil.pk]
+        )
+        return estadisticas
+
+
+def recalcular(perfil_ids=None):
+    """
+    Recalcula los conteos y corrige las filas desviadas o faltantes.
+
+    Returns:
+        número de filas corregidas o creadas
+    """
+    if perfil_ids is None:
+        perfil_ids = PerfilProfesional.objects.values_list('pk', flat=True)
+    perfil_ids = list(perfil_ids)
+
+    corregidas = 0
+    for inicio in range(0, len(perfil_ids), TAMANO_LOTE):
+        bloque = perfil_ids[inicio:inicio + TAMANO_LOTE]
+        reales = calcular(bloque)
+        existentes = EstadisticasPerfil.objects.in_bulk(bloque)
+
+        nuevas, desviadas = [], []
+        for perfil_id, conteos in reales.items():
+            estadisticas = existentes.get(perfil_id)
+            if estadisticas is None:
+                nuevas.append(EstadisticasPerfil(perfil_id=perfil_id, **conteos))
+            elif any(getattr(estadisticas, campo) != total for campo, total in conteos.items()):
+                for campo, total in conteos.items():
+                    setattr(estadisticas, campo, total)
+                desviadas.append(estadisticas)
+
+        EstadisticasPerfil.objects.bulk_create(nuevas, ignore_conflicts=True)
+        EstadisticasPerfil.objects.bulk_update(desviadas, list(SECCIONES))
+        corregidas += len(nuevas) + len(desviadas)
+    return corregidas
@@ -6,6 +6,7 @@ from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.core.exceptions import ValidationError
+from django.urls import reverse
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Submit, Row, Column, Div, HTML
 from crispy_forms.bootstrap import PrependedText, AppendedText
@@ -18,6 +19,7 @@ from .models import (
     ReferenciaProfesional,
     Certificacion
 )
+from . import subidas
 import re
 
 
@@ -260,11 +262,47 @@ class PerfilProfesionalForm(forms.ModelForm):
 
 
 
+# ======================================
+# CERTIFICADOS SUBIDOS POR FRAGMENTOS
+# ======================================
+
+class SubidaFragmentadaMixin:
+    """
+    Para formularios con campo `certificado`: con `usuario` acepta el archivo
+    ya subido por fragmentos (subidas.js, ver curriculum.subidas) a través
+    del campo oculto certificado_subida en lugar de recibirlo en el POST
+    """
+    def __init__(self, *args, usuario=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.usuario = usuario
+        self.subida = None
+        if usuario is not None:
+            self.fields['certificado_subida'] = forms.UUIDField(required=False, widget=forms.HiddenInput)
+            self.fields['certificado'].widget.attrs['data-subida-url'] = reverse('curriculum:iniciar_subida')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        subida_id = cleaned_data.get('certificado_subida')
+        if subida_id and not self.files.get(self.add_prefix('certificado')):
+            self.subida = subidas.obtener_completa(self.usuario, subida_id)
+            if self.subida is None:
+                self.add_error('certificado', 'La subida del certificado no terminó. Selecciona el archivo de nuevo.')
+            else:
+                cleaned_data['certificado'] = subidas.archivo(self.subida)
+        return cleaned_data
+
+    def save(self, commit=True):
+        instancia = super().save(commit)
+        if commit and self.subida is not None:
+            subidas.finalizar(self.subida, self.cleaned_data['certificado'])
+        return instancia
+
+
 # ======================================
 # FORMULARIO: FORMACIÓN ACADÉMICA
 # ======================================
 
-class FormacionAcademicaForm(forms.ModelForm):
+class FormacionAcademicaForm(SubidaFragmentadaMixin, forms.ModelForm):
     """
     Formulario para educación
     """
@@ -354,7 +392,7 @@ class ExperienciaProfesionalForm(forms.ModelForm):
 # FORMULARIO: HABILIDADES
 # ======================================
 
-class HabilidadForm(forms.ModelForm):
+class HabilidadForm(SubidaFragmentadaMixin, forms.ModelForm):
     """
     Formulario para habilidades
     """
@@ -441,7 +479,7 @@ class ReferenciaProfesionalForm(forms.ModelForm):
 # FORMULARIO: CERTIFICACIONES
 # ======================================
 
-class CertificacionForm(forms.ModelForm):
+class CertificacionForm(SubidaFragmentadaMixin, forms.ModelForm):
     """
     Formulario para certificaciones
     """
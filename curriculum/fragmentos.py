@@ -0,0 +1,127 @@
+"""
+Fragmentos HTML del dashboard para actualizarlo sin recargar la página
+
+Tras crear, editar o eliminar un registro de sección desde el dashboard, la
+vista responde (si la petición trae la cabecera X-Fragmento) con JSON que
+contiene solo los fragmentos afectados (tarjetas de estadísticas, progreso
+y la lista de la sección) y forms.js los reemplaza en el lugar. Sin
+JavaScript las vistas siguen redirigiendo al dashboard completo.
+"""
+
+from django.contrib import messages
+from django.http import JsonResponse
+from django.template.loader import render_to_string
+
+from . import borradores, completitud
+from .estadisticas import obtener as obtener_estadisticas
+from .forms import SubidaFragmentadaMixin
+from .models import PerfilProfesional
+
+
+# Nombre -> (plantilla, función que arma su contexto a partir del perfil)
+FRAGMENTOS = {
+    'estadisticas': (
+        'curriculum/cv/partials/estadisticas.html',
+        lambda perfil: {'stats': obtener_estadisticas(perfil)}
+    ),
+    'progreso': (
+        'curriculum/cv/partials/progreso.html',
+        lambda perfil: {
+            'progreso': perfil.completitud,
+            'pendientes_completitud': completitud.pendientes(perfil),
+        }
+    ),
+    'experiencias': (
+        'curriculum/cv/partials/experiencias.html',
+        lambda perfil: {'ultimas_experiencias': perfil.experiencias.all()[:3]}
+    ),
+    'proyectos': (
+        'curriculum/cv/partials/proyectos.html',
+        lambda perfil: {'ultimos_proyectos': perfil.proyectos.all()[:3]}
+    ),
+}
+
+
+def es_peticion_fragmento(request):
+    return request.headers.get('X-Fragmento') == '1'
+
+
+def contexto(perfil, nombres=FRAGMENTOS):
+    """
+    Contexto combinado de los fragmentos indicados (el dashboard completo usa todos)
+    """
+    resultado = {}
+    for nombre in nombres:
+        resultado.update(FRAGMENTOS[nombre][1](perfil))
+    return resultado
+
+
+def perfil_actual(request):
+    """
+    Perfil leído de nuevo tras una escritura: request.perfil se cargó al
+    inicio de la petición y puede tener la completitud anterior
+    """
+    return PerfilProfesional.objects.select_related('estadisticas').get(usuario=request.user)
+
+
+def renderizar(request, nombres):
+    """
+    {nombre: html} de los fragmentos indicados, con el perfil recién leído
+    """
+    perfil = perfil_actual(request)
+    return {
+        nombre: render_to_string(FRAGMENTOS[nombre][0], FRAGMENTOS[nombre][1](perfil), request=request)
+        for nombre in nombres
+    }
+
+
+class FragmentosSeccionMixin:
+    """
+    Para las vistas de crear/editar/eliminar secciones:
+
+    - GET con X-Fragmento devuelve solo el formulario (para el modal del dashboard)
+    - Éxito con X-Fragmento devuelve JSON con el mensaje y los fragmentos
+      afectados; sin ella, agrega el mensaje y redirige como siempre
+    - Formulario inválido con X-Fragmento devuelve el formulario con errores (400)
+    - Al guardar se descarta el borrador autoguardado del formulario
+    - Los formularios con certificado reciben el usuario para aceptar
+      subidas por fragmentos (forms.SubidaFragmentadaMixin)
+    """
+    fragmentos = ['estadisticas', 'progreso']
+    mensaje_exito = ''
+    template_fragmento = 'curriculum/sections/partials/formulario.html'
+
+    def get_template_names(self):
+        if es_peticion_fragmento(self.request):
+            return [self.template_fragmento]
+        return super().get_template_names()
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        if issubclass(self.get_form_class(), SubidaFragmentadaMixin):
+            kwargs['usuario'] = self.request.user
+        return kwargs
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        accion = 'Editar' if getattr(self, 'object', None) else 'Agregar'
+        context['titulo_fragmento'] = f"{accion} {self.model._meta.verbose_name}"
+        return context
+
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        borradores.descartar(self.request.user.pk, self.request.path)
+        if es_peticion_fragmento(self.request):
+            return JsonResponse({
+                'mensaje': self.mensaje_exito,
+                'fragmentos': renderizar(self.request, self.fragmentos),
+            })
+        if self.mensaje_exito:
+            messages.success(self.request, self.mensaje_exito)
+        return response
+
+    def form_invalid(self, form):
+        response = super().form_invalid(form)
+        if es_peticion_fragmento(self.request):
+            response.status_code = 400
+        return response
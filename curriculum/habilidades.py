@@ -0,0 +1,169 @@
+"""
+Diccionario normalizado de habilidades y facetas por habilidad
+
+Cada Habilidad (texto libre por perfil) se enlaza a una HabilidadCanonica
+mediante su nombre normalizado (sin mayúsculas ni tildes) o un alias
+conocido ("JS" -> "JavaScript"). Los conteos de perfiles públicos por
+habilidad se guardan precalculados en HabilidadCanonica.total_perfiles_publicos.
+"""
+
+import re
+import unicodedata
+
+from django.db.models import Count, Exists, OuterRef
+
+
+# Alias iniciales: nombre canónico -> variantes conocidas
+ALIAS_INICIALES = {
+    'JavaScript': ['js', 'javascript', 'java script', 'ecmascript', 'es6'],
+    'TypeScript': ['ts', 'typescript'],
+    'Python': ['py', 'python', 'python3', 'python 3'],
+    'PostgreSQL': ['postgres', 'postgresql', 'psql', 'pgsql'],
+    'React': ['react', 'reactjs', 'react.js', 'react js'],
+    'Node.js': ['node', 'nodejs', 'node.js', 'node js'],
+    'Vue.js': ['vue', 'vuejs', 'vue.js'],
+    'Django': ['django', 'django framework'],
+    'Kubernetes': ['k8s', 'kubernetes'],
+    'Go': ['go', 'golang'],
+    'C#': ['c#', 'csharp', 'c sharp'],
+    'C++': ['c++', 'cpp'],
+    'HTML': ['html', 'html5'],
+    'CSS': ['css', 'css3'],
+    'SQL': ['sql'],
+    'Inglés': ['ingles', 'english', 'idioma ingles'],
+}
+
+
+def normalizar_nombre(nombre):
+    """
+    Normaliza el nombre de una habilidad para compararlo:
+    sin tildes, en minúsculas y con espacios simples.
+    Conserva '#', '+' y '.' porque distinguen habilidades (C#, C++, Node.js).
+    """
+    texto = unicodedata.normalize('NFKD', nombre or '')
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    texto = texto.casefold()
+    texto = re.sub(r'[^\w#+.]+', ' ', texto)
+    return re.sub(r'\s+', ' ', texto).strip().rstrip('.')
+
+
+def resolver_canonica(nombre):
+    """
+    Devuelve la HabilidadCanonica para un nombre libre, creándola si no existe
+    """
+    from .models import HabilidadCanonica, AliasHabilidad
+
+    normalizado = normalizar_nombre(nombre)
+    if not normalizado:
+        return None
+
+    alias = AliasHabilidad.objects.select_related('canonica').filter(
+        alias_normalizado=normalizado
+    ).first()
+    if alias:
+        return alias.canonica
+
+    canonica, _ = HabilidadCanonica.objects.get_or_create(
+        nombre_normalizado=normalizado,
+        defaults={'nombre': nombre.strip()[:100]}
+    )
+    return canonica
+
+
+def resolver_canonicas(nombres):
+    """
+    Versión por lotes de resolver_canonica, con un número fijo de consultas.
+
+    Returns:
+        {nombre normalizado: HabilidadCanonica}
+    """
+    from .models import HabilidadCanonica, AliasHabilidad
+
+    pendientes = {}
+    for nombre in nombres:
+        normalizado = normalizar_nombre(nombre)
+        if normalizado:
+            pendientes.setdefault(normalizado, nombre.strip()[:100])
+    if not pendientes:
+        return {}
+
+    resultado = {
+        alias.alias_normalizado: alias.canonica
+        for alias in AliasHabilidad.objects.select_related('canonica').filter(alias_normalizado__in=pendientes)
+    }
+    faltantes = set(pendientes) - set(resultado)
+    if faltantes:
+        HabilidadCanonica.objects.bulk_create(
+            [HabilidadCanonica(nombre=pendientes[normalizado], nombre_normalizado=normalizado)
+             for normalizado in faltantes],
+            ignore_conflicts=True
+        )
+        resultado.update({
+            canonica.nombre_normalizado: canonica
+            for canonica in HabilidadCanonica.objects.filter(nombre_normalizado__in=faltantes)
+        })
+    return resultado
+
+
+def recalcular_facetas(canonica_ids):
+    """
+    Recalcula el número de perfiles públicos de las habilidades indicadas.
+    Solo toca las filas afectadas; usa el índice (canonica, nivel, perfil).
+    """
+    from .models import HabilidadCanonica, Habilidad
+
+    canonica_ids = {pk for pk in canonica_ids if pk}
+    if not canonica_ids:
+        return
+
+    totales = dict(
+        Habilidad.objects.filter(
+            canonica_id__in=canonica_ids,
+            perfil__cv_publico=True
+        ).values('canonica').annotate(
+            total=Count('perfil', distinct=True)
+        ).values_list('canonica', 'total')
+    )
+
+    canonicas = list(HabilidadCanonica.objects.filter(pk__in=canonica_ids))
+    for canonica in canonicas:
+        canonica.total_perfiles_publicos = totales.get(canonica.pk, 0)
+    HabilidadCanonica.objects.bulk_update(canonicas, ['total_perfiles_publicos'])
+
+
+def filtrar_por_habilidad(queryset, nombre, nivel_minimo=0):
+    """
+    Filtra un queryset de PerfilProfesional por habilidad y nivel mínimo.
+    Ej: filtrar_por_habilidad(perfiles, 'JS', 80)
+    """
+    from .models import HabilidadCanonica, Habilidad, AliasHabilidad
+
+    normalizado = normalizar_nombre(nombre)
+    canonica_id = AliasHabilidad.objects.filter(
+        alias_normalizado=normalizado
+    ).values_list('canonica_id', flat=True).first()
+    if canonica_id is None:
+        canonica_id = HabilidadCanonica.objects.filter(
+            nombre_normalizado=normalizado
+        ).values_list('id', flat=True).first()
+    if canonica_id is None:
+        return queryset.none()
+
+    return queryset.filter(Exists(
+        Habilidad.objects.filter(
+            perfil=OuterRef('pk'),
+            canonica_id=canonica_id,
+            nivel__gte=nivel_minimo
+        )
+    ))
+
+
+def facetas_habilidades(limite=15):
+    """
+    Habilidades con más perfiles públicos, para barras laterales de filtros
+    """
+    from .models import HabilidadCanonica
+
+    return HabilidadCanonica.objects.filter(
+        total_perfiles_publicos__gt=0
+    ).order_by('-total_perfiles_publicos', 'nombre')[:limite]
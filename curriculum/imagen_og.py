@@ -0,0 +1,187 @@
+"""
+Imágenes Open Graph (1200x630) para compartir CVs públicos en redes sociales
+
+La imagen muestra nombre, título profesional, foto y habilidades principales.
+Se guarda en el storage con una huella de esos datos en el nombre
+(og/<slug>-<huella>.png) y solo se vuelve a generar cuando alguno cambia;
+PerfilProfesional.og_huella recuerda la última huella generada.
+"""
+
+import hashlib
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+from . import cache_media
+
+
+ANCHO, ALTO = 1200, 630
+TAMANO_FOTO = 260
+MARGEN = 70
+MAX_HABILIDADES = 5
+
+COLOR_FONDO = (46, 125, 50)       # --primary-color
+COLOR_FONDO_INFERIOR = (27, 94, 32)
+COLOR_TEXTO = (255, 255, 255)
+COLOR_TEXTO_SUAVE = (200, 230, 201)
+COLOR_ETIQUETA = (255, 255, 255, 40)
+
+FUENTES = {
+    True: ['DejaVuSans-Bold.ttf', 'Arial Bold.ttf', 'arialbd.ttf'],
+    False: ['DejaVuSans.ttf', 'Arial.ttf', 'arial.ttf'],
+}
+
+
+def habilidades_principales(habilidades):
+    """
+    Nombres de las primeras habilidades según el orden del CV
+    """
+    return [habilidad.nombre for habilidad in list(habilidades)[:MAX_HABILIDADES]]
+
+
+def calcular_huella(perfil, habilidades):
+    """
+    Huella de los datos impresos en la imagen
+    """
+    datos = '|'.join([
+        perfil.nombre_completo,
+        perfil.titulo_profesional,
+        perfil.foto.name if perfil.foto else '',
+        ','.join(habilidades),
+    ])
+    return hashlib.sha1(datos.encode('utf-8')).hexdigest()[:16]
+
+
+def ruta_imagen(perfil, huella):
+    return f'og/{perfil.slug}-{huella}.png'
+
+
+def url_vigente(perfil, habilidades):
+    """
+    URL de la imagen ya generada, o None si hay que (re)generarla
+    """
+    huella = calcular_huella(perfil, habilidades)
+    if perfil.og_huella == huella:
+        return cache_media.url(default_storage, ruta_imagen(perfil, huella))
+    return None
+
+
+# ======================================
+# RENDERIZADO
+# ======================================
+
+def _fuente(tamano, negrita=False):
+    for nombre in FUENTES[negrita]:
+        try:
+            return ImageFont.truetype(nombre, tamano)
+        except OSError:
+            continue
+    return ImageFont.load_default(size=tamano)
+
+
+def _recortar(draw, texto, fuente, ancho_maximo):
+    """
+    Recorta el texto con '…' para que quepa en el ancho indicado
+    """
+    if draw.textlength(texto, font=fuente) <= ancho_maximo:
+        return texto
+    while texto and draw.textlength(texto + '…', font=fuente) > ancho_maximo:
+        texto = texto[:-1]
+    return texto.rstrip() + '…'
+
+
+def _foto_circular(perfil):
+    try:
+        with perfil.foto.open('rb') as archivo:
+            foto = Image.open(archivo)
+            foto = ImageOps.exif_transpose(foto).convert('RGB')
+    except (OSError, ValueError):
+        return None
+
+    foto = ImageOps.fit(foto, (TAMANO_FOTO, TAMANO_FOTO), Image.LANCZOS)
+    mascara = Image.new('L', (TAMANO_FOTO, TAMANO_FOTO), 0)
+    ImageDraw.Draw(mascara).ellipse((0, 0, TAMANO_FOTO, TAMANO_FOTO), fill=255)
+    foto.putalpha(mascara)
+    return foto
+
+
+def renderizar(perfil, habilidades):
+    """
+    Dibuja la imagen OG y devuelve los bytes PNG
+    """
+    imagen = Image.new('RGB', (ANCHO, ALTO), COLOR_FONDO)
+    draw = ImageDraw.Draw(imagen, 'RGBA')
+    draw.rectangle((0, ALTO - 90, ANCHO, ALTO), fill=COLOR_FONDO_INFERIOR)
+
+    x = MARGEN
+    foto = _foto_circular(perfil) if perfil.foto else None
+    centro_y = (ALTO - 90) // 2
+    if foto:
+        imagen.paste(foto, (MARGEN, centro_y - TAMANO_FOTO // 2), foto)
+    else:
+        iniciales = f"{perfil.nombres[:1]}{perfil.apellidos[:1]}".upper()
+        caja = (MARGEN, centro_y - TAMANO_FOTO // 2, MARGEN + TAMANO_FOTO, centro_y + TAMANO_FOTO // 2)
+        draw.ellipse(caja, fill=COLOR_FONDO_INFERIOR)
+        draw.text(
+            ((caja[0] + caja[2]) // 2, (caja[1] + caja[3]) // 2),
+            iniciales, font=_fuente(110, negrita=True), fill=COLOR_TEXTO, anchor='mm'
+        )
+    x += TAMANO_FOTO + 60
+    ancho_texto = ANCHO - x - MARGEN
+
+    fuente_nombre = _fuente(64, negrita=True)
+    fuente_titulo = _fuente(36)
+    fuente_habilidad = _fuente(26, negrita=True)
+
+    y = centro_y - 120
+    draw.text((x, y), _recortar(draw, perfil.nombre_completo, fuente_nombre, ancho_texto),
+              font=fuente_nombre, fill=COLOR_TEXTO)
+    y += 90
+    draw.text((x, y), _recortar(draw, perfil.titulo_profesional, fuente_titulo, ancho_texto),
+              font=fuente_titulo, fill=COLOR_TEXTO_SUAVE)
+    y += 80
+
+    # Habilidades como etiquetas, en una sola fila
+    etiqueta_x = x
+    for nombre in habilidades:
+        texto = _recortar(draw, nombre, fuente_habilidad, 260)
+        ancho = draw.textlength(texto, font=fuente_habilidad) + 36
+        if etiqueta_x + ancho > ANCHO - MARGEN:
+            break
+        draw.rounded_rectangle((etiqueta_x, y, etiqueta_x + ancho, y + 48), radius=24, fill=COLOR_ETIQUETA)
+        draw.text((etiqueta_x + 18, y + 24), texto, font=fuente_habilidad, fill=COLOR_TEXTO, anchor='lm')
+        etiqueta_x += ancho + 14
+
+    draw.text((MARGEN, ALTO - 45), 'CV Profesional', font=_fuente(28, negrita=True),
+              fill=COLOR_TEXTO, anchor='lm')
+
+    salida = BytesIO()
+    imagen.save(salida, format='PNG', optimize=True)
+    return salida.getvalue()
+
+
+def obtener_imagen_og(perfil, habilidades):
+    """
+    Devuelve la URL de la imagen OG, generándola si los datos impresos cambiaron
+    """
+    from .models import PerfilProfesional
+
+    url = url_vigente(perfil, habilidades)
+    if url:
+        return url
+
+    huella = calcular_huella(perfil, habilidades)
+    ruta = ruta_imagen(perfil, huella)
+    # Otra petición pudo generarla mientras tanto
+    if not default_storage.exists(ruta):
+        default_storage.save(ruta, ContentFile(renderizar(perfil, habilidades)))
+
+    if perfil.og_huella:
+        default_storage.delete(ruta_imagen(perfil, perfil.og_huella))
+
+    # update() no toca fecha_actualizacion ni la versión del perfil
+    PerfilProfesional.objects.filter(pk=perfil.pk).update(og_huella=huella)
+    perfil.og_huella = huella
+    return cache_media.url(default_storage, ruta)
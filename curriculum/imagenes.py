@@ -0,0 +1,283 @@
+"""
+Normalización de imágenes subidas (foto de perfil e imagen de proyecto)
+
+1. Al subir una imagen se corrige su orientación según EXIF, se descartan
+   los metadatos (EXIF, GPS, datos de la cámara) y se limita a MAX_LADO px
+   por lado. Se guarda como JPEG (PNG si tiene transparencia) en lugar del
+   archivo original de hasta 5 MB.
+2. Después, en segundo plano (curriculum.media), se generan versiones en
+   anchos fijos en WebP (y AVIF si Pillow lo soporta) y JPEG junto al
+   original: profile_photos/<nombre>_<ancho>.webp. De los certificados en
+   PDF se genera una vista previa de la primera página si pypdfium2 está
+   instalado.
+3. Nombre, ancho y alto de cada versión se guardan en un JSONField
+   (foto_variantes / imagen_variantes): las plantillas arman srcset, width
+   y height sin abrir archivos (ver templatetags/imagenes.py). Junto a
+   ellas va una miniatura de ANCHO_LQIP px en base64 que se muestra de
+   fondo mientras la imagen real (con loading="lazy") se descarga, y la
+   versión con que curriculum.cache_media guarda sus URLs.
+
+Mientras no hay variantes (aún en la cola, o subidas antes de esto) las
+plantillas muestran el archivo original; `manage.py generar_variantes_imagenes`
+encola las antiguas.
+"""
+
+import base64
+import logging
+import os
+import time
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from . import cache_media
+
+try:
+    # Registra AVIF en versiones de Pillow sin soporte nativo
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+try:
+    # Opcional: vista previa de certificados en PDF
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+
+logger = logging.getLogger(__name__)
+
+MAX_LADO = 2000
+
+# Campo de imagen -> anchos de las versiones (px). La foto se muestra a
+# 32-180 px; la imagen de proyecto ocupa el ancho de una tarjeta y el
+# certificado es una miniatura.
+ANCHOS = {
+    'foto': (96, 192, 384),
+    'imagen': (400, 800, 1200),
+    'certificado': (160, 320),
+}
+
+CALIDAD = {
+    'avif': 55,
+    'webp': 80,
+    'jpeg': 82,
+}
+
+EXTENSIONES = {
+    'avif': 'avif',
+    'webp': 'webp',
+    'jpeg': 'jpg',
+}
+
+# Marcador de baja calidad: ~300-600 bytes en línea en el HTML
+ANCHO_LQIP = 16
+CALIDAD_LQIP = 40
+
+
+def formatos():
+    """
+    Formatos a generar, del más eficiente al de compatibilidad (siempre JPEG al final)
+    """
+    Image.init()
+    return [formato for formato in CALIDAD if formato.upper() in Image.SAVE]
+
+
+def _tiene_transparencia(imagen):
+    return imagen.mode in ('RGBA', 'LA') or (imagen.mode == 'P' and 'transparency' in imagen.info)
+
+
+def _sin_transparencia(imagen):
+    """
+    Copia RGB; la transparencia se aplana sobre blanco (para JPEG)
+    """
+    if not _tiene_transparencia(imagen):
+        return imagen.convert('RGB')
+    imagen = imagen.convert('RGBA')
+    fondo = Image.new('RGB', imagen.size, (255, 255, 255))
+    fondo.paste(imagen, mask=imagen.getchannel('A'))
+    return fondo
+
+
+# ======================================
+# NORMALIZACIÓN AL SUBIR
+# ======================================
+
+def normalizar(archivo):
+    """
+    Imagen orientada, sin metadatos y de como máximo MAX_LADO px por lado.
+
+    Args:
+        archivo: archivo subido (aún no guardado en el storage)
+
+    Returns:
+        ContentFile .jpg/.png listo para asignar al ImageField, o None si
+        Pillow no puede leerlo (se conserva el archivo tal cual)
+    """
+    try:
+        archivo.seek(0)
+        with Image.open(archivo) as original:
+            # En JPEG decodifica directamente a una escala reducida
+            original.draft('RGB', (MAX_LADO, MAX_LADO))
+            imagen = ImageOps.exif_transpose(original)
+            imagen.thumbnail((MAX_LADO, MAX_LADO), Image.LANCZOS)
+
+            perfil_color = original.info.get('icc_profile')
+            salida = BytesIO()
+            if _tiene_transparencia(imagen):
+                imagen.convert('RGBA').save(salida, 'PNG', optimize=True)
+                extension = 'png'
+            else:
+                imagen.convert('RGB').save(
+                    salida, 'JPEG', quality=90, optimize=True, progressive=True,
+                    icc_profile=perfil_color
+                )
+                extension = 'jpg'
+    except (OSError, Image.DecompressionBombError):
+        logger.warning('No se pudo normalizar la imagen %s', getattr(archivo, 'name', ''))
+        return None
+
+    nombre = os.path.splitext(os.path.basename(archivo.name))[0]
+    return ContentFile(salida.getvalue(), name=f'{nombre}.{extension}')
+
+
+# ======================================
+# VERSIONES PARA SRCSET
+# ======================================
+
+def _abrir(archivo, ancho_maximo):
+    """
+    Imagen RGB/RGBA orientada de un archivo ya guardado; de un PDF, su
+    primera página. None si es un PDF y pypdfium2 no está instalado.
+    """
+    with archivo.open('rb'):
+        if archivo.name.lower().endswith('.pdf'):
+            if pypdfium2 is None:
+                return None
+            documento = pypdfium2.PdfDocument(archivo.read())
+            try:
+                pagina = documento[0]
+                return pagina.render(scale=ancho_maximo / pagina.get_width()).to_pil().convert('RGB')
+            finally:
+                documento.close()
+
+        with Image.open(archivo) as original:
+            # Las imágenes anteriores a la normalización pueden venir rotadas o en CMYK/P
+            imagen = ImageOps.exif_transpose(original)
+            return imagen.convert('RGBA' if _tiene_transparencia(imagen) else 'RGB')
+
+
+def _lqip(imagen):
+    """
+    Data URI de una miniatura JPEG de ANCHO_LQIP px; None si la imagen tiene
+    transparencia (el marcador se vería detrás de ella)
+    """
+    if _tiene_transparencia(imagen):
+        return None
+    miniatura = imagen.convert('RGB')
+    miniatura.thumbnail((ANCHO_LQIP, ANCHO_LQIP), Image.BILINEAR)
+    salida = BytesIO()
+    miniatura.save(salida, 'JPEG', quality=CALIDAD_LQIP, optimize=True)
+    return 'data:image/jpeg;base64,' + base64.b64encode(salida.getvalue()).decode('ascii')
+
+
+def generar_variantes(archivo, campo):
+    """
+    Genera y guarda las versiones de una imagen (o PDF) ya guardada.
+
+    Args:
+        archivo: FieldFile del modelo (Ej: perfil.foto)
+        campo: nombre del campo en ANCHOS
+
+    Returns:
+        {'ancho', 'alto', 'lqip', 'version', 'versiones': {formato: [{'nombre', 'ancho', 'alto'}]}}
+        con las versiones de menor a mayor ancho; {} si no se puede previsualizar
+    """
+    imagen = _abrir(archivo, max(ANCHOS[campo]))
+    if imagen is None:
+        return {}
+
+    storage = archivo.storage
+    base = os.path.splitext(archivo.name)[0]
+    disponibles = formatos()
+    ancho, alto = imagen.size
+    resultado = {
+        'ancho': ancho,
+        'alto': alto,
+        'lqip': _lqip(imagen),
+        # Cambia al regenerarlas aunque los nombres se repitan (storages que sobrescriben)
+        'version': int(time.time()),
+        'versiones': {formato: [] for formato in disponibles},
+    }
+
+    # Nunca se amplía: los anchos mayores que el original se reducen al original
+    for objetivo in sorted({min(valor, ancho) for valor in ANCHOS[campo]}):
+        alto_objetivo = max(1, round(alto * objetivo / ancho))
+        version = imagen if objetivo == ancho else imagen.resize((objetivo, alto_objetivo), Image.LANCZOS)
+
+        for formato in disponibles:
+            salida = BytesIO()
+            if formato == 'jpeg':
+                _sin_transparencia(version).save(
+                    salida, 'JPEG', quality=CALIDAD[formato], optimize=True, progressive=True
+                )
+            else:
+                version.save(salida, formato.upper(), quality=CALIDAD[formato])
+            nombre = storage.save(
+                f'{base}_{objetivo}.{EXTENSIONES[formato]}', ContentFile(salida.getvalue())
+            )
+            resultado['versiones'][formato].append(
+                {'nombre': nombre, 'ancho': objetivo, 'alto': alto_objetivo}
+            )
+
+    return resultado
+
+
+def _nombres(variantes):
+    return {
+        version['nombre']
+        for versiones in (variantes or {}).get('versiones', {}).values()
+        for version in versiones
+    }
+
+
+def eliminar_variantes(storage, variantes, conservar=None):
+    """
+    Borra del storage los archivos de unas variantes (Ej: al reemplazar la imagen).
+    Con un storage que sobrescribe archivos las nuevas pueden tener los mismos
+    nombres; los de `conservar` no se borran.
+    """
+    for nombre in _nombres(variantes) - _nombres(conservar):
+        try:
+            storage.delete(nombre)
+        except OSError:
+            logger.warning('No se pudo borrar la variante %s', nombre)
+
+
+def nombre_miniatura(archivo, variantes, ancho):
+    """
+    Nombre de la versión JPEG más pequeña de al menos `ancho` px; sin
+    variantes, el del archivo original
+    """
+    versiones = (variantes or {}).get('versiones', {}).get('jpeg')
+    if not versiones:
+        return archivo.name
+    return next((version for version in versiones if version['ancho'] >= ancho), versiones[-1])['nombre']
+
+
+def version_variantes(variantes):
+    """
+    Versión de las URLs en curriculum.cache_media; '' sin variantes o si
+    se generaron antes de guardarla
+    """
+    return str((variantes or {}).get('version', ''))
+
+
+def url_miniatura(archivo, variantes, ancho):
+    """
+    URL de nombre_miniatura (Ej: admin)
+    """
+    return cache_media.url(
+        archivo.storage, nombre_miniatura(archivo, variantes, ancho), version_variantes(variantes)
+    )
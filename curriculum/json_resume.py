@@ -0,0 +1,432 @@
+"""
+Exportación e importación de CVs en formato JSON Resume
+https://jsonresume.org/schema
+
+La exportación se emite como JSON Lines (un CV por línea) y recorre los
+perfiles con iterator() por bloques, así que la memoria no crece con el
+número de perfiles. La importación convierte cada CV en un RegistroCV y
+lo escribe con curriculum.carga_masiva.
+"""
+
+import json
+import re
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+
+from . import cache_media
+from .carga_masiva import RegistroCV, ResultadoCarga, guardar_registros, TAMANO_LOTE
+from .habilidades import normalizar_nombre
+from .models import (
+    PerfilProfesional,
+    FormacionAcademica,
+    ExperienciaProfesional,
+    Habilidad,
+    Proyecto,
+    ReferenciaProfesional,
+    Certificacion
+)
+
+
+TAMANO_BLOQUE = 200
+
+# Secciones privadas: solo se exportan en el CV propio
+SECCIONES_PUBLICAS = ['formacion_academica', 'experiencias', 'habilidades', 'proyectos', 'certificaciones']
+SECCIONES_PRIVADAS = SECCIONES_PUBLICAS + ['referencias']
+
+PAISES_ISO = {
+    'Ecuador': 'EC',
+    'Colombia': 'CO',
+    'Perú': 'PE',
+    'Chile': 'CL',
+    'Argentina': 'AR',
+    'México': 'MX',
+    'España': 'ES',
+    'Estados Unidos': 'US',
+}
+
+# Texto de studyType (normalizado) -> nivel de FormacionAcademica
+NIVELES_EDUCACION = [
+    ('doctor', 'doctorado'),
+    ('phd', 'doctorado'),
+    ('maestr', 'maestria'),
+    ('master', 'maestria'),
+    ('mba', 'maestria'),
+    ('especializ', 'especializacion'),
+    ('tecn', 'tecnico'),
+    ('associate', 'tecnico'),
+    ('bachiller', 'bachillerato'),
+    ('high school', 'bachillerato'),
+]
+
+# Niveles de habilidad en texto -> porcentaje
+NIVELES_HABILIDAD = {
+    'basico': 25, 'beginner': 25, 'novice': 25,
+    'intermedio': 50, 'intermediate': 50,
+    'avanzado': 75, 'advanced': 75,
+    'experto': 90, 'expert': 90, 'master': 90, 'nativo': 100, 'native': 100,
+}
+
+
+# ======================================
+# EXPORTACIÓN
+# ======================================
+
+def _fecha(valor):
+    return valor.isoformat() if valor else None
+
+
+def _sin_vacios(datos):
+    return {clave: valor for clave, valor in datos.items() if valor not in (None, '', [], {})}
+
+
+def perfil_a_json_resume(perfil, publico=True, url_absoluta=None):
+    """
+    Convierte un perfil (con secciones precargadas) en un dict JSON Resume.
+
+    Args:
+        publico: excluye teléfono y referencias
+        url_absoluta: función opcional para volver absolutas las URLs de media
+    """
+    url_absoluta = url_absoluta or (lambda url: url)
+
+    perfiles_red = []
+    if perfil.linkedin:
+        perfiles_red.append({'network': 'LinkedIn', 'url': perfil.linkedin})
+    if perfil.github:
+        perfiles_red.append({'network': 'GitHub', 'url': perfil.github})
+
+    basics = _sin_vacios({
+        'name': perfil.nombre_completo,
+        'label': perfil.titulo_profesional,
+        'image': url_absoluta(cache_media.url(perfil.foto.storage, perfil.foto.name)) if perfil.foto else None,
+        'email': perfil.email,
+        'phone': None if publico else str(perfil.telefono or ''),
+        'url': perfil.portafolio_web,
+        'summary': perfil.resumen_profesional,
+        'location': _sin_vacios({
+            'city': perfil.ciudad,
+            'region': perfil.provincia,
+            'countryCode': PAISES_ISO.get(perfil.pais, perfil.pais),
+        }),
+        'profiles': perfiles_red,
+    })
+
+    datos = {
+        'basics': basics,
+        'work': [
+            _sin_vacios({
+                'name': exp.empresa,
+                'position': exp.cargo,
+                'location': f"{exp.ciudad}, {exp.pais}",
+                'startDate': _fecha(exp.fecha_inicio),
+                'endDate': _fecha(exp.fecha_fin),
+                'summary': exp.descripcion,
+                'highlights': [linea.strip() for linea in exp.logros.splitlines() if linea.strip()],
+                'keywords': [t.strip() for t in exp.tecnologias_usadas.split(',') if t.strip()],
+            })
+            for exp in perfil.experiencias.all()
+        ],
+        'education': [
+            _sin_vacios({
+                'institution': edu.institucion,
+                'area': edu.titulo_obtenido,
+                'studyType': edu.get_nivel_display(),
+                'startDate': _fecha(edu.fecha_inicio),
+                'endDate': _fecha(edu.fecha_fin),
+                'score': str(edu.promedio) if edu.promedio is not None else None,
+            })
+            for edu in perfil.formacion_academica.all()
+        ],
+        'skills': [
+            {'name': hab.nombre, 'level': str(hab.nivel)}
+            for hab in perfil.habilidades.all()
+        ],
+        'projects': [
+            _sin_vacios({
+                'name': proyecto.nombre,
+                'description': proyecto.descripcion,
+                'startDate': _fecha(proyecto.fecha_inicio),
+                'endDate': _fecha(proyecto.fecha_fin),
+                'url': proyecto.url_demo or proyecto.url_repositorio,
+                'roles': [proyecto.rol],
+                'keywords': [t.strip() for t in proyecto.tecnologias.split(',') if t.strip()],
+            })
+            for proyecto in perfil.proyectos.all()
+        ],
+        'certificates': [
+            _sin_vacios({
+                'name': cert.nombre,
+                'issuer': cert.institucion,
+                'date': _fecha(cert.fecha_obtencion),
+                'url': cert.url_verificacion,
+            })
+            for cert in perfil.certificaciones.all()
+        ],
+        'meta': {
+            'version': str(perfil.version),
+            'lastModified': perfil.fecha_actualizacion.isoformat() if perfil.fecha_actualizacion else None,
+        },
+    }
+
+    if not publico:
+        # JSON Resume solo define name/reference; el resto son extensiones
+        datos['references'] = [
+            _sin_vacios({
+                'name': ref.nombre_completo,
+                'reference': ref.testimonio,
+                'position': ref.cargo,
+                'company': ref.empresa,
+                'relationship': ref.relacion,
+                'email': ref.email,
+                'phone': str(ref.telefono or ''),
+            })
+            for ref in perfil.referencias.all()
+        ]
+
+    return datos
+
+
+def exportar_json_lines(perfiles, publico=True, url_absoluta=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Genera un CV JSON Resume por línea a partir de un queryset de perfiles.
+    Carga los perfiles por bloques (iterator + prefetch por bloque).
+    """
+    secciones = SECCIONES_PUBLICAS if publico else SECCIONES_PRIVADAS
+    perfiles = perfiles.order_by('pk').prefetch_related(*secciones)
+
+    for perfil in perfiles.iterator(chunk_size=tamano_bloque):
+        datos = perfil_a_json_resume(perfil, publico=publico, url_absoluta=url_absoluta)
+        yield json.dumps(datos, ensure_ascii=False, cls=DjangoJSONEncoder) + '\n'
+
+
+# ======================================
+# IMPORTACIÓN
+# ======================================
+
+def _leer_fecha(valor):
+    """
+    Fechas ISO 8601 de JSON Resume: YYYY-MM-DD, YYYY-MM o YYYY
+    """
+    if not valor:
+        return None
+    coincidencia = re.match(r'^(\d{4})(?:-(\d{1,2}))?(?:-(\d{1,2}))?', str(valor).strip())
+    if not coincidencia:
+        raise ValueError(f"Fecha inválida: {valor}")
+    anio, mes, dia = coincidencia.groups()
+    return date(int(anio), int(mes or 1), int(dia or 1))
+
+
+def _dividir_nombre(nombre):
+    """
+    "Ana María Pérez López" -> ("Ana María", "Pérez López")
+    """
+    partes = (nombre or '').split()
+    if len(partes) < 2:
+        return (partes[0] if partes else ''), ''
+    mitad = len(partes) // 2
+    return ' '.join(partes[:mitad]), ' '.join(partes[mitad:])
+
+
+def _nivel_educacion(texto):
+    normalizado = normalizar_nombre(texto)
+    for fragmento, nivel in NIVELES_EDUCACION:
+        if fragmento in normalizado:
+            return nivel
+    return 'pregrado'
+
+
+def _nivel_habilidad(texto):
+    coincidencia = re.search(r'\d+', str(texto or ''))
+    if coincidencia:
+        return min(100, int(coincidencia.group()))
+    return NIVELES_HABILIDAD.get(normalizar_nombre(texto), 50)
+
+
+def _decimal(valor):
+    try:
+        return Decimal(str(valor)) if valor not in (None, '') else None
+    except InvalidOperation:
+        raise ValueError(f"Número inválido: {valor}")
+
+
+def _pais(ubicacion):
+    codigo = (ubicacion.get('countryCode') or '').upper()
+    for pais, iso in PAISES_ISO.items():
+        if iso == codigo:
+            return pais
+    return ubicacion.get('country') or codigo or 'Ecuador'
+
+
+def _objeto(valor, nombre):
+    if valor in (None, ''):
+        return {}
+    if not isinstance(valor, dict):
+        raise ValueError(f"'{nombre}' debe ser un objeto.")
+    return valor
+
+
+def _objetos(valor, nombre):
+    """
+    Lista de objetos de una sección (Ej: work, basics.profiles)
+    """
+    valor = valor or []
+    if not isinstance(valor, list) or not all(isinstance(elemento, dict) for elemento in valor):
+        raise ValueError(f"'{nombre}' debe ser una lista de objetos.")
+    return valor
+
+
+def json_resume_a_registro(datos, usuario=None, publico=False, referencia=''):
+    """
+    Convierte un CV JSON Resume en un RegistroCV sin guardar.
+
+    Args:
+        usuario: User existente; si no se indica se crea uno nuevo con el email
+                 como username y contraseña inutilizable
+        publico: valor de cv_publico para el perfil importado
+
+    Raises:
+        ValueError si la estructura no es un CV JSON Resume
+        (TypeError/AttributeError si un valor no es del tipo esperado,
+        Ej: "name": 5)
+    """
+    if not isinstance(datos, dict):
+        raise ValueError("Se esperaba un objeto JSON Resume.")
+
+    basics = _objeto(datos.get('basics'), 'basics')
+    ubicacion = _objeto(basics.get('location'), 'basics.location')
+    redes = {
+        (red.get('network') or '').lower(): red.get('url') or ''
+        for red in _objetos(basics.get('profiles'), 'basics.profiles')
+    }
+    email = (basics.get('email') or '').strip()
+    nombres, apellidos = _dividir_nombre(basics.get('name'))
+
+    if usuario is None:
+        usuario = User(username=email.lower(), email=email, first_name=nombres[:150], last_name=apellidos[:150])
+        usuario.set_unusable_password()
+
+    perfil = PerfilProfesional(
+        nombres=nombres,
+        apellidos=apellidos,
+        email=email,
+        telefono=basics.get('phone') or '',
+        titulo_profesional=basics.get('label') or '',
+        resumen_profesional=basics.get('summary') or '',
+        portafolio_web=basics.get('url') or '',
+        linkedin=redes.get('linkedin', ''),
+        github=redes.get('github', ''),
+        ciudad=ubicacion.get('city') or '',
+        provincia=ubicacion.get('region') or '',
+        pais=_pais(ubicacion),
+        cv_publico=publico,
+    )
+
+    secciones = {
+        'experiencias': [
+            ExperienciaProfesional(
+                cargo=trabajo.get('position') or '',
+                empresa=trabajo.get('name') or '',
+                ciudad=(trabajo.get('location') or perfil.ciudad).split(',')[0].strip(),
+                pais=perfil.pais,
+                fecha_inicio=_leer_fecha(trabajo.get('startDate')),
+                fecha_fin=_leer_fecha(trabajo.get('endDate')),
+                trabajo_actual=not trabajo.get('endDate'),
+                descripcion=trabajo.get('summary') or '',
+                logros='\n'.join(trabajo.get('highlights') or []),
+                tecnologias_usadas=', '.join(trabajo.get('keywords') or []),
+            )
+            for trabajo in _objetos(datos.get('work'), 'work')
+        ],
+        'formacion_academica': [
+            FormacionAcademica(
+                nivel=_nivel_educacion(estudio.get('studyType')),
+                titulo_obtenido=estudio.get('area') or estudio.get('studyType') or '',
+                institucion=estudio.get('institution') or '',
+                fecha_inicio=_leer_fecha(estudio.get('startDate')),
+                fecha_fin=_leer_fecha(estudio.get('endDate')),
+                estado='completado' if estudio.get('endDate') else 'cursando',
+                promedio=_decimal(estudio.get('score')),
+            )
+            for estudio in _objetos(datos.get('education'), 'education')
+        ],
+        'habilidades': [
+            Habilidad(
+                nombre=habilidad.get('name') or '',
+                nivel=_nivel_habilidad(habilidad.get('level')),
+            )
+            for habilidad in _objetos(datos.get('skills'), 'skills')
+        ],
+        'proyectos': [
+            Proyecto(
+                nombre=proyecto.get('name') or '',
+                descripcion_corta=(proyecto.get('description') or '')[:200],
+                descripcion=proyecto.get('description') or '',
+                fecha_inicio=_leer_fecha(proyecto.get('startDate')),
+                fecha_fin=_leer_fecha(proyecto.get('endDate')),
+                rol=', '.join(proyecto.get('roles') or [])[:100] or perfil.titulo_profesional[:100],
+                tecnologias=', '.join(proyecto.get('keywords') or []),
+                **(
+                    {'url_repositorio': proyecto['url']}
+                    if re.search(r'github|gitlab|bitbucket', proyecto.get('url') or '')
+                    else {'url_demo': proyecto.get('url') or ''}
+                ),
+            )
+            for proyecto in _objetos(datos.get('projects'), 'projects')
+        ],
+        'certificaciones': [
+            Certificacion(
+                nombre=certificado.get('name') or '',
+                institucion=certificado.get('issuer') or '',
+                fecha_obtencion=_leer_fecha(certificado.get('date')),
+                url_verificacion=certificado.get('url') or '',
+            )
+            for certificado in _objetos(datos.get('certificates'), 'certificates')
+        ],
+        'referencias': [
+            ReferenciaProfesional(
+                nombre_completo=ref.get('name') or '',
+                testimonio=ref.get('reference') or '',
+                cargo=ref.get('position') or '',
+                empresa=ref.get('company') or '',
+                relacion=ref.get('relationship') or '',
+                email=ref.get('email') or '',
+                telefono=ref.get('phone') or '',
+            )
+            for ref in _objetos(datos.get('references'), 'references')
+        ],
+    }
+
+    return RegistroCV(usuario, perfil, secciones, referencia=referencia)
+
+
+def importar_json_lines(lineas, publico=False, tamano_lote=TAMANO_LOTE):
+    """
+    Importa CVs JSON Resume (uno por línea) escribiendo por lotes.
+    Las líneas inválidas se reportan en el resultado sin detener la carga.
+
+    Returns:
+        ResultadoCarga
+    """
+    resultado = ResultadoCarga()
+    pendientes = []
+
+    for numero, linea in enumerate(lineas, 1):
+        if not linea.strip():
+            continue
+        referencia = f"línea {numero}"
+        try:
+            pendientes.append(json_resume_a_registro(json.loads(linea), publico=publico, referencia=referencia))
+        except (ValueError, TypeError, AttributeError) as error:
+            # Ej: un número donde va un texto; se reporta solo esa línea
+            resultado.agregar_error(referencia, str(error))
+
+        if len(pendientes) >= tamano_lote:
+            resultado.combinar(guardar_registros(pendientes, tamano_lote))
+            pendientes = []
+
+    if pendientes:
+        resultado.combinar(guardar_registros(pendientes, tamano_lote))
+    return resultado
@@ -0,0 +1,27 @@
+"""
+Agrega los eventos de CVs en resúmenes por hora, día y mes
+
+Uso (periódico, Ej: cron cada 5 minutos):
+    python manage.py agregar_eventos_cv
+    python manage.py agregar_eventos_cv --retencion-dias 60
+"""
+
+from django.core.management.base import BaseCommand
+
+from curriculum.analitica import agregar_eventos, RETENCION_DIAS
+
+
+class Command(BaseCommand):
+    help = 'Agrega los eventos crudos de CVs en resúmenes y poda los antiguos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retencion-dias', type=int, default=RETENCION_DIAS,
+            help='Días que se conservan los eventos crudos'
+        )
+
+    def handle(self, *args, **options):
+        agregados, eliminados = agregar_eventos(options['retencion_dias'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{agregados} eventos agregados, {eliminados} eventos antiguos eliminados.'
+        ))
@@ -0,0 +1,40 @@
+"""
+Encola la generación de versiones (srcset y vistas previas) de las
+imágenes y certificados que aún no las tienen (Ej: subidos antes de
+existir la normalización) o que no tienen marcador LQIP. Las procesa
+`manage.py procesar_media`.
+
+Uso:
+    python manage.py generar_variantes_imagenes
+    python manage.py generar_variantes_imagenes --todas
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from curriculum import media
+
+
+class Command(BaseCommand):
+    help = 'Encola la generación de variantes de los archivos que no las tienen'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--todas', action='store_true',
+            help='Regenerar también las que ya tienen variantes (Ej: tras cambiar ANCHOS)'
+        )
+
+    def handle(self, *args, **options):
+        for modelo, campo in media.MEDIA.values():
+            pendientes = modelo.objects.exclude(**{campo: ''}).exclude(**{f'{campo}__isnull': True})
+            if not options['todas']:
+                variantes = f'{campo}_variantes'
+                pendientes = pendientes.filter(
+                    Q(**{variantes: {}}) | ~Q(**{f'{variantes}__has_key': 'lqip'})
+                )
+
+            ids = list(pendientes.values_list('pk', flat=True))
+            media.encolar(modelo, ids)
+            self.stdout.write(f'{modelo._meta.verbose_name_plural}: {len(ids)} encolados.')
+
+        self.stdout.write(self.style.SUCCESS('Ejecuta `manage.py procesar_media` para procesarlos.'))
@@ -0,0 +1,255 @@
+"""
+Carga masiva de usuarios con CV completo (cohortes de universidades, bootcamps)
+
+Uso:
+    python manage.py import_cvs cohorte.csv
+    python manage.py import_cvs cohorte.jsonl --lote 1000 --procesos 8 --publicos
+
+Formatos:
+    CSV   Una fila por persona. Columnas: username, password, email, nombres,
+          apellidos, telefono, titulo_profesional, resumen_profesional,
+          ciudad, provincia, pais, nivel_experiencia, anos_experiencia,
+          linkedin, github, portafolio_web, cv_publico y habilidades
+          ("Python:80; Django:70").
+    JSONL Un CV JSON Resume por línea, con "username" y "password" opcionales
+          en la raíz del objeto. Las líneas en blanco se ignoran; "fila N"
+          es el número de línea en el archivo.
+
+Las filas se leen por lotes; cada lote se valida y se le calculan los hashes
+de contraseña en un pool de procesos, y luego se escribe con bulk_create en
+una transacción. Tras cada lote se guarda un punto de control
+(<archivo>.progreso), así que al relanzar el comando continúa donde quedó.
+"""
+
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from curriculum.carga_masiva import RegistroCV, validar_registro, guardar_registros
+from curriculum.json_resume import json_resume_a_registro
+from curriculum.models import PerfilProfesional, Habilidad
+
+
+TAMANO_LOTE = 500
+
+VERDADERO = {'1', 'true', 'si', 'sí', 'yes', 'x'}
+
+
+# ======================================
+# CONVERSIÓN (se ejecuta en los procesos del pool)
+# ======================================
+
+def _iniciar_proceso():
+    # Con el método "spawn" los procesos hijos arrancan sin Django configurado
+    import django
+    django.setup()
+
+
+def _habilidades_csv(texto):
+    """
+    "Python:80; Django:70; Inglés" -> [Habilidad, ...]
+    """
+    resultado = []
+    for parte in (texto or '').split(';'):
+        nombre, _, nivel = parte.partition(':')
+        if nombre.strip():
+            resultado.append(Habilidad(
+                nombre=nombre.strip(),
+                nivel=int(nivel) if nivel.strip().isdigit() else 50
+            ))
+    return resultado
+
+
+def fila_csv_a_registro(fila, publico, referencia):
+    """
+    Convierte una fila CSV (dict) en un RegistroCV sin guardar
+    """
+    valor = lambda campo: (fila.get(campo) or '').strip()
+
+    email = valor('email')
+    usuario = User(
+        username=valor('username') or email.lower(),
+        email=email,
+        first_name=valor('nombres')[:150],
+        last_name=valor('apellidos')[:150],
+    )
+    perfil = PerfilProfesional(
+        nombres=valor('nombres'),
+        apellidos=valor('apellidos'),
+        email=email,
+        telefono=valor('telefono'),
+        titulo_profesional=valor('titulo_profesional'),
+        resumen_profesional=valor('resumen_profesional'),
+        ciudad=valor('ciudad'),
+        provincia=valor('provincia'),
+        pais=valor('pais') or 'Ecuador',
+        nivel_experiencia=valor('nivel_experiencia') or 'mid',
+        anos_experiencia=valor('anos_experiencia') or 0,
+        linkedin=valor('linkedin'),
+        github=valor('github'),
+        portafolio_web=valor('portafolio_web'),
+        cv_publico=publico or valor('cv_publico').lower() in VERDADERO,
+    )
+    registro = RegistroCV(usuario, perfil, {'habilidades': _habilidades_csv(valor('habilidades'))}, referencia)
+    registro.password = valor('password')
+    return registro
+
+
+def linea_json_a_registro(linea, publico, referencia):
+    """
+    Convierte una línea JSON Resume en un RegistroCV sin guardar
+    """
+    datos = json.loads(linea)
+    if not isinstance(datos, dict):
+        raise ValueError("Se esperaba un objeto JSON Resume.")
+
+    usuario = None
+    if datos.get('username'):
+        email = ((datos.get('basics') or {}).get('email') or '').strip()
+        usuario = User(username=datos['username'], email=email)
+
+    registro = json_resume_a_registro(datos, usuario=usuario, publico=publico, referencia=referencia)
+    registro.password = datos.get('password') or ''
+    return registro
+
+
+def preparar_fila(tarea):
+    """
+    Trabajo de cada proceso: convertir, validar y calcular el hash de la contraseña.
+
+    Returns:
+        (referencia, registro, None) si es válida, (referencia, None, error) si no
+    """
+    formato, numero, fila, publico = tarea
+    referencia = f"fila {numero}"
+    try:
+        if formato == 'csv':
+            registro = fila_csv_a_registro(fila, publico, referencia)
+        else:
+            registro = linea_json_a_registro(fila, publico, referencia)
+    except (ValueError, TypeError, AttributeError) as error:
+        # Se reporta como error de la fila: dentro del proceso, una excepción
+        # sin capturar detendría el comando al pedir su .result()
+        return referencia, None, str(error)
+
+    errores = validar_registro(registro)
+    if errores:
+        return referencia, None, '; '.join(errores)
+
+    # make_password(None) genera una contraseña inutilizable
+    registro.usuario.password = make_password(registro.password or None)
+    del registro.password
+    return referencia, registro, None
+
+
+# ======================================
+# PUNTO DE CONTROL
+# ======================================
+
+class PuntoControl:
+    """
+    Última fila procesada de un archivo (en JSONL, su número de línea), guardada junto a él
+    """
+    def __init__(self, archivo, ruta=None):
+        self.archivo = os.path.abspath(archivo)
+        self.ruta = ruta or f"{archivo}.progreso"
+        self.tamano = os.path.getsize(archivo)
+
+    def leer(self):
+        if not os.path.exists(self.ruta):
+            return 0
+        with open(self.ruta, encoding='utf-8') as f:
+            datos = json.load(f)
+        if datos.get('archivo') != self.archivo or datos.get('tamano') != self.tamano:
+            raise CommandError(
+                f"El punto de control {self.ruta} corresponde a otro archivo. "
+                f"Usa --reiniciar para empezar desde el principio."
+            )
+        return datos['filas']
+
+    def guardar(self, filas):
+        temporal = f"{self.ruta}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'archivo': self.archivo, 'tamano': self.tamano, 'filas': filas}, f)
+        os.replace(temporal, self.ruta)
+
+    def eliminar(self):
+        if os.path.exists(self.ruta):
+            os.remove(self.ruta)
+
+
+class Command(BaseCommand):
+    help = 'Crea usuarios con su CV en bloque desde CSV o JSON Lines, con validación en paralelo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Archivo .csv o .jsonl')
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help='Filas por lote y transacción')
+        parser.add_argument('--procesos', type=int, default=os.cpu_count(), help='Procesos de validación')
+        parser.add_argument('--publicos', action='store_true', help='Marcar todos los CVs como públicos')
+        parser.add_argument('--reiniciar', action='store_true', help='Ignorar el punto de control existente')
+        parser.add_argument('--punto-control', help='Ruta del archivo de progreso (por defecto <archivo>.progreso)')
+
+    def handle(self, *args, **options):
+        archivo = options['archivo']
+        if not os.path.exists(archivo):
+            raise CommandError(f"No existe el archivo {archivo}")
+        formato = 'csv' if archivo.lower().endswith('.csv') else 'json'
+        tamano_lote = max(1, options['lote'])
+
+        punto_control = PuntoControl(archivo, options['punto_control'])
+        if options['reiniciar']:
+            punto_control.eliminar()
+        procesadas = punto_control.leer()
+        if procesadas:
+            self.stdout.write(f"Reanudando desde la fila {procesadas + 1}.")
+
+        creados = errores = 0
+
+        # Los procesos hijos no deben heredar conexiones abiertas
+        connections.close_all()
+
+        with open(archivo, encoding='utf-8-sig', newline='') as f, \
+                ProcessPoolExecutor(max_workers=options['procesos'], initializer=_iniciar_proceso) as pool:
+            # Se numera antes de saltar las líneas en blanco para que "fila N" sea la línea N
+            if formato == 'csv':
+                filas = enumerate(csv.DictReader(f), 1)
+            else:
+                filas = ((numero, linea) for numero, linea in enumerate(f, 1) if linea.strip())
+            filas = ((numero, fila) for numero, fila in filas if numero > procesadas)
+
+            while True:
+                lote = list(islice(filas, tamano_lote))
+                if not lote:
+                    break
+
+                tareas = [(formato, numero, fila, options['publicos']) for numero, fila in lote]
+                registros = []
+                tamano_bloque = max(1, len(tareas) // (options['procesos'] * 4))
+                for referencia, registro, error in pool.map(preparar_fila, tareas, chunksize=tamano_bloque):
+                    if error:
+                        errores += 1
+                        self.stderr.write(f"{referencia}: {error}")
+                    else:
+                        registros.append(registro)
+
+                resultado = guardar_registros(registros, tamano_lote, validar=False)
+                for referencia, mensaje in resultado.errores:
+                    self.stderr.write(f"{referencia}: {mensaje}")
+                creados += len(resultado.perfiles)
+                errores += len(resultado.errores)
+
+                procesadas = lote[-1][0]
+                punto_control.guardar(procesadas)
+                self.stdout.write(f"Procesado hasta la fila {procesadas} ({creados} creadas, {errores} con errores)")
+
+        punto_control.eliminar()
+        self.stdout.write(self.style.SUCCESS(
+            f"Importación completa: {creados} perfiles creados, {errores} filas con errores."
+        ))
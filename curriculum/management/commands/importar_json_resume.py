@@ -0,0 +1,48 @@
+"""
+Importa CVs en formato JSON Resume
+
+Uso:
+    python manage.py importar_json_resume cvs.jsonl
+    python manage.py importar_json_resume cv.json --publicos --lote 500
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from curriculum.carga_masiva import TAMANO_LOTE
+from curriculum.json_resume import importar_json_lines
+
+
+class Command(BaseCommand):
+    help = 'Importa CVs JSON Resume (JSON Lines, o .json con un CV o una lista)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Archivo .jsonl (un CV por línea) o .json')
+        parser.add_argument('--publicos', action='store_true', help='Marcar los CVs importados como públicos')
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help='Registros por transacción')
+
+    def handle(self, *args, **options):
+        try:
+            archivo = open(options['archivo'], encoding='utf-8')
+        except OSError as error:
+            raise CommandError(f"No se pudo abrir el archivo: {error}")
+
+        with archivo:
+            if options['archivo'].endswith('.json'):
+                try:
+                    datos = json.load(archivo)
+                except ValueError as error:
+                    raise CommandError(f"JSON inválido: {error}")
+                lineas = (json.dumps(cv) for cv in (datos if isinstance(datos, list) else [datos]))
+            else:
+                lineas = archivo
+
+            resultado = importar_json_lines(lineas, publico=options['publicos'], tamano_lote=options['lote'])
+
+        for referencia, mensaje in resultado.errores:
+            self.stderr.write(f"{referencia}: {mensaje}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(resultado.perfiles)} perfiles importados, {len(resultado.errores)} con errores."
+        ))
@@ -0,0 +1,51 @@
+"""
+Trabajador de la cola de media (TareaMedia): genera las versiones de las
+imágenes subidas y las vistas previas de certificados
+
+Uso:
+    python manage.py procesar_media                 # proceso permanente
+    python manage.py procesar_media --una-vez       # vacía la cola y termina (cron)
+    python manage.py procesar_media --espera 2
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from curriculum import media
+
+
+INTERVALO_PURGA = 3600
+
+
+class Command(BaseCommand):
+    help = 'Procesa en segundo plano los archivos subidos (versiones WebP/JPEG, vistas previas)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--una-vez', action='store_true', help='Vaciar la cola y terminar')
+        parser.add_argument('--espera', type=float, default=5, help='Segundos entre consultas a la cola vacía')
+        parser.add_argument(
+            '--retencion-dias', type=int, default=7,
+            help='Días que se conservan las tareas completadas'
+        )
+
+    def handle(self, *args, **options):
+        ultima_purga = None
+        while True:
+            completadas, fallidas = media.procesar_pendientes()
+            if completadas or fallidas:
+                self.stdout.write(f'{completadas} tareas completadas, {fallidas} con error.')
+
+            if ultima_purga is None or time.monotonic() - ultima_purga > INTERVALO_PURGA:
+                eliminadas = media.purgar(options['retencion_dias'])
+                ultima_purga = time.monotonic()
+                if eliminadas:
+                    self.stdout.write(f'{eliminadas} tareas antiguas eliminadas.')
+
+            if options['una_vez']:
+                self.stdout.write(self.style.SUCCESS('Cola vacía.'))
+                return
+
+            close_old_connections()
+            time.sleep(options['espera'])
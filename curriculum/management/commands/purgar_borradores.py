@@ -0,0 +1,25 @@
+"""
+Elimina los borradores de formularios abandonados
+
+Uso (periódico, Ej: cron diario):
+    python manage.py purgar_borradores
+    python manage.py purgar_borradores --retencion-dias 7
+"""
+
+from django.core.management.base import BaseCommand
+
+from curriculum.borradores import purgar, RETENCION_DIAS
+
+
+class Command(BaseCommand):
+    help = 'Elimina los borradores de formularios sin cambios en los últimos días'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retencion-dias', type=int, default=RETENCION_DIAS,
+            help='Días sin cambios tras los que se elimina un borrador'
+        )
+
+    def handle(self, *args, **options):
+        eliminados = purgar(options['retencion_dias'])
+        self.stdout.write(self.style.SUCCESS(f'{eliminados} borradores eliminados.'))
@@ -0,0 +1,26 @@
+"""
+Elimina las subidas de certificados por fragmentos abandonadas y sus
+archivos temporales
+
+Uso (periódico, Ej: cron cada hora):
+    python manage.py purgar_subidas
+    python manage.py purgar_subidas --retencion-horas 6
+"""
+
+from django.core.management.base import BaseCommand
+
+from curriculum.subidas import purgar, RETENCION_HORAS
+
+
+class Command(BaseCommand):
+    help = 'Elimina las subidas por fragmentos sin actividad en las últimas horas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retencion-horas', type=int, default=RETENCION_HORAS,
+            help='Horas sin fragmentos nuevos tras las que se elimina una subida'
+        )
+
+    def handle(self, *args, **options):
+        eliminadas = purgar(options['retencion_horas'])
+        self.stdout.write(self.style.SUCCESS(f'{eliminadas} subidas eliminadas.'))
@@ -0,0 +1,25 @@
+"""
+Recalcula los conteos por sección de los perfiles (EstadisticasPerfil) y
+la completitud del CV que depende de ellos
+
+Uso:
+    python manage.py recalcular_estadisticas
+    python manage.py recalcular_estadisticas --perfil 42
+"""
+
+from django.core.management.base import BaseCommand
+
+from curriculum import completitud, estadisticas
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los conteos por sección y la completitud del CV, y corrige los desviados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--perfil', type=int, action='append', help='Id de perfil (se puede repetir)')
+
+    def handle(self, *args, **options):
+        corregidas = estadisticas.recalcular(options['perfil'])
+        self.stdout.write(f"Conteos: {corregidas} perfiles corregidos.")
+        corregidas = completitud.recalcular(options['perfil'])
+        self.stdout.write(self.style.SUCCESS(f"Completitud: {corregidas} perfiles corregidos."))
@@ -0,0 +1,22 @@
+"""
+Recalcula los contadores globales de la página principal y corrige desviaciones
+
+Uso (periódico, Ej: cron diario):
+    python manage.py reconciliar_contadores
+"""
+
+from django.core.management.base import BaseCommand
+
+from curriculum.contadores import reconciliar
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los contadores globales (perfiles, CVs públicos) desde la base de datos'
+
+    def handle(self, *args, **options):
+        corregidos = reconciliar()
+        for nombre, (anterior, real) in corregidos.items():
+            self.stdout.write(f"{nombre}: {anterior} -> {real}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(corregidos)} contadores corregidos." if corregidos else "Los contadores están al día."
+        ))
@@ -0,0 +1,17 @@
+"""
+Reconstruye el índice de búsqueda de los CVs públicos
+
+Uso: python manage.py reindexar_cvs
+"""
+
+from django.core.management.base import BaseCommand
+
+from curriculum.busqueda import reconstruir_indice
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de texto completo de los CVs públicos'
+
+    def handle(self, *args, **options):
+        total = reconstruir_indice()
+        self.stdout.write(self.style.SUCCESS(f'{total} perfiles indexados.'))
@@ -0,0 +1,194 @@
+"""
+Procesamiento en segundo plano de archivos subidos
+
+Guardar un perfil, proyecto o certificación con un archivo nuevo solo
+normaliza la imagen (rápido, ver curriculum.imagenes) y encola una
+TareaMedia; la respuesta no espera a las versiones. `manage.py procesar_media`
+(un proceso aparte, o cron con --una-vez) toma las tareas pendientes,
+genera las versiones y las guarda en <campo>_variantes. Hasta entonces las
+plantillas muestran el original, o un icono en el caso de certificados.
+
+La cola vive en la base de datos: no hace falta Redis ni otro broker. Una
+tarea se reclama con un UPDATE condicionado a su estado, así varios
+procesos pueden trabajar a la vez sin tomar la misma tarea (en SQLite y
+PostgreSQL). Las tareas fallidas se reintentan con espera creciente hasta
+MAX_INTENTOS; las que quedaron 'procesando' por un proceso caído se
+vuelven a tomar pasado BLOQUEO, también hasta MAX_INTENTOS.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import imagenes
+from .models import PerfilProfesional, Proyecto, Certificacion, TareaMedia
+
+
+logger = logging.getLogger(__name__)
+
+# Nombre en TareaMedia.modelo -> (modelo, campo de archivo); las versiones
+# se guardan en <campo>_variantes
+MEDIA = {
+    'perfil': (PerfilProfesional, 'foto'),
+    'proyecto': (Proyecto, 'imagen'),
+    'certificacion': (Certificacion, 'certificado'),
+}
+CAMPOS = {modelo: campo for modelo, campo in MEDIA.values()}
+NOMBRES = {modelo: nombre for nombre, (modelo, _) in MEDIA.items()}
+
+MAX_INTENTOS = 3
+REINTENTO = timedelta(minutes=1)
+BLOQUEO = timedelta(minutes=10)
+TAMANO_LOTE = 20
+
+
+# ======================================
+# AL SUBIR
+# ======================================
+
+def normalizar_subida(instancia):
+    """
+    Normaliza el archivo recién subido de la instancia (antes de guardarla)
+    """
+    campo = CAMPOS[type(instancia)]
+    archivo = getattr(instancia, campo)
+    # Solo imágenes recién subidas; FileField.pre_save las guarda después
+    if archivo and not archivo._committed and not archivo.name.lower().endswith('.pdf'):
+        normalizada = imagenes.normalizar(archivo)
+        if normalizada is not None:
+            setattr(instancia, campo, normalizada)
+
+
+def descartar_variantes(instancia):
+    """
+    Vacía las variantes de un archivo reemplazado (se borran al confirmar la
+    transacción). Devuelve el nombre del campo de variantes a guardar.
+    """
+    campo = CAMPOS[type(instancia)]
+    atributo = f'{campo}_variantes'
+    anteriores = getattr(instancia, atributo)
+    if anteriores:
+        storage = getattr(instancia, campo).storage
+        transaction.on_commit(lambda: imagenes.eliminar_variantes(storage, anteriores))
+    setattr(instancia, atributo, {})
+    return atributo
+
+
+def encolar(modelo, objeto_ids):
+    """
+    Encola el procesamiento de los objetos cuando la transacción actual se
+    confirme; no duplica tareas ya pendientes
+    """
+    nombre = NOMBRES[modelo]
+    objeto_ids = set(objeto_ids)
+
+    def crear():
+        pendientes = set(TareaMedia.objects.filter(
+            modelo=nombre, objeto_id__in=objeto_ids, estado='pendiente'
+        ).values_list('objeto_id', flat=True))
+        TareaMedia.objects.bulk_create([
+            TareaMedia(modelo=nombre, objeto_id=objeto_id)
+            for objeto_id in objeto_ids - pendientes
+        ])
+
+    if objeto_ids:
+        transaction.on_commit(crear)
+
+
+# ======================================
+# TRABAJADOR
+# ======================================
+
+def _reclamar(tarea, ahora):
+    """
+    Marca la tarea como 'procesando' si nadie la tomó antes. Devuelve si se reclamó.
+    """
+    return TareaMedia.objects.filter(
+        pk=tarea.pk, estado=tarea.estado, fecha_actualizacion=tarea.fecha_actualizacion
+    ).update(estado='procesando', intentos=tarea.intentos + 1, fecha_actualizacion=ahora) == 1
+
+
+def procesar(tarea):
+    """
+    Genera las versiones del archivo actual del objeto de la tarea
+    """
+    modelo, campo = MEDIA[tarea.modelo]
+    atributo = f'{campo}_variantes'
+    objeto = modelo.objects.filter(pk=tarea.objeto_id).only('pk', campo, atributo).first()
+    if objeto is None or not getattr(objeto, campo):
+        return  # Eliminado o sin archivo
+
+    archivo = getattr(objeto, campo)
+    variantes = imagenes.generar_variantes(archivo, campo)
+
+    # Si el archivo cambió mientras tanto, su propia tarea generará las versiones
+    actualizadas = modelo.objects.filter(pk=objeto.pk, **{campo: archivo.name}).update(**{atributo: variantes})
+    if actualizadas:
+        imagenes.eliminar_variantes(archivo.storage, getattr(objeto, atributo), variantes)
+    else:
+        imagenes.eliminar_variantes(archivo.storage, variantes)
+
+
+def procesar_pendientes(limite=None):
+    """
+    Procesa las tareas disponibles hasta vaciar la cola (o `limite` tareas).
+
+    Returns:
+        (completadas, fallidas)
+    """
+    completadas = fallidas = 0
+    while limite is None or completadas + fallidas < limite:
+        ahora = timezone.now()
+        # Un archivo que tumba al proceso (Ej: sin memoria) deja la tarea en
+        # 'procesando'; tras MAX_INTENTOS no se vuelve a tomar
+        TareaMedia.objects.filter(
+            estado='procesando', fecha_actualizacion__lt=ahora - BLOQUEO, intentos__gte=MAX_INTENTOS
+        ).update(
+            estado='error', error='El proceso terminó sin completar la tarea.', fecha_actualizacion=ahora
+        )
+        lote = list(TareaMedia.objects.filter(
+            Q(estado='pendiente', disponible_desde__lte=ahora)
+            | Q(estado='procesando', fecha_actualizacion__lt=ahora - BLOQUEO, intentos__lt=MAX_INTENTOS)
+        ).order_by('id')[:TAMANO_LOTE])
+        if not lote:
+            break
+
+        for tarea in lote:
+            if limite is not None and completadas + fallidas >= limite:
+                break
+            if not _reclamar(tarea, ahora):
+                continue
+
+            try:
+                procesar(tarea)
+            except Exception as error:
+                logger.exception('Error al procesar %s', tarea)
+                fallidas += 1
+                agotada = tarea.intentos + 1 >= MAX_INTENTOS
+                TareaMedia.objects.filter(pk=tarea.pk).update(
+                    estado='error' if agotada else 'pendiente',
+                    error=str(error)[:1000],
+                    disponible_desde=timezone.now() + REINTENTO * (tarea.intentos + 1),
+                    fecha_actualizacion=timezone.now()
+                )
+            else:
+                completadas += 1
+                TareaMedia.objects.filter(pk=tarea.pk).update(
+                    estado='completada', error='', fecha_actualizacion=timezone.now()
+                )
+
+    return completadas, fallidas
+
+
+def purgar(retencion_dias=7):
+    """
+    Elimina las tareas completadas antiguas. Devuelve cuántas se eliminaron.
+    """
+    eliminadas, _ = TareaMedia.objects.filter(
+        estado='completada',
+        fecha_actualizacion__lt=timezone.now() - timedelta(days=retencion_dias)
+    ).delete()
+    return eliminadas
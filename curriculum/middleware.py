@@ -0,0 +1,40 @@
+"""
+Middleware del sistema de CV
+"""
+
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.utils.functional import SimpleLazyObject
+
+
+BACKEND_PERFIL = 'curriculum.backends.PerfilBackend'
+
+# Sesiones iniciadas antes de PerfilBackend; es una subclase, así que se
+# pueden pasar a él sin cerrar la sesión del usuario
+BACKENDS_ANTERIORES = {'django.contrib.auth.backends.ModelBackend'}
+
+
+def obtener_perfil(request):
+    """
+    PerfilProfesional del usuario autenticado, o None
+    """
+    if not request.user.is_authenticated:
+        return None
+    return getattr(request.user, 'perfil', None)
+
+
+class PerfilActualMiddleware:
+    """
+    Agrega request.perfil: el perfil del usuario autenticado, cargado en la
+    misma consulta que el usuario (PerfilBackend) solo si se usa, y memorizado
+    para el resto de la petición. Es falso si el usuario no tiene perfil.
+
+    Debe ir después de AuthenticationMiddleware.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.session.get(BACKEND_SESSION_KEY) in BACKENDS_ANTERIORES:
+            request.session[BACKEND_SESSION_KEY] = BACKEND_PERFIL
+        request.perfil = SimpleLazyObject(lambda: obtener_perfil(request))
+        return self.get_response(request)
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.9 on 2026-10-18 22:15
+
+from django.db import migrations
+
+
+def crear_indice_busqueda(apps, schema_editor):
+    """
+    Crea la estructura del índice de texto completo según el motor
+    """
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE TABLE curriculum_busqueda ('
+            'perfil_id bigint PRIMARY KEY '
+            'REFERENCES curriculum_perfilprofesional (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            'documento tsvector NOT NULL)'
+        )
+        schema_editor.execute(
+            'CREATE INDEX curriculum_busqueda_documento_gin '
+            'ON curriculum_busqueda USING GIN (documento)'
+        )
+    elif schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE curriculum_busqueda_fts USING fts5('
+            'titulo, resumen, habilidades, experiencia, tecnologias, '
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+
+
+def eliminar_indice_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP TABLE IF EXISTS curriculum_busqueda')
+    elif schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS curriculum_busqueda_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice_busqueda, eliminar_indice_busqueda),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 4.2.9 on 2026-10-18 22:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+
+def cargar_diccionario(apps, schema_editor):
+    """
+    Carga los alias iniciales y enlaza las habilidades existentes
+    """
+    from curriculum.habilidades import ALIAS_INICIALES, normalizar_nombre
+
+    HabilidadCanonica = apps.get_model('curriculum', 'HabilidadCanonica')
+    AliasHabilidad = apps.get_model('curriculum', 'AliasHabilidad')
+    Habilidad = apps.get_model('curriculum', 'Habilidad')
+
+    alias_a_canonica = {}
+    for nombre, variantes in ALIAS_INICIALES.items():
+        canonica = HabilidadCanonica.objects.create(
+            nombre=nombre,
+            nombre_normalizado=normalizar_nombre(nombre)
+        )
+        for variante in variantes:
+            alias = normalizar_nombre(variante)
+            if alias not in alias_a_canonica:
+                alias_a_canonica[alias] = canonica
+        alias_a_canonica.setdefault(canonica.nombre_normalizado, canonica)
+
+    AliasHabilidad.objects.bulk_create([
+        AliasHabilidad(alias_normalizado=alias, canonica=canonica)
+        for alias, canonica in alias_a_canonica.items()
+    ])
+
+    canonicas = {}
+    habilidades = list(Habilidad.objects.only('id', 'nombre'))
+    for habilidad in habilidades:
+        normalizado = normalizar_nombre(habilidad.nombre)
+        if not normalizado:
+            continue
+        canonica = alias_a_canonica.get(normalizado) or canonicas.get(normalizado)
+        if canonica is None:
+            canonica = HabilidadCanonica.objects.create(
+                nombre=habilidad.nombre.strip()[:100],
+                nombre_normalizado=normalizado
+            )
+            canonicas[normalizado] = canonica
+        habilidad.canonica = canonica
+    Habilidad.objects.bulk_update(habilidades, ['canonica'], batch_size=500)
+
+    totales = Habilidad.objects.filter(
+        canonica__isnull=False, perfil__cv_publico=True
+    ).values('canonica').annotate(total=Count('perfil', distinct=True))
+    for fila in totales:
+        HabilidadCanonica.objects.filter(pk=fila['canonica']).update(
+            total_perfiles_publicos=fila['total']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0002_busqueda_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AliasHabilidad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias_normalizado', models.CharField(max_length=100, unique=True, verbose_name='Alias Normalizado')),
+            ],
+            options={
+                'verbose_name': 'Alias de Habilidad',
+                'verbose_name_plural': 'Alias de Habilidades',
+                'ordering': ['alias_normalizado'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HabilidadCanonica',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=100, verbose_name='Nombre')),
+                ('nombre_normalizado', models.CharField(max_length=100, unique=True, verbose_name='Nombre Normalizado')),
+                ('total_perfiles_publicos', models.PositiveIntegerField(db_index=True, default=0, verbose_name='Perfiles Públicos')),
+            ],
+            options={
+                'verbose_name': 'Habilidad Canónica',
+                'verbose_name_plural': 'Habilidades Canónicas',
+                'ordering': ['nombre'],
+            },
+        ),
+        migrations.AddField(
+            model_name='aliashabilidad',
+            name='canonica',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alias', to='curriculum.habilidadcanonica'),
+        ),
+        migrations.AddField(
+            model_name='habilidad',
+            name='canonica',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='habilidades', to='curriculum.habilidadcanonica', verbose_name='Habilidad Canónica'),
+        ),
+        migrations.AddIndex(
+            model_name='habilidad',
+            index=models.Index(fields=['canonica', 'nivel', 'perfil'], name='habilidad_canonica_nivel_idx'),
+        ),
+        migrations.RunPython(cargar_diccionario, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.9 on 2026-10-18 22:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0003_diccionario_habilidades'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='perfilprofesional',
+            index=models.Index(fields=['-fecha_actualizacion', '-id'], name='perfil_fecha_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='perfilprofesional',
+            index=models.Index(condition=models.Q(('cv_publico', True)), fields=['-fecha_actualizacion', '-id'], name='perfil_publico_fecha_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-18 22:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0004_perfil_indices_keyset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfilprofesional',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-18 22:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0005_perfil_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfilprofesional',
+            name='og_huella',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+    ]
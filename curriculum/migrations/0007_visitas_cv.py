@@ -0,0 +1,26 @@
+# Generated by Django 4.2.9 on 2026-10-18 22:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0006_perfil_og_huella'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisitaCV',
+            fields=[
+                ('perfil', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='visitas', serialize=False, to='curriculum.perfilprofesional')),
+                ('total', models.PositiveBigIntegerField(default=0, verbose_name='Visitas')),
+                ('ultima_visita', models.DateTimeField(blank=True, null=True, verbose_name='Última Visita')),
+            ],
+            options={
+                'verbose_name': 'Visitas de CV',
+                'verbose_name_plural': 'Visitas de CVs',
+            },
+        ),
+    ]
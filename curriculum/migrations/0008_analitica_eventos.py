@@ -0,0 +1,57 @@
+# Generated by Django 4.2.9 on 2026-10-18 22:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0007_visitas_cv'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarcaAgregacion',
+            fields=[
+                ('nombre', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('ultimo_id', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Marca de Agregación',
+                'verbose_name_plural': 'Marcas de Agregación',
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenEventosCV',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('visita', 'Visita al CV público'), ('descarga_pdf', 'Descarga del PDF')], max_length=20)),
+                ('granularidad', models.CharField(choices=[('hora', 'Hora'), ('dia', 'Día'), ('mes', 'Mes')], max_length=4)),
+                ('inicio', models.DateTimeField(verbose_name='Inicio del intervalo')),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('perfil', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumenes_eventos', to='curriculum.perfilprofesional')),
+            ],
+            options={
+                'verbose_name': 'Resumen de Eventos',
+                'verbose_name_plural': 'Resúmenes de Eventos',
+            },
+        ),
+        migrations.CreateModel(
+            name='EventoCV',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('tipo', models.CharField(choices=[('visita', 'Visita al CV público'), ('descarga_pdf', 'Descarga del PDF')], max_length=20)),
+                ('fecha', models.DateTimeField(db_index=True)),
+                ('perfil', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eventos', to='curriculum.perfilprofesional')),
+            ],
+            options={
+                'verbose_name': 'Evento de CV',
+                'verbose_name_plural': 'Eventos de CV',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='resumeneventoscv',
+            constraint=models.UniqueConstraint(fields=('perfil', 'granularidad', 'inicio', 'tipo'), name='resumen_evento_unico'),
+        ),
+    ]
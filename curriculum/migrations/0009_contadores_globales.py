@@ -0,0 +1,37 @@
+# Generated by Django 4.2.9 on 2026-10-18 22:36
+
+from django.db import migrations, models
+
+
+def inicializar_contadores(apps, schema_editor):
+    """
+    Parte de los conteos reales de la tabla de perfiles
+    """
+    PerfilProfesional = apps.get_model('curriculum', 'PerfilProfesional')
+    ContadorGlobal = apps.get_model('curriculum', 'ContadorGlobal')
+    ContadorGlobal.objects.bulk_create([
+        ContadorGlobal(nombre='perfiles', valor=PerfilProfesional.objects.count()),
+        ContadorGlobal(nombre='cvs_publicos', valor=PerfilProfesional.objects.filter(cv_publico=True).count()),
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0008_analitica_eventos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorGlobal',
+            fields=[
+                ('nombre', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('valor', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Contador Global',
+                'verbose_name_plural': 'Contadores Globales',
+            },
+        ),
+        migrations.RunPython(inicializar_contadores, migrations.RunPython.noop),
+    ]
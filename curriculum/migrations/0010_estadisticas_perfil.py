@@ -0,0 +1,61 @@
+# Generated by Django 4.2.9 on 2026-10-18 22:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+
+def calcular_estadisticas(apps, schema_editor):
+    """
+    Crea la fila de conteos de cada perfil existente
+    """
+    PerfilProfesional = apps.get_model('curriculum', 'PerfilProfesional')
+    EstadisticasPerfil = apps.get_model('curriculum', 'EstadisticasPerfil')
+
+    perfiles = PerfilProfesional.objects.annotate(
+        n_formacion=Count('formacion_academica', distinct=True),
+        n_experiencias=Count('experiencias', distinct=True),
+        n_habilidades=Count('habilidades', distinct=True),
+        n_proyectos=Count('proyectos', distinct=True),
+        n_certificaciones=Count('certificaciones', distinct=True),
+        n_referencias=Count('referencias', distinct=True),
+    )
+    EstadisticasPerfil.objects.bulk_create([
+        EstadisticasPerfil(
+            perfil_id=perfil.pk,
+            formacion=perfil.n_formacion,
+            experiencias=perfil.n_experiencias,
+            habilidades=perfil.n_habilidades,
+            proyectos=perfil.n_proyectos,
+            certificaciones=perfil.n_certificaciones,
+            referencias=perfil.n_referencias,
+        )
+        for perfil in perfiles.iterator()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0009_contadores_globales'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadisticasPerfil',
+            fields=[
+                ('perfil', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='estadisticas', serialize=False, to='curriculum.perfilprofesional')),
+                ('formacion', models.PositiveIntegerField(default=0)),
+                ('experiencias', models.PositiveIntegerField(default=0)),
+                ('habilidades', models.PositiveIntegerField(default=0)),
+                ('proyectos', models.PositiveIntegerField(default=0)),
+                ('certificaciones', models.PositiveIntegerField(default=0)),
+                ('referencias', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Estadísticas del Perfil',
+                'verbose_name_plural': 'Estadísticas de Perfiles',
+            },
+        ),
+        migrations.RunPython(calcular_estadisticas, migrations.RunPython.noop),
+    ]
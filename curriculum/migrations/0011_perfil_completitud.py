@@ -0,0 +1,47 @@
+# Generated by Django 4.2.9 on 2026-10-18 22:41
+
+from django.db import migrations, models
+
+
+def calcular_completitud(apps, schema_editor):
+    """
+    Calcula la completitud de los perfiles existentes con las reglas actuales
+    """
+    from curriculum.completitud import evaluar
+
+    PerfilProfesional = apps.get_model('curriculum', 'PerfilProfesional')
+    EstadisticasPerfil = apps.get_model('curriculum', 'EstadisticasPerfil')
+
+    perfiles = list(PerfilProfesional.objects.select_related('estadisticas'))
+    for perfil in perfiles:
+        try:
+            stats = perfil.estadisticas
+        except EstadisticasPerfil.DoesNotExist:
+            stats = EstadisticasPerfil()
+        perfil.completitud, perfil.completitud_detalle = evaluar(perfil, stats)
+    PerfilProfesional.objects.bulk_update(perfiles, ['completitud', 'completitud_detalle'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0010_estadisticas_perfil'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfilprofesional',
+            name='completitud',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Completitud (%)'),
+        ),
+        migrations.AddField(
+            model_name='perfilprofesional',
+            name='completitud_detalle',
+            field=models.JSONField(default=dict, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='perfilprofesional',
+            index=models.Index(fields=['-completitud', '-id'], name='perfil_completitud_idx'),
+        ),
+        migrations.RunPython(calcular_completitud, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.9 on 2026-10-18 22:51
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0011_perfil_completitud'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='certificacion',
+            options={'ordering': ['orden', '-fecha_obtencion'], 'verbose_name': 'Certificación', 'verbose_name_plural': 'Certificaciones'},
+        ),
+        migrations.AlterModelOptions(
+            name='experienciaprofesional',
+            options={'ordering': ['orden', '-fecha_inicio'], 'verbose_name': 'Experiencia Profesional', 'verbose_name_plural': 'Experiencias Profesionales'},
+        ),
+        migrations.AlterModelOptions(
+            name='formacionacademica',
+            options={'ordering': ['orden', '-fecha_inicio'], 'verbose_name': 'Formación Académica', 'verbose_name_plural': 'Formación Académica'},
+        ),
+        migrations.AlterModelOptions(
+            name='habilidad',
+            options={'ordering': ['orden', '-destacada', 'tipo', '-nivel'], 'verbose_name': 'Habilidad', 'verbose_name_plural': 'Habilidades'},
+        ),
+        migrations.AlterModelOptions(
+            name='proyecto',
+            options={'ordering': ['orden', '-destacado', '-fecha_inicio'], 'verbose_name': 'Proyecto', 'verbose_name_plural': 'Proyectos'},
+        ),
+    ]
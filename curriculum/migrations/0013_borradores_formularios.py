@@ -0,0 +1,35 @@
+# Generated by Django 4.2.9 on 2026-10-18 22:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('curriculum', '0012_orden_manual_primero'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BorradorFormulario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clave', models.CharField(max_length=200)),
+                ('datos', models.JSONField(default=dict)),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='borradores', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Borrador de Formulario',
+                'verbose_name_plural': 'Borradores de Formularios',
+                'indexes': [models.Index(fields=['fecha_actualizacion'], name='curriculum__fecha_a_3c5c5a_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='borradorformulario',
+            constraint=models.UniqueConstraint(fields=('usuario', 'clave'), name='borrador_usuario_clave_unico'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.9 on 2026-10-18 23:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0013_borradores_formularios'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfilprofesional',
+            name='foto_variantes',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='proyecto',
+            name='imagen_variantes',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
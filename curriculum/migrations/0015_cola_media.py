@@ -0,0 +1,38 @@
+# Generated by Django 4.2.9 on 2026-10-18 23:07
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0014_variantes_imagenes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificacion',
+            name='certificado_variantes',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.CreateModel(
+            name='TareaMedia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo', models.CharField(max_length=20)),
+                ('objeto_id', models.PositiveBigIntegerField()),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('completada', 'Completada'), ('error', 'Error')], default='pendiente', max_length=20)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('disponible_desde', models.DateTimeField(default=django.utils.timezone.now)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Tarea de Media',
+                'verbose_name_plural': 'Tareas de Media',
+                'indexes': [models.Index(fields=['estado', 'disponible_desde'], name='curriculum__estado_776435_idx'), models.Index(fields=['modelo', 'objeto_id'], name='curriculum__modelo_f98a17_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.9 on 2026-10-18 23:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0016_subidas_fragmentadas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='borradorformulario',
+            name='fecha_descarte',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='borradorformulario',
+            name='marcas',
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.9 on 2026-10-18 23:58
+
+from django.db import migrations
+from django.db.models import F, Sum
+from django.utils import timezone
+
+
+def trasladar_visitas(apps, schema_editor):
+    """
+    Pasa a los resúmenes mensuales las visitas de VisitaCV que no están ya
+    en EventoCV (las anteriores a la analítica), en el mes de la última visita
+    """
+    VisitaCV = apps.get_model('curriculum', 'VisitaCV')
+    EventoCV = apps.get_model('curriculum', 'EventoCV')
+    ResumenEventosCV = apps.get_model('curriculum', 'ResumenEventosCV')
+    MarcaAgregacion = apps.get_model('curriculum', 'MarcaAgregacion')
+
+    marca = MarcaAgregacion.objects.filter(nombre='eventos_cv').first()
+    ultimo_id = marca.ultimo_id if marca else 0
+
+    for visita in VisitaCV.objects.filter(total__gt=0):
+        agregadas = ResumenEventosCV.objects.filter(
+            perfil_id=visita.perfil_id, granularidad='mes', tipo='visita'
+        ).aggregate(total=Sum('total'))['total'] or 0
+        pendientes = EventoCV.objects.filter(
+            perfil_id=visita.perfil_id, tipo='visita', id__gt=ultimo_id
+        ).count()
+        anteriores = visita.total - agregadas - pendientes
+        if anteriores <= 0:
+            continue
+
+        inicio = timezone.localtime(visita.ultima_visita or timezone.now()).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        resumen, _ = ResumenEventosCV.objects.get_or_create(
+            perfil_id=visita.perfil_id, tipo='visita', granularidad='mes', inicio=inicio
+        )
+        ResumenEventosCV.objects.filter(pk=resumen.pk).update(total=F('total') + anteriores)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0017_descarte_borradores'),
+    ]
+
+    operations = [
+        migrations.RunPython(trasladar_visitas, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='VisitaCV',
+        ),
+    ]
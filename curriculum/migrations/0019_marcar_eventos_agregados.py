@@ -0,0 +1,44 @@
+# Generated by Django 4.2.9 on 2026-10-18 23:45
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def marcar_agregados(apps, schema_editor):
+    """
+    Marca como agregados los eventos que la marca de agua por id ya había sumado
+    """
+    MarcaAgregacion = apps.get_model('curriculum', 'MarcaAgregacion')
+    EventoCV = apps.get_model('curriculum', 'EventoCV')
+
+    marca = MarcaAgregacion.objects.filter(nombre='eventos_cv').first()
+    if marca and marca.ultimo_id:
+        ahora = timezone.now()
+        EventoCV.objects.filter(id__lte=marca.ultimo_id).update(agregado=ahora)
+        marca.ultima_pasada = ahora
+        marca.save(update_fields=['ultima_pasada'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0018_unificar_visitas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventocv',
+            name='agregado',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='marcaagregacion',
+            name='ultima_pasada',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(marcar_agregados, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='marcaagregacion',
+            name='ultimo_id',
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.9 on 2026-10-18 23:49
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('curriculum', '0019_marcar_eventos_agregados'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='habilidad',
+            name='anos_experiencia',
+            field=models.PositiveIntegerField(default=0, validators=[django.core.validators.MaxValueValidator(55)], verbose_name='Años de Experiencia'),
+        ),
+        migrations.AlterField(
+            model_name='perfilprofesional',
+            name='foto',
+            field=models.ImageField(blank=True, null=True, upload_to='profile_photos/', verbose_name='Foto de Perfil'),
+        ),
+        migrations.AlterField(
+            model_name='proyecto',
+            name='imagen',
+            field=models.ImageField(blank=True, null=True, upload_to='project_images/', verbose_name='Imagen del Proyecto'),
+        ),
+    ]
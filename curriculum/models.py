@@ -20,8 +20,12 @@ from datetime import date
 
 from django.core.exceptions import ValidationError
 
+from django.utils import timezone
+
 from django.utils.text import slugify
 
+from .modificaciones import CamposModificadosMixin
+
 
 
 import uuid
@@ -38,7 +42,7 @@ import uuid
 
 
 
-class PerfilProfesional(models.Model):
+class PerfilProfesional(CamposModificadosMixin, models.Model):
 
     """
 
@@ -46,6 +50,10 @@ class PerfilProfesional(models.Model):
 
     """
 
+    # Los asigna la señal pre_save calcular_completitud_perfil
+
+    campos_calculados = ('completitud', 'completitud_detalle')
+
     NIVEL_EXPERIENCIA_CHOICES = [
 
         ('junior', 'Junior (0-2 años)'),
@@ -93,6 +101,11 @@ class PerfilProfesional(models.Model):
 )
 
 
+    # Versiones redimensionadas de la foto con sus dimensiones; ver curriculum/imagenes.py
+
+    foto_variantes = models.JSONField(default=dict, blank=True, editable=False)
+
+
 
     
 
@@ -144,6 +157,20 @@ class PerfilProfesional(models.Model):
 
     slug = models.SlugField(max_length=100, unique=True, blank=True)
 
+    # Se incrementa con cada cambio del perfil o de sus secciones (ETag de la API)
+
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    # Huella de los datos de la última imagen Open Graph generada
+
+    og_huella = models.CharField(max_length=16, blank=True, editable=False)
+
+    # Completitud del CV (0-100) y reglas cumplidas; ver curriculum/completitud.py
+
+    completitud = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Completitud (%)')
+
+    completitud_detalle = models.JSONField(default=dict, editable=False)
+
     
 
     # Metadata
@@ -222,6 +249,18 @@ class PerfilProfesional(models.Model):
 
         ordering = ['-fecha_actualizacion']
 
+        # Índices para la paginación por keyset (ver curriculum/paginacion.py)
+        indexes = [
+            models.Index(fields=['-fecha_actualizacion', '-id'], name='perfil_fecha_id_idx'),
+            models.Index(
+                fields=['-fecha_actualizacion', '-id'],
+                condition=models.Q(cv_publico=True),
+                name='perfil_publico_fecha_id_idx'
+            ),
+            # Filtro y orden por completitud en el admin
+            models.Index(fields=['-completitud', '-id'], name='perfil_completitud_idx'),
+        ]
+
     
 
     def __str__(self):
@@ -234,13 +273,19 @@ class PerfilProfesional(models.Model):
 
 
 
+    def generar_slug(self):
+
+        base_slug = slugify(f"{self.nombres} {self.apellidos}")[:90]
+
+        return f"{base_slug}-{uuid.uuid4().hex[:8]}"
+
+
+
     def save(self, *args, **kwargs):
 
         if not self.slug:
 
-            base_slug = slugify(f"{self.nombres} {self.apellidos}")
-
-            self.slug = f"{base_slug}-{uuid.uuid4().hex[:8]}"
+            self.slug = self.generar_slug()
 
 
 
@@ -280,7 +325,7 @@ class PerfilProfesional(models.Model):
 
 
 
-class FormacionAcademica(models.Model):
+class FormacionAcademica(CamposModificadosMixin, models.Model):
 
     """
 
@@ -388,7 +433,7 @@ class FormacionAcademica(models.Model):
 
         verbose_name_plural = 'Formación Académica'
 
-        ordering = ['-fecha_inicio', 'orden']
+        ordering = ['orden', '-fecha_inicio']
 
     
 
@@ -400,6 +445,12 @@ class FormacionAcademica(models.Model):
 
     def clean(self):
 
+        if not self.fecha_inicio:
+
+            return
+
+
+
         hoy = date.today()
 
 
@@ -436,7 +487,7 @@ class FormacionAcademica(models.Model):
 
 
 
-class ExperienciaProfesional(models.Model):
+class ExperienciaProfesional(CamposModificadosMixin, models.Model):
 
     """
 
@@ -512,7 +563,7 @@ class ExperienciaProfesional(models.Model):
 
         verbose_name_plural = 'Experiencias Profesionales'
 
-        ordering = ['-fecha_inicio', 'orden']
+        ordering = ['orden', '-fecha_inicio']
 
     
 
@@ -534,6 +585,12 @@ class ExperienciaProfesional(models.Model):
 
     def clean(self):
 
+        if not self.fecha_inicio:
+
+            return
+
+
+
         hoy = date.today()
 
 
@@ -570,7 +627,7 @@ class ExperienciaProfesional(models.Model):
 
 
 
-class Habilidad(models.Model):
+class Habilidad(CamposModificadosMixin, models.Model):
 
     """
 
@@ -578,6 +635,10 @@ class Habilidad(models.Model):
 
     """
 
+    # La asigna la señal pre_save enlazar_habilidad_canonica
+
+    campos_calculados = ('canonica',)
+
     TIPO_HABILIDAD_CHOICES = [
 
         ('tecnica', 'Habilidad Técnica'),
@@ -640,6 +701,16 @@ class Habilidad(models.Model):
 
     destacada = models.BooleanField(default=False, verbose_name='Habilidad Destacada')
 
+    canonica = models.ForeignKey(
+        'HabilidadCanonica',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='habilidades',
+        verbose_name='Habilidad Canónica'
+    )
+
     
 
     fecha_creacion = models.DateTimeField(auto_now_add=True)
@@ -652,7 +723,10 @@ class Habilidad(models.Model):
 
         verbose_name_plural = 'Habilidades'
 
-        ordering = ['-destacada', 'tipo', '-nivel', 'orden']
+        ordering = ['orden', '-destacada', 'tipo', '-nivel']
+        indexes = [
+            models.Index(fields=['canonica', 'nivel', 'perfil'], name='habilidad_canonica_nivel_idx'),
+        ]
 
     
 
@@ -672,7 +746,7 @@ class Habilidad(models.Model):
 
 
 
-class Proyecto(models.Model):
+class Proyecto(CamposModificadosMixin, models.Model):
 
     """
 
@@ -745,6 +819,11 @@ class Proyecto(models.Model):
 )
 
 
+    # Versiones redimensionadas de la imagen con sus dimensiones; ver curriculum/imagenes.py
+
+    imagen_variantes = models.JSONField(default=dict, blank=True, editable=False)
+
+
 
     
 
@@ -766,7 +845,7 @@ class Proyecto(models.Model):
 
         verbose_name_plural = 'Proyectos'
 
-        ordering = ['-destacado', '-fecha_inicio', 'orden']
+        ordering = ['orden', '-destacado', '-fecha_inicio']
 
     
 
@@ -778,7 +857,7 @@ class Proyecto(models.Model):
 
     def clean(self):
 
-        if self.fecha_fin and self.fecha_fin < self.fecha_inicio:
+        if self.fecha_fin and self.fecha_inicio and self.fecha_fin < self.fecha_inicio:
 
             raise ValidationError("La fecha de fin no puede ser anterior a la fecha de inicio.")
 
@@ -796,7 +875,7 @@ class Proyecto(models.Model):
 
 
 
-class ReferenciaProfesional(models.Model):
+class ReferenciaProfesional(CamposModificadosMixin, models.Model):
 
     """
 
@@ -888,7 +967,7 @@ class ReferenciaProfesional(models.Model):
 
 
 
-class Certificacion(models.Model):
+class Certificacion(CamposModificadosMixin, models.Model):
 
     """
 
@@ -934,6 +1013,11 @@ class Certificacion(models.Model):
 
     )
 
+    # Vista previa del certificado (primera página); ver curriculum/media.py
+
+    certificado_variantes = models.JSONField(default=dict, blank=True, editable=False)
+
+
     
 
     orden = models.PositiveIntegerField(default=0)
@@ -950,7 +1034,7 @@ class Certificacion(models.Model):
 
         verbose_name_plural = 'Certificaciones'
 
-        ordering = ['-fecha_obtencion', 'orden']
+        ordering = ['orden', '-fecha_obtencion']
 
     
 
@@ -976,6 +1060,278 @@ class Certificacion(models.Model):
 
     def clean(self):
 
-        if self.fecha_expiracion and self.fecha_expiracion < self.fecha_obtencion:
+        if self.fecha_expiracion and self.fecha_obtencion and self.fecha_expiracion < self.fecha_obtencion:
 
             raise ValidationError("La fecha de expiración no puede ser anterior a la fecha de obtención.")
+
+
+
+# ======================================
+# MODELO: DICCIONARIO DE HABILIDADES
+# ======================================
+
+class HabilidadCanonica(models.Model):
+    """
+    Habilidad normalizada compartida entre perfiles (Python, JavaScript, Inglés...)
+    """
+    nombre = models.CharField(max_length=100, verbose_name='Nombre')
+    nombre_normalizado = models.CharField(max_length=100, unique=True, verbose_name='Nombre Normalizado')
+
+    # Faceta precalculada: perfiles públicos que declaran esta habilidad
+    total_perfiles_publicos = models.PositiveIntegerField(default=0, db_index=True, verbose_name='Perfiles Públicos')
+
+    class Meta:
+        verbose_name = 'Habilidad Canónica'
+        verbose_name_plural = 'Habilidades Canónicas'
+        ordering = ['nombre']
+
+    def __str__(self):
+        return self.nombre
+
+
+class AliasHabilidad(models.Model):
+    """
+    Variante conocida de una habilidad canónica (Ej: "JS" -> JavaScript)
+    """
+    alias_normalizado = models.CharField(max_length=100, unique=True, verbose_name='Alias Normalizado')
+    canonica = models.ForeignKey(HabilidadCanonica, on_delete=models.CASCADE, related_name='alias')
+
+    class Meta:
+        verbose_name = 'Alias de Habilidad'
+        verbose_name_plural = 'Alias de Habilidades'
+        ordering = ['alias_normalizado']
+
+    def __str__(self):
+        return f"{self.alias_normalizado} → {self.canonica}"
+
+
+# ======================================
+# MODELOS: ANALÍTICA
+# ======================================
+
+TIPO_EVENTO_CHOICES = [
+    ('visita', 'Visita al CV público'),
+    ('descarga_pdf', 'Descarga del PDF'),
+]
+
+
+class EventoCV(models.Model):
+    """
+    Evento crudo (solo inserción). Se agrega en ResumenEventosCV y se
+    elimina pasada la retención (ver curriculum.analitica).
+    """
+    id = models.BigAutoField(primary_key=True)
+    perfil = models.ForeignKey(PerfilProfesional, on_delete=models.CASCADE, related_name='eventos')
+    tipo = models.CharField(max_length=20, choices=TIPO_EVENTO_CHOICES)
+    fecha = models.DateTimeField(db_index=True)
+    # Pasada de agregación que lo sumó a los resúmenes (nulo: pendiente)
+    agregado = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        verbose_name = 'Evento de CV'
+        verbose_name_plural = 'Eventos de CV'
+
+    def __str__(self):
+        return f"{self.perfil_id} - {self.tipo} - {self.fecha}"
+
+
+class ResumenEventosCV(models.Model):
+    """
+    Total de eventos por perfil, tipo e intervalo (hora, día o mes)
+    """
+    GRANULARIDAD_CHOICES = [
+        ('hora', 'Hora'),
+        ('dia', 'Día'),
+        ('mes', 'Mes'),
+    ]
+
+    perfil = models.ForeignKey(PerfilProfesional, on_delete=models.CASCADE, related_name='resumenes_eventos')
+    tipo = models.CharField(max_length=20, choices=TIPO_EVENTO_CHOICES)
+    granularidad = models.CharField(max_length=4, choices=GRANULARIDAD_CHOICES)
+    inicio = models.DateTimeField(verbose_name='Inicio del intervalo')
+    total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Resumen de Eventos'
+        verbose_name_plural = 'Resúmenes de Eventos'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['perfil', 'granularidad', 'inicio', 'tipo'],
+                name='resumen_evento_unico'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.perfil_id} - {self.tipo} - {self.granularidad} {self.inicio}: {self.total}"
+
+
+class MarcaAgregacion(models.Model):
+    """
+    Fila que serializa las pasadas de agregación y registra la última
+    """
+    nombre = models.CharField(max_length=50, primary_key=True)
+    ultima_pasada = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Marca de Agregación'
+        verbose_name_plural = 'Marcas de Agregación'
+
+    def __str__(self):
+        return f"{self.nombre}: {self.ultima_pasada}"
+
+
+# ======================================
+# MODELO: CONTADORES GLOBALES
+# ======================================
+
+class ContadorGlobal(models.Model):
+    """
+    Contador mantenido de forma incremental (Ej: perfiles, CVs públicos);
+    ver curriculum.contadores
+    """
+    nombre = models.CharField(max_length=50, primary_key=True)
+    valor = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Contador Global'
+        verbose_name_plural = 'Contadores Globales'
+
+    def __str__(self):
+        return f"{self.nombre}: {self.valor}"
+
+
+# ======================================
+# MODELO: ESTADÍSTICAS DEL PERFIL
+# ======================================
+
+class EstadisticasPerfil(models.Model):
+    """
+    Número de registros por sección del CV; se mantiene de forma incremental
+    (ver curriculum.estadisticas). En una tabla aparte para que guardar el
+    perfil desde un formulario no sobrescriba los conteos.
+    """
+    perfil = models.OneToOneField(
+        PerfilProfesional,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='estadisticas'
+    )
+    formacion = models.PositiveIntegerField(default=0)
+    experiencias = models.PositiveIntegerField(default=0)
+    habilidades = models.PositiveIntegerField(default=0)
+    proyectos = models.PositiveIntegerField(default=0)
+    certificaciones = models.PositiveIntegerField(default=0)
+    referencias = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Estadísticas del Perfil'
+        verbose_name_plural = 'Estadísticas de Perfiles'
+
+    def __str__(self):
+        return f"Estadísticas de {self.perfil_id}"
+
+
+# ======================================
+# MODELO: BORRADORES DE FORMULARIOS
+# ======================================
+
+class BorradorFormulario(models.Model):
+    """
+    Cambios sin enviar de un formulario, por usuario y página del formulario
+    (ver curriculum.borradores)
+    """
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='borradores'
+    )
+    clave = models.CharField(max_length=200)
+    datos = models.JSONField(default=dict)
+    # Momento (timestamp) en que se recibió cada campo de `datos`
+    marcas = models.JSONField(default=dict)
+    # Al enviar el formulario: se ignoran los campos recibidos antes
+    fecha_descarte = models.DateTimeField(null=True, blank=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Borrador de Formulario'
+        verbose_name_plural = 'Borradores de Formularios'
+        constraints = [
+            models.UniqueConstraint(fields=['usuario', 'clave'], name='borrador_usuario_clave_unico'),
+        ]
+        indexes = [
+            models.Index(fields=['fecha_actualizacion']),
+        ]
+
+    def __str__(self):
+        return f"{self.usuario_id} - {self.clave}"
+
+
+# ======================================
+# MODELO: COLA DE PROCESAMIENTO DE MEDIA
+# ======================================
+
+class TareaMedia(models.Model):
+    """
+    Archivo subido pendiente de procesar en segundo plano (versiones de
+    imágenes, vista previa de certificados); ver curriculum.media
+    """
+    ESTADO_CHOICES = [
+        ('pendiente', 'Pendiente'),
+        ('procesando', 'Procesando'),
+        ('completada', 'Completada'),
+        ('error', 'Error'),
+    ]
+
+    modelo = models.CharField(max_length=20)
+    objeto_id = models.PositiveBigIntegerField()
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='pendiente')
+    intentos = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    disponible_desde = models.DateTimeField(default=timezone.now)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Tarea de Media'
+        verbose_name_plural = 'Tareas de Media'
+        indexes = [
+            models.Index(fields=['estado', 'disponible_desde']),
+            models.Index(fields=['modelo', 'objeto_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.modelo} {self.objeto_id} - {self.estado}"
+
+
+# ======================================
+# MODELO: SUBIDAS POR FRAGMENTOS
+# ======================================
+
+class SubidaFragmentada(models.Model):
+    """
+    Subida reanudable de un certificado, enviada por fragmentos a un
+    archivo temporal (ver curriculum.subidas)
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='subidas'
+    )
+    nombre = models.CharField(max_length=255)
+    tamano = models.PositiveBigIntegerField()
+    recibidos = models.PositiveBigIntegerField(default=0)
+    completa = models.BooleanField(default=False)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Subida por Fragmentos'
+        verbose_name_plural = 'Subidas por Fragmentos'
+        indexes = [
+            models.Index(fields=['fecha_actualizacion']),
+        ]
+
+    def __str__(self):
+        return f"{self.nombre} ({self.recibidos}/{self.tamano})"
@@ -0,0 +1,91 @@
+"""
+Seguimiento de campos modificados en los modelos del CV
+
+Un save() normal reescribe todas las columnas (incluidos los textos largos)
+aunque el formulario no haya cambiado nada, mueve fecha_actualizacion y, a
+través de las señales, incrementa la versión del perfil e invalida cachés.
+
+Con CamposModificadosMixin cada instancia recuerda los valores con que se
+leyó de la BD; al guardar una instancia existente solo se escriben las
+columnas que cambiaron (update_fields) y, si no cambió ninguna, no se
+escribe nada ni se envían pre_save/post_save.
+"""
+
+import copy
+
+from django.core.exceptions import ValidationError
+
+
+class CamposModificadosMixin:
+    """
+    Mixin para modelos: save() con update_fields limitado a lo modificado
+
+    Atributos de clase:
+        campos_calculados: columnas que asignan las señales pre_save (Ej:
+            completitud); se escriben siempre que se guarde algún cambio
+    """
+    campos_calculados = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        instancia._recordar_valores()
+        return instancia
+
+    def _valor_comparable(self, campo):
+        valor = self.__dict__[campo.attname]
+        try:
+            # Ej: FieldFile -> nombre del archivo, PhoneNumber -> texto
+            valor = campo.get_prep_value(valor)
+        except (TypeError, ValueError, ValidationError):
+            pass
+        return copy.deepcopy(valor) if isinstance(valor, (dict, list)) else valor
+
+    def _recordar_valores(self, nombres=None):
+        if not hasattr(self, '_valores_originales'):
+            self._valores_originales = {}
+        for campo in self._meta.concrete_fields:
+            if campo.attname not in self.__dict__:
+                continue  # Diferido (only/defer): no se leyó
+            if nombres is None or campo.name in nombres or campo.attname in nombres:
+                self._valores_originales[campo.attname] = self._valor_comparable(campo)
+
+    def valor_original(self, attname, defecto=None):
+        """
+        Valor del campo al leerse de la BD (o tras el último guardado)
+        """
+        return getattr(self, '_valores_originales', {}).get(attname, defecto)
+
+    def campos_modificados(self):
+        """
+        Nombres de los campos cuyo valor difiere del leído de la BD
+        """
+        originales = getattr(self, '_valores_originales', {})
+        return {
+            campo.name
+            for campo in self._meta.concrete_fields
+            if not campo.primary_key and campo.attname in self.__dict__ and (
+                campo.attname not in originales
+                or self._valor_comparable(campo) != originales[campo.attname]
+            )
+        }
+
+    def save(self, *args, **kwargs):
+        if self._state.adding or args or kwargs.get('update_fields') is not None or kwargs.get('force_insert'):
+            super().save(*args, **kwargs)
+            self._recordar_valores(kwargs.get('update_fields'))
+            return
+
+        modificados = self.campos_modificados()
+        if not modificados:
+            return
+
+        kwargs['update_fields'] = modificados | set(self.campos_calculados) | {
+            campo.name for campo in self._meta.concrete_fields if getattr(campo, 'auto_now', False)
+        }
+        super().save(**kwargs)
+        self._recordar_valores()
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self._recordar_valores(fields)
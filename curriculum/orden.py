@@ -0,0 +1,111 @@
+"""
+Orden manual de las filas de una sección (arrastrar y soltar)
+
+`orden` guarda claves dispersas (múltiplos de ESPACIO), así que mover una
+fila normalmente solo reescribe esa fila con una clave entre las de sus
+nuevos vecinos. Las filas que no cambiaron de posición relativa (la
+subsecuencia creciente más larga de las claves actuales) conservan su
+clave; solo si no queda hueco entre dos vecinos se renumera la sección.
+Los cambios se escriben con un único bulk_update (UPDATE ... CASE WHEN).
+
+Las filas nuevas tienen orden 0 y aparecen primero hasta que se reordenan.
+"""
+
+from bisect import bisect_left
+
+from django.db import transaction
+
+from .signals import incrementar_version
+
+
+ESPACIO = 1024
+
+
+def _subsecuencia_creciente(claves):
+    """
+    Posiciones de la subsecuencia estrictamente creciente más larga
+    """
+    finales, posiciones, anterior = [], [], [None] * len(claves)
+    for posicion, clave in enumerate(claves):
+        indice = bisect_left(finales, clave)
+        if indice == len(finales):
+            finales.append(clave)
+            posiciones.append(posicion)
+        else:
+            finales[indice] = clave
+            posiciones[indice] = posicion
+        anterior[posicion] = posiciones[indice - 1] if indice else None
+
+    resultado = set()
+    posicion = posiciones[-1] if posiciones else None
+    while posicion is not None:
+        resultado.add(posicion)
+        posicion = anterior[posicion]
+    return resultado
+
+
+def nuevas_claves(claves):
+    """
+    Claves para las filas en su nuevo orden, conservando todas las posibles.
+
+    Args:
+        claves: claves actuales de las filas, ya en el nuevo orden
+
+    Returns:
+        lista de claves estrictamente crecientes y mayores que 0
+    """
+    fijas = _subsecuencia_creciente(claves)
+    resultado = list(claves)
+    total = len(claves)
+
+    inicio = 0
+    while inicio < total:
+        if inicio in fijas and (inicio or claves[inicio] > 0):
+            inicio += 1
+            continue
+
+        # Tramo [inicio, fin) de filas movidas entre dos claves que se conservan
+        fin = inicio + 1
+        while fin < total and fin not in fijas:
+            fin += 1
+        inferior = resultado[inicio - 1] if inicio else 0
+        if fin < total:
+            paso = (claves[fin] - inferior) // (fin - inicio + 1)
+            if paso < 1:
+                return [ESPACIO * (posicion + 1) for posicion in range(total)]
+        else:
+            paso = ESPACIO
+        for posicion in range(inicio, fin):
+            resultado[posicion] = inferior + paso * (posicion - inicio + 1)
+        inicio = fin
+
+    return resultado
+
+
+def reordenar(perfil, modelo, ids):
+    """
+    Aplica un nuevo orden a las filas de una sección del perfil.
+
+    Args:
+        ids: todas las filas de la sección del perfil, en el nuevo orden
+
+    Returns:
+        número de filas reescritas
+
+    Raises:
+        ValueError: si ids no son exactamente las filas del perfil
+    """
+    actuales = dict(modelo.objects.filter(perfil=perfil).values_list('pk', 'orden'))
+    if len(ids) != len(actuales) or set(ids) != set(actuales):
+        raise ValueError("La lista no coincide con las filas de la sección.")
+
+    claves = nuevas_claves([actuales[pk] for pk in ids])
+    cambios = [
+        modelo(pk=pk, perfil_id=perfil.pk, orden=clave)
+        for pk, clave in zip(ids, claves) if actuales[pk] != clave
+    ]
+    if cambios:
+        with transaction.atomic():
+            modelo.objects.bulk_update(cambios, ['orden'])
+            incrementar_version(perfil.pk, actualizar_fecha=True)
+    return len(cambios)
@@ -0,0 +1,211 @@
+"""
+Paginación por keyset (seek) con cursores opacos
+
+En lugar de OFFSET, cada página continúa desde los valores de ordenación del
+último elemento visto: WHERE (fecha_actualizacion, id) < (valor, id) LIMIT n.
+Con un índice compuesto sobre las mismas columnas, la página 1.000 cuesta lo
+mismo que la página 1.
+
+Uso:
+    paginador = PaginadorKeyset(PerfilProfesional.objects.filter(cv_publico=True), 20)
+    pagina = paginador.pagina(request.GET.get('cursor'))
+    pagina.objetos, pagina.cursor_siguiente, pagina.cursor_anterior
+
+Un cursor alterado, o que ya no corresponde al orden, lanza CursorInvalido
+(un InvalidPage, como el de Paginator): las vistas responden 404.
+"""
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+
+
+SALT_CURSOR = 'curriculum.paginacion'
+
+# Orden por defecto de los listados de perfiles (ver índice perfil_fecha_id_idx)
+ORDEN_PERFILES = ('-fecha_actualizacion', '-id')
+
+SIGUIENTE = 'n'
+ANTERIOR = 'p'
+
+
+class CursorInvalido(InvalidPage):
+    """
+    Cursor con firma inválida o con valores que no corresponden al orden
+    """
+
+
+def codificar_cursor(valores, direccion=SIGUIENTE):
+    """
+    Convierte los valores de ordenación en un cursor opaco y firmado
+    """
+    return signing.dumps(
+        {'v': valores, 'd': direccion},
+        salt=SALT_CURSOR,
+        compress=True,
+        serializer=signing.JSONSerializer
+    )
+
+
+def decodificar_cursor(cursor):
+    """
+    Devuelve (valores, direccion), o (None, SIGUIENTE) sin cursor.
+
+    Raises:
+        CursorInvalido: firma inválida o estructura inesperada
+    """
+    if not cursor:
+        return None, SIGUIENTE
+    try:
+        datos = signing.loads(cursor, salt=SALT_CURSOR)
+        valores, direccion = datos['v'], datos.get('d', SIGUIENTE)
+    except (signing.BadSignature, KeyError, TypeError):
+        raise CursorInvalido('Cursor no válido.')
+    if not isinstance(valores, list) or direccion not in (SIGUIENTE, ANTERIOR):
+        raise CursorInvalido('Cursor no válido.')
+    return valores, direccion
+
+
+class PaginaKeyset:
+    """
+    Una página de resultados con los cursores para navegar
+    """
+    def __init__(self, objetos, cursor_siguiente=None, cursor_anterior=None):
+        self.objetos = objetos
+        self.cursor_siguiente = cursor_siguiente
+        self.cursor_anterior = cursor_anterior
+
+    @property
+    def tiene_siguiente(self):
+        return self.cursor_siguiente is not None
+
+    @property
+    def tiene_anterior(self):
+        return self.cursor_anterior is not None
+
+    def __iter__(self):
+        return iter(self.objetos)
+
+    def __len__(self):
+        return len(self.objetos)
+
+
+class PaginadorKeyset:
+    """
+    Paginador por keyset sobre un queryset
+
+    El último campo de `orden` debe ser único (normalmente 'id' o '-id')
+    para que el orden sea total y ninguna fila se repita ni se pierda.
+    """
+    def __init__(self, queryset, por_pagina, orden=ORDEN_PERFILES):
+        self.queryset = queryset
+        self.por_pagina = por_pagina
+        self.orden = tuple(orden)
+        self.campos = [campo.lstrip('-') for campo in self.orden]
+
+    def _valores(self, objeto):
+        """
+        Valores de ordenación de un objeto, serializables en JSON
+        """
+        valores = []
+        for campo in self.campos:
+            valor = getattr(objeto, campo)
+            valores.append(valor.isoformat() if hasattr(valor, 'isoformat') else valor)
+        return valores
+
+    def _filtro_despues_de(self, valores, invertir=False):
+        """
+        Construye (c1, c2, ...) > (v1, v2, ...) respetando la dirección de cada campo
+        """
+        modelo = self.queryset.model
+        try:
+            valores = [
+                modelo._meta.get_field(campo).to_python(valor)
+                for campo, valor in zip(self.campos, valores)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise CursorInvalido('Cursor no válido.')
+
+        filtro = Q()
+        iguales = {}
+        for orden, campo, valor in zip(self.orden, self.campos, valores):
+            descendente = orden.startswith('-') != invertir
+            operador = 'lt' if descendente else 'gt'
+            filtro |= Q(**iguales, **{f'{campo}__{operador}': valor})
+            iguales[campo] = valor
+
+        # Cota sobre el primer campo para que el motor recorra el índice por rango
+        descendente = self.orden[0].startswith('-') != invertir
+        cota = {f"{self.campos[0]}__{'lte' if descendente else 'gte'}": valores[0]}
+        return Q(**cota) & filtro
+
+    def pagina(self, cursor=None):
+        """
+        Raises:
+            CursorInvalido: ver decodificar_cursor; también si los valores no
+                corresponden a los campos de `orden` (Ej: cursor de otro listado)
+        """
+        valores, direccion = decodificar_cursor(cursor)
+        if valores is not None and len(valores) != len(self.campos):
+            raise CursorInvalido('Cursor no válido.')
+
+        hacia_atras = valores is not None and direccion == ANTERIOR
+        orden = self.orden
+        if hacia_atras:
+            orden = tuple(campo[1:] if campo.startswith('-') else f'-{campo}' for campo in self.orden)
+
+        queryset = self.queryset.order_by(*orden)
+        if valores is not None:
+            queryset = queryset.filter(self._filtro_despues_de(valores, invertir=hacia_atras))
+
+        # Un elemento extra indica si hay más resultados en esta dirección
+        objetos = list(queryset[:self.por_pagina + 1])
+        hay_mas = len(objetos) > self.por_pagina
+        objetos = objetos[:self.por_pagina]
+
+        if hacia_atras:
+            objetos.reverse()
+
+        if not objetos:
+            return PaginaKeyset(objetos)
+
+        if hacia_atras:
+            hay_siguiente, hay_anterior = True, hay_mas
+        else:
+            hay_siguiente, hay_anterior = hay_mas, valores is not None
+
+        return PaginaKeyset(
+            objetos,
+            cursor_siguiente=codificar_cursor(self._valores(objetos[-1]), SIGUIENTE) if hay_siguiente else None,
+            cursor_anterior=codificar_cursor(self._valores(objetos[0]), ANTERIOR) if hay_anterior else None,
+        )
+
+
+def paginar_lista(ids, por_pagina, cursor=None):
+    """
+    Pagina una lista ya ordenada (Ej: ids por relevancia de búsqueda)
+    con los mismos cursores opacos que PaginadorKeyset.
+
+    Returns:
+        PaginaKeyset cuyos objetos son los elementos de la lista en esa página
+
+    Raises:
+        CursorInvalido: ver decodificar_cursor
+    """
+    valores, direccion = decodificar_cursor(cursor)
+    posicion = 0
+    if valores is not None:
+        if len(valores) != 1 or type(valores[0]) is not int:
+            raise CursorInvalido('Cursor no válido.')
+        posicion = valores[0]
+    if direccion == ANTERIOR:
+        posicion = max(0, posicion - por_pagina)
+    posicion = max(0, min(posicion, len(ids)))
+
+    fin = posicion + por_pagina
+    return PaginaKeyset(
+        ids[posicion:fin],
+        cursor_siguiente=codificar_cursor([fin], SIGUIENTE) if fin < len(ids) else None,
+        cursor_anterior=codificar_cursor([posicion], ANTERIOR) if posicion > 0 else None,
+    )
@@ -16,12 +16,14 @@ from reportlab.pdfgen import canvas
 from datetime import date
 
 
-def generar_cv_pdf(perfil):
+def generar_cv_pdf(perfil, publico=False):
     """
     Genera un PDF profesional del CV
     
     Args:
         perfil: Instancia de PerfilProfesional
+        publico: Para visitantes del CV público; omite el teléfono, igual
+            que public_cv.html (solo se muestra el email)
     
     Returns:
         BytesIO: Buffer con el PDF generado
@@ -105,16 +107,28 @@ def generar_cv_pdf(perfil):
     elements.append(titulo)
     
     # Información de contacto
-    contacto_data = [
-        [
-            Paragraph(f"<b>Email:</b> {perfil.email}", texto_normal),
-            Paragraph(f"<b>Teléfono:</b> {perfil.telefono}", texto_normal),
-        ],
-        [
-            Paragraph(f"<b>Ubicación:</b> {perfil.ciudad}, {perfil.pais}", texto_normal),
-            Paragraph(f"<b>Experiencia:</b> {perfil.anos_experiencia} años", texto_normal),
+    if publico:
+        contacto_data = [
+            [
+                Paragraph(f"<b>Email:</b> {perfil.email}", texto_normal),
+                Paragraph(f"<b>Experiencia:</b> {perfil.anos_experiencia} años", texto_normal),
+            ],
+            [
+                Paragraph(f"<b>Ubicación:</b> {perfil.ciudad}, {perfil.pais}", texto_normal),
+                Paragraph("", texto_normal),
+            ]
+        ]
+    else:
+        contacto_data = [
+            [
+                Paragraph(f"<b>Email:</b> {perfil.email}", texto_normal),
+                Paragraph(f"<b>Teléfono:</b> {perfil.telefono}", texto_normal),
+            ],
+            [
+                Paragraph(f"<b>Ubicación:</b> {perfil.ciudad}, {perfil.pais}", texto_normal),
+                Paragraph(f"<b>Experiencia:</b> {perfil.anos_experiencia} años", texto_normal),
+            ]
         ]
-    ]
     
     if perfil.linkedin:
         contacto_data.append([
@@ -169,7 +183,7 @@ def generar_cv_pdf(perfil):
             
             # Fechas y ubicación
             fecha_inicio = exp.fecha_inicio.strftime("%m/%Y")
-            fecha_fin = "Presente" if exp.trabajo_actual else exp.fecha_fin.strftime("%m/%Y")
+            fecha_fin = "Presente" if exp.trabajo_actual or not exp.fecha_fin else exp.fecha_fin.strftime("%m/%Y")
             
             fechas = Paragraph(
                 f"{fecha_inicio} - {fecha_fin} | {exp.ciudad}, {exp.pais}",
@@ -247,29 +261,29 @@ def generar_cv_pdf(perfil):
     # HABILIDADES
     # ======================================
     
-    habilidades = perfil.habilidades.all()[:15]
-    if habilidades.exists():
+    habilidades = list(perfil.habilidades.all()[:15])
+    if habilidades:
         elements.append(Spacer(1, 0.3*cm))
         elements.append(Paragraph("HABILIDADES", seccion_style))
         
-        # Agrupar por tipo
-        habilidades_tecnicas = habilidades.filter(tipo='tecnica')
-        habilidades_blandas = habilidades.filter(tipo='blanda')
-        idiomas = habilidades.filter(tipo='idioma')
+        # Agrupar por tipo (sobre la lista ya cargada; no se puede filtrar un queryset recortado)
+        habilidades_tecnicas = [h for h in habilidades if h.tipo == 'tecnica']
+        habilidades_blandas = [h for h in habilidades if h.tipo == 'blanda']
+        idiomas = [h for h in habilidades if h.tipo == 'idioma']
         
-        if habilidades_tecnicas.exists():
+        if habilidades_tecnicas:
             elements.append(Paragraph("<b>Habilidades Técnicas:</b>", texto_bold))
             skills_tech = ", ".join([f"{h.nombre} ({h.nivel}%)" for h in habilidades_tecnicas])
             elements.append(Paragraph(skills_tech, texto_normal))
             elements.append(Spacer(1, 0.2*cm))
         
-        if habilidades_blandas.exists():
+        if habilidades_blandas:
             elements.append(Paragraph("<b>Habilidades Blandas:</b>", texto_bold))
             skills_soft = ", ".join([h.nombre for h in habilidades_blandas])
             elements.append(Paragraph(skills_soft, texto_normal))
             elements.append(Spacer(1, 0.2*cm))
         
-        if idiomas.exists():
+        if idiomas:
             elements.append(Paragraph("<b>Idiomas:</b>", texto_bold))
             langs = ", ".join([f"{h.nombre} ({h.nivel}%)" for h in idiomas])
             elements.append(Paragraph(langs, texto_normal))
@@ -0,0 +1,148 @@
+"""
+Serializadores de la API pública de CVs
+
+Solo exponen datos que ya muestra el CV público (sin teléfono, fecha de
+nacimiento ni referencias). Todos aceptan `campos` para devolver un
+subconjunto de atributos (sparse fieldsets).
+"""
+
+from django.urls import reverse
+from rest_framework import serializers
+
+from .models import (
+    PerfilProfesional,
+    FormacionAcademica,
+    ExperienciaProfesional,
+    Habilidad,
+    Proyecto,
+    Certificacion
+)
+
+
+class CamposDinamicosSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer que conserva solo los campos indicados en `campos`
+    """
+    # Columnas de BD que necesita cada campo calculado
+    columnas_derivadas = {}
+
+    def __init__(self, *args, campos=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if campos is not None:
+            for nombre in set(self.fields) - set(campos):
+                self.fields.pop(nombre)
+
+    @classmethod
+    def campos_disponibles(cls):
+        return list(cls.Meta.fields)
+
+    @classmethod
+    def columnas(cls, campos):
+        """
+        Columnas a cargar con only() para serializar `campos`
+        """
+        columnas = set()
+        for campo in campos:
+            columnas.update(cls.columnas_derivadas.get(campo, [campo]))
+        return sorted(columnas)
+
+
+# ======================================
+# SECCIONES
+# ======================================
+
+class FormacionAcademicaSerializer(CamposDinamicosSerializer):
+    class Meta:
+        model = FormacionAcademica
+        fields = [
+            'id', 'nivel', 'titulo_obtenido', 'institucion',
+            'fecha_inicio', 'fecha_fin', 'estado', 'descripcion'
+        ]
+
+
+class ExperienciaProfesionalSerializer(CamposDinamicosSerializer):
+    class Meta:
+        model = ExperienciaProfesional
+        fields = [
+            'id', 'cargo', 'empresa', 'tipo_empleo', 'ciudad', 'pais',
+            'fecha_inicio', 'fecha_fin', 'trabajo_actual',
+            'descripcion', 'logros', 'tecnologias_usadas'
+        ]
+
+
+class HabilidadSerializer(CamposDinamicosSerializer):
+    class Meta:
+        model = Habilidad
+        fields = ['id', 'nombre', 'tipo', 'nivel', 'anos_experiencia', 'destacada']
+
+
+class ProyectoSerializer(CamposDinamicosSerializer):
+    class Meta:
+        model = Proyecto
+        fields = [
+            'id', 'nombre', 'descripcion_corta', 'descripcion', 'estado',
+            'fecha_inicio', 'fecha_fin', 'rol', 'tecnologias',
+            'url_demo', 'url_repositorio', 'imagen', 'destacado'
+        ]
+
+
+class CertificacionSerializer(CamposDinamicosSerializer):
+    class Meta:
+        model = Certificacion
+        fields = [
+            'id', 'nombre', 'institucion', 'fecha_obtencion',
+            'fecha_expiracion', 'codigo_credencial', 'url_verificacion'
+        ]
+
+
+# Secciones que se pueden pedir con ?include= (related_name -> serializador)
+SECCIONES = {
+    'formacion_academica': FormacionAcademicaSerializer,
+    'experiencias': ExperienciaProfesionalSerializer,
+    'habilidades': HabilidadSerializer,
+    'proyectos': ProyectoSerializer,
+    'certificaciones': CertificacionSerializer,
+}
+
+
+# ======================================
+# PERFIL
+# ======================================
+
+class PerfilPublicoSerializer(CamposDinamicosSerializer):
+    """
+    Perfil público con las secciones pedidas en `incluir`.
+    Las secciones deben venir precargadas (prefetch) para no consultar por fila.
+    """
+    nombre_completo = serializers.CharField(read_only=True)
+    url = serializers.SerializerMethodField()
+
+    columnas_derivadas = {
+        'nombre_completo': ['nombres', 'apellidos'],
+        'url': ['slug'],
+    }
+
+    class Meta:
+        model = PerfilProfesional
+        fields = [
+            'slug', 'url', 'version', 'nombres', 'apellidos', 'nombre_completo',
+            'foto', 'titulo_profesional', 'nivel_experiencia', 'anos_experiencia',
+            'resumen_profesional', 'objetivo_profesional', 'email',
+            'linkedin', 'github', 'portafolio_web',
+            'ciudad', 'provincia', 'pais', 'nacionalidad', 'fecha_actualizacion'
+        ]
+
+    def __init__(self, *args, incluir=(), campos_secciones=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        campos_secciones = campos_secciones or {}
+        for seccion in incluir:
+            self.fields[seccion] = SECCIONES[seccion](
+                many=True,
+                read_only=True,
+                campos=campos_secciones.get(seccion)
+            )
+
+    def get_url(self, perfil):
+        url = reverse('curriculum:cv_publico', kwargs={'slug': perfil.slug})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -0,0 +1,305 @@
+"""
+Señales del sistema de CV
+
+Mantienen de forma incremental las estructuras derivadas de los modelos
+(índice de búsqueda, contadores globales, estadísticas por sección,
+completitud, facetas de habilidades, versión del perfil, sitemap)
+cada vez que se escribe un perfil o una de sus secciones.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import busqueda, completitud, contadores, estadisticas, habilidades, imagenes, media, sitemap
+from .models import (
+    PerfilProfesional,
+    FormacionAcademica,
+    ExperienciaProfesional,
+    Habilidad,
+    Proyecto,
+    ReferenciaProfesional,
+    Certificacion,
+    EstadisticasPerfil,
+)
+
+
+# ======================================
+# ÍNDICE DE BÚSQUEDA
+# ======================================
+
+def programar_indexacion(perfil_id):
+    """
+    Reindexa el perfil cuando la transacción actual se confirme
+    """
+    transaction.on_commit(lambda: busqueda.indexar_perfil(perfil_id))
+
+
+@receiver(post_save, sender=PerfilProfesional)
+def indexar_perfil_guardado(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    programar_indexacion(instance.pk)
+
+
+@receiver(post_delete, sender=PerfilProfesional)
+def retirar_perfil_eliminado(sender, instance, **kwargs):
+    perfil_id = instance.pk
+    transaction.on_commit(lambda: busqueda.retirar_perfil(perfil_id))
+
+
+# ======================================
+# CONTADORES GLOBALES
+# ======================================
+
+@receiver(post_save, sender=PerfilProfesional)
+def contar_perfil_guardado(sender, instance, raw=False, created=False, **kwargs):
+    if raw:
+        return
+    if created:
+        contadores.ajustar(perfiles=1, cvs_publicos=int(instance.cv_publico))
+    elif instance.cv_publico != instance.valor_original('cv_publico'):
+        contadores.ajustar(cvs_publicos=1 if instance.cv_publico else -1)
+
+
+@receiver(post_delete, sender=PerfilProfesional)
+def contar_perfil_eliminado(sender, instance, **kwargs):
+    contadores.ajustar(perfiles=-1, cvs_publicos=-int(instance.valor_original('cv_publico', False)))
+
+
+# ======================================
+# ESTADÍSTICAS POR SECCIÓN
+# ======================================
+
+@receiver(post_save, sender=PerfilProfesional)
+def crear_estadisticas_perfil(sender, instance, raw=False, created=False, **kwargs):
+    if raw or not created:
+        return
+    EstadisticasPerfil.objects.get_or_create(perfil=instance)
+
+
+# ======================================
+# COMPLETITUD
+# ======================================
+
+@receiver(pre_save, sender=PerfilProfesional)
+def calcular_completitud_perfil(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    stats = None
+    if not instance._state.adding:
+        stats = EstadisticasPerfil.objects.filter(perfil_id=instance.pk).first()
+    completitud.aplicar(instance, stats or EstadisticasPerfil())
+
+
+# ======================================
+# FACETAS DE HABILIDADES
+# ======================================
+
+def programar_facetas(canonica_ids):
+    """
+    Recalcula las facetas afectadas cuando la transacción actual se confirme
+    """
+    canonica_ids = {pk for pk in canonica_ids if pk}
+    if canonica_ids:
+        transaction.on_commit(lambda: habilidades.recalcular_facetas(canonica_ids))
+
+
+@receiver(pre_save, sender=Habilidad)
+def enlazar_habilidad_canonica(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if instance.canonica_id is None or instance.nombre != instance.valor_original('nombre'):
+        canonica = habilidades.resolver_canonica(instance.nombre)
+        instance.canonica_id = canonica.pk if canonica else None
+
+
+@receiver(post_save, sender=PerfilProfesional)
+def actualizar_facetas_perfil(sender, instance, raw=False, created=False, **kwargs):
+    if raw:
+        return
+    if not created and instance.cv_publico != instance.valor_original('cv_publico'):
+        programar_facetas(instance.habilidades.values_list('canonica_id', flat=True))
+
+
+# ======================================
+# IMÁGENES
+# ======================================
+
+def imagenes_guardadas(modelo, instancias):
+    """
+    Encola las variantes de los archivos nuevos o reemplazados
+    """
+    campo = media.CAMPOS[modelo]
+    pendientes = []
+    for instancia in instancias:
+        archivo = getattr(instancia, campo)
+        if (archivo.name or None) == (instancia.valor_original(campo) or None):
+            continue
+        # Hasta que el trabajador genere las nuevas se muestra el original
+        if getattr(instancia, f'{campo}_variantes'):
+            modelo.objects.filter(pk=instancia.pk).update(**{media.descartar_variantes(instancia): {}})
+        if archivo:
+            pendientes.append(instancia.pk)
+    if pendientes:
+        media.encolar(modelo, pendientes)
+
+
+def imagenes_eliminadas(modelo, instancias):
+    """
+    Borra del storage las variantes de las instancias eliminadas, al confirmar
+    """
+    campo = media.CAMPOS[modelo]
+    for instancia in instancias:
+        variantes = getattr(instancia, f'{campo}_variantes')
+        if variantes:
+            storage = getattr(instancia, campo).storage
+            transaction.on_commit(
+                lambda storage=storage, variantes=variantes: imagenes.eliminar_variantes(storage, variantes)
+            )
+
+
+@receiver(pre_save, sender=PerfilProfesional)
+@receiver(pre_save, sender=Proyecto)
+@receiver(pre_save, sender=Certificacion)
+def normalizar_imagen_subida(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    media.normalizar_subida(instance)
+
+
+@receiver(post_save, sender=PerfilProfesional)
+def encolar_variantes_foto(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    imagenes_guardadas(sender, [instance])
+
+
+@receiver(post_delete, sender=PerfilProfesional)
+def eliminar_variantes_foto(sender, instance, **kwargs):
+    imagenes_eliminadas(sender, [instance])
+
+
+# ======================================
+# VERSIÓN DEL PERFIL
+# ======================================
+
+def incrementar_version(perfil_id, actualizar_fecha=False):
+    """
+    Marca el perfil como modificado; invalida los ETag de la API y su página del sitemap.
+    Con actualizar_fecha (cambios en secciones) también mueve fecha_actualizacion.
+    """
+    cambios = {'version': F('version') + 1}
+    if actualizar_fecha:
+        cambios['fecha_actualizacion'] = timezone.now()
+    PerfilProfesional.objects.filter(pk=perfil_id).update(**cambios)
+    transaction.on_commit(lambda: sitemap.invalidar(perfil_id))
+
+
+@receiver(post_save, sender=PerfilProfesional)
+def versionar_perfil_guardado(sender, instance, raw=False, created=False, **kwargs):
+    if raw:
+        return
+    if created:
+        transaction.on_commit(lambda: sitemap.invalidar(instance.pk))
+    else:
+        incrementar_version(instance.pk)
+
+
+@receiver(post_delete, sender=PerfilProfesional)
+def versionar_perfil_eliminado(sender, instance, **kwargs):
+    perfil_id = instance.pk
+    transaction.on_commit(lambda: sitemap.invalidar(perfil_id))
+
+
+# ======================================
+# SECCIONES DEL PERFIL
+# ======================================
+
+# Secciones que forman parte del índice de búsqueda
+SECCIONES_INDEXADAS = {Habilidad, ExperienciaProfesional, Proyecto}
+
+_lote = threading.local()
+
+
+def seccion_modificada(modelo, perfil_id, creadas=(), modificadas=(), eliminadas=()):
+    """
+    Efectos de escribir filas de una sección del perfil: estadísticas,
+    completitud, versión, índice, facetas e imágenes.
+
+    Los receptores lo llaman con cada fila guardada o eliminada, y
+    edicion_masiva.guardar() (que escribe por lotes, sin señales) una vez
+    con todas las de la edición. Un efecto nuevo de las secciones va aquí
+    para que ambos caminos lo apliquen.
+    """
+    if not (creadas or modificadas or eliminadas):
+        return
+
+    diferencia = len(creadas) - len(eliminadas)
+    if diferencia:
+        estadisticas.ajustar(perfil_id, modelo, diferencia)
+    # Después de ajustar los conteos: la completitud los lee
+    if creadas or eliminadas:
+        completitud.actualizar(perfil_id)
+    incrementar_version(perfil_id, actualizar_fecha=True)
+
+    if modelo in SECCIONES_INDEXADAS:
+        programar_indexacion(perfil_id)
+
+    if modelo is Habilidad:
+        # Una edición de nivel no cambia los conteos; solo altas, bajas y cambios de habilidad
+        canonicas = [habilidad.canonica_id for habilidad in [*creadas, *eliminadas]]
+        for habilidad in modificadas:
+            original = habilidad.valor_original('canonica_id')
+            if habilidad.canonica_id != original:
+                canonicas += [habilidad.canonica_id, original]
+        programar_facetas(canonicas)
+
+    if modelo in media.CAMPOS:
+        imagenes_guardadas(modelo, [*creadas, *modificadas])
+        imagenes_eliminadas(modelo, eliminadas)
+
+
+@contextmanager
+def bajas_en_lote():
+    """
+    Dentro del bloque seccion_eliminada no actúa: quien borra varias filas con
+    QuerySet.delete() llama después a seccion_modificada con todas ellas
+    """
+    _lote.activo = True
+    try:
+        yield
+    finally:
+        _lote.activo = False
+
+
+@receiver(post_save, sender=FormacionAcademica)
+@receiver(post_save, sender=ExperienciaProfesional)
+@receiver(post_save, sender=Habilidad)
+@receiver(post_save, sender=Proyecto)
+@receiver(post_save, sender=ReferenciaProfesional)
+@receiver(post_save, sender=Certificacion)
+def seccion_guardada(sender, instance, raw=False, created=False, **kwargs):
+    if raw:
+        return
+    if created:
+        seccion_modificada(sender, instance.perfil_id, creadas=[instance])
+    else:
+        seccion_modificada(sender, instance.perfil_id, modificadas=[instance])
+
+
+@receiver(post_delete, sender=FormacionAcademica)
+@receiver(post_delete, sender=ExperienciaProfesional)
+@receiver(post_delete, sender=Habilidad)
+@receiver(post_delete, sender=Proyecto)
+@receiver(post_delete, sender=ReferenciaProfesional)
+@receiver(post_delete, sender=Certificacion)
+def seccion_eliminada(sender, instance, **kwargs):
+    if getattr(_lote, 'activo', False):
+        return
+    seccion_modificada(sender, instance.perfil_id, eliminadas=[instance])
@@ -0,0 +1,143 @@
+"""
+Sitemap de los CVs públicos
+
+    /sitemap.xml               Índice con una entrada por página
+    /sitemap-cvs-<n>.xml       URLs de los CVs públicos de la página n
+
+Las páginas se reparten por rangos de id (id 1..50.000 en la página 1, etc.),
+así que ninguna supera el límite de 50.000 URLs y un cambio en un perfil
+solo invalida su página. El XML se genera recorriendo values_list() con
+iterator(), sin instanciar modelos, y se guarda comprimido en la caché
+hasta que un perfil de esa página cambie.
+"""
+
+import zlib
+from xml.sax.saxutils import escape
+
+from django.core.cache import cache
+from django.db.models import F, IntegerField, Max
+from django.db.models.functions import Cast
+from django.urls import reverse
+
+from .models import PerfilProfesional
+
+
+URLS_POR_PAGINA = 50000
+TAMANO_BLOQUE = 2000
+TIEMPO_CACHE = 60 * 60 * 24
+
+CABECERA_URLSET = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+CABECERA_INDICE = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+
+
+def pagina_de(perfil_id):
+    return (perfil_id - 1) // URLS_POR_PAGINA + 1
+
+
+# ======================================
+# CACHÉ
+# ======================================
+
+def _generacion(nombre):
+    """
+    Contador que forma parte de la clave; incrementarlo invalida la entrada
+    para todos los hosts sin conocerlos
+    """
+    return cache.get_or_set(f'sitemap:generacion:{nombre}', 1, None)
+
+
+def _clave(nombre, base):
+    return f'sitemap:{nombre}:{_generacion(nombre)}:{base}'
+
+
+def invalidar(perfil_id):
+    """
+    Descarta el índice y la página que contiene al perfil
+    """
+    for nombre in ('indice', f'cvs:{pagina_de(perfil_id)}'):
+        try:
+            cache.incr(f'sitemap:generacion:{nombre}')
+        except ValueError:
+            cache.set(f'sitemap:generacion:{nombre}', 1, None)
+
+
+def contenido_en_cache(nombre, base):
+    """
+    Devuelve los bytes guardados, o None si hay que generarlos
+    """
+    comprimido = cache.get(_clave(nombre, base))
+    return zlib.decompress(comprimido) if comprimido is not None else None
+
+
+def generar_y_cachear(nombre, base, partes):
+    """
+    Emite las partes del XML a medida que se generan y, al terminar,
+    guarda el resultado comprimido en la caché
+    """
+    clave = _clave(nombre, base)
+    acumulado = []
+    for parte in partes:
+        datos = parte.encode('utf-8')
+        acumulado.append(datos)
+        yield datos
+    cache.set(clave, zlib.compress(b''.join(acumulado)), TIEMPO_CACHE)
+
+
+# ======================================
+# GENERACIÓN
+# ======================================
+
+def _publicos():
+    return PerfilProfesional.objects.filter(cv_publico=True)
+
+
+def paginas():
+    """
+    [(pagina, ultima_modificacion)] de las páginas con algún CV público.
+    Una sola consulta agrupada, sin recorrer los perfiles.
+    """
+    return list(
+        _publicos().annotate(
+            pagina=Cast((F('id') - 1) / URLS_POR_PAGINA, IntegerField()) + 1
+        ).values('pagina').annotate(
+            ultima=Max('fecha_actualizacion')
+        ).order_by('pagina').values_list('pagina', 'ultima')
+    )
+
+
+def xml_indice(base):
+    yield CABECERA_INDICE
+    for pagina, ultima in paginas():
+        ubicacion = escape(base + reverse('curriculum:sitemap_cvs', kwargs={'pagina': pagina}))
+        yield f'<sitemap><loc>{ubicacion}</loc><lastmod>{ultima.isoformat()}</lastmod></sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def xml_pagina(base, pagina):
+    """
+    URLs de una página del sitemap, generadas por bloques
+    """
+    desde = (pagina - 1) * URLS_POR_PAGINA + 1
+    perfiles = _publicos().filter(
+        id__gte=desde, id__lt=desde + URLS_POR_PAGINA
+    ).order_by('id').values_list('slug', 'fecha_actualizacion')
+
+    # Prefijo común de las URLs de CV; solo cambia el slug
+    prefijo = escape(base + reverse('curriculum:cv_publico', kwargs={'slug': 'slug'})[:-len('slug/')])
+
+    yield CABECERA_URLSET
+    bloque = []
+    for slug, fecha in perfiles.iterator(chunk_size=TAMANO_BLOQUE):
+        bloque.append(f'<url><loc>{prefijo}{escape(slug)}/</loc><lastmod>{fecha.isoformat()}</lastmod></url>\n')
+        if len(bloque) >= TAMANO_BLOQUE:
+            yield ''.join(bloque)
+            bloque = []
+    if bloque:
+        yield ''.join(bloque)
+    yield '</urlset>\n'
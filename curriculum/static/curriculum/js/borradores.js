@@ -0,0 +1,142 @@
+// ============================================
+// BORRADORES - Autoguardado de formularios en el servidor
+// ============================================
+
+(function() {
+    'use strict';
+
+    // Milisegundos sin cambios antes de enviar el parche
+    const ESPERA = 2000;
+    const TIPOS_IGNORADOS = ['file', 'password', 'hidden', 'submit', 'button'];
+
+    document.addEventListener('DOMContentLoaded', function() {
+        initBorradores(document);
+    });
+
+    function camposDe(form, nombre) {
+        return Array.from(form.elements).filter(campo => campo.name === nombre);
+    }
+
+    function seGuarda(campo) {
+        return campo.name
+            && campo.name !== 'csrfmiddlewaretoken'
+            && !TIPOS_IGNORADOS.includes(campo.type);
+    }
+
+    function leerValor(form, nombre) {
+        const campos = camposDe(form, nombre);
+        const primero = campos[0];
+
+        if (primero.type === 'checkbox') {
+            if (campos.length === 1) return primero.checked;
+            return campos.filter(campo => campo.checked).map(campo => campo.value);
+        }
+        if (primero.type === 'radio') {
+            const marcado = campos.find(campo => campo.checked);
+            return marcado ? marcado.value : '';
+        }
+        if (primero.multiple) {
+            return Array.from(primero.selectedOptions).map(opcion => opcion.value);
+        }
+        return primero.value;
+    }
+
+    function escribirValor(form, nombre, valor) {
+        const campos = camposDe(form, nombre).filter(seGuarda);
+        if (!campos.length) return false;
+
+        campos.forEach(campo => {
+            if (campo.type === 'checkbox') {
+                campo.checked = Array.isArray(valor) ? valor.includes(campo.value) : Boolean(valor);
+            } else if (campo.type === 'radio') {
+                campo.checked = campo.value === valor;
+            } else if (campo.multiple) {
+                Array.from(campo.options).forEach(opcion => {
+                    opcion.selected = Array.isArray(valor) && valor.includes(opcion.value);
+                });
+            } else {
+                campo.value = valor;
+            }
+            // Para que los campos dependientes (Ej: fecha fin) se actualicen
+            campo.dispatchEvent(new Event('change', { bubbles: true }));
+        });
+        return true;
+    }
+
+    function iniciarFormulario(form) {
+        if (form.dataset.borradorIniciado) return;
+        form.dataset.borradorIniciado = '1';
+
+        const url = form.dataset.borradorUrl;
+        const clave = form.dataset.borrador;
+        const csrfInput = form.querySelector('input[name="csrfmiddlewaretoken"]');
+        const cabeceras = {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrfInput ? csrfInput.value : ''
+        };
+        const sucios = new Set();
+        let temporizador = null;
+
+        // Solo se envían los campos modificados desde el último envío
+        function enviar() {
+            clearTimeout(temporizador);
+            temporizador = null;
+            if (!sucios.size) return;
+
+            const cambios = {};
+            sucios.forEach(nombre => {
+                cambios[nombre] = leerValor(form, nombre);
+            });
+            sucios.clear();
+
+            fetch(url, {
+                method: 'POST',
+                headers: cabeceras,
+                body: JSON.stringify({ clave: clave, cambios: cambios }),
+                keepalive: true
+            }).catch(() => {
+                // Se reintenta con el siguiente cambio
+                Object.keys(cambios).forEach(nombre => sucios.add(nombre));
+            });
+        }
+
+        function marcar(e) {
+            if (!seGuarda(e.target) || !e.isTrusted) return;
+            sucios.add(e.target.name);
+            clearTimeout(temporizador);
+            temporizador = setTimeout(enviar, ESPERA);
+        }
+
+        form.addEventListener('input', marcar);
+        form.addEventListener('change', marcar);
+
+        // Al enviar el formulario el servidor descarta el borrador
+        form.addEventListener('submit', function() {
+            clearTimeout(temporizador);
+            sucios.clear();
+        });
+
+        // No perder lo escrito en los últimos segundos al salir de la página
+        document.addEventListener('visibilitychange', function() {
+            if (document.visibilityState === 'hidden' && temporizador) enviar();
+        });
+
+        // Restaurar el borrador (una sola petición) sin pisar lo que ya se escribió
+        fetch(`${url}?clave=${encodeURIComponent(clave)}`, { headers: { 'Accept': 'application/json' } })
+            .then(response => response.ok ? response.json() : { datos: {} })
+            .then(({ datos }) => {
+                const restaurados = Object.keys(datos).filter(nombre =>
+                    !sucios.has(nombre) && escribirValor(form, nombre, datos[nombre])
+                );
+                if (restaurados.length && window.showNotification) {
+                    showNotification('Se recuperaron cambios sin guardar de este formulario', 'info');
+                }
+            })
+            .catch(() => {});
+    }
+
+    window.initBorradores = function(raiz) {
+        (raiz || document).querySelectorAll('form[data-borrador]').forEach(iniciarFormulario);
+    };
+
+})();
@@ -7,6 +7,8 @@
 
     document.addEventListener('DOMContentLoaded', function() {
         initFormFeatures();
+        initFragmentos();
+        initReordenar();
     });
 
     function initFormFeatures() {
@@ -268,42 +270,152 @@
     }
 
     // ========================================
-    // Auto-save (opcional)
+    // Fragmentos - Edición en el dashboard sin recargar
     // ========================================
-    window.enableAutoSave = function(formId, intervalMs = 60000) {
-        const form = document.getElementById(formId);
-        if (!form) return;
+    function initFragmentos() {
+        const modalElement = document.getElementById('modalFragmento');
+        if (!modalElement) return;
+
+        const modal = new bootstrap.Modal(modalElement);
+        const modalBody = modalElement.querySelector('.modal-body');
+        const cabeceras = { 'X-Fragmento': '1' };
+
+        function mostrarFormulario(html) {
+            modalBody.innerHTML = html;
+            initFormFeatures();
+            if (window.initBorradores) window.initBorradores(modalBody);
+            if (window.initSubidas) window.initSubidas(modalBody);
+        }
 
-        setInterval(() => {
-            const formData = new FormData(form);
-            const data = {};
-            formData.forEach((value, key) => {
-                data[key] = value;
+        function reemplazarFragmentos(fragmentos) {
+            Object.keys(fragmentos).forEach(nombre => {
+                const actual = document.getElementById(`fragmento-${nombre}`);
+                if (actual) {
+                    actual.outerHTML = fragmentos[nombre];
+                }
             });
-            
-            localStorage.setItem(`form_autosave_${formId}`, JSON.stringify(data));
-            console.log('Formulario guardado automáticamente');
-        }, intervalMs);
-    };
+        }
 
-    window.restoreAutoSave = function(formId) {
-        const saved = localStorage.getItem(`form_autosave_${formId}`);
-        if (!saved) return false;
+        // Abrir formularios de creación/edición en el modal
+        document.addEventListener('click', function(e) {
+            const enlace = e.target.closest('[data-modal-fragmento]');
+            if (!enlace) return;
+
+            e.preventDefault();
+            fetch(enlace.href, { headers: cabeceras })
+                .then(response => {
+                    if (!response.ok) throw new Error(response.status);
+                    return response.text();
+                })
+                .then(html => {
+                    mostrarFormulario(html);
+                    modal.show();
+                })
+                .catch(() => {
+                    // Sin fragmento disponible se usa la página completa
+                    window.location.href = enlace.href;
+                });
+        });
 
-        const form = document.getElementById(formId);
-        if (!form) return false;
+        // Enviar formularios de fragmento y reemplazar las secciones afectadas
+        document.addEventListener('submit', function(e) {
+            const form = e.target.closest('form[data-fragmento-form]');
+            if (!form) return;
+
+            e.preventDefault();
+            if (form.dataset.confirmar && !confirm(form.dataset.confirmar)) return;
+
+            const submitBtn = form.querySelector('[type="submit"]');
+            if (submitBtn) submitBtn.disabled = true;
+
+            fetch(form.action, {
+                method: 'POST',
+                headers: cabeceras,
+                body: new FormData(form)
+            })
+                .then(response => {
+                    const tipo = response.headers.get('Content-Type') || '';
+                    if (tipo.includes('application/json')) {
+                        return response.json().then(datos => {
+                            reemplazarFragmentos(datos.fragmentos);
+                            modal.hide();
+                            showNotification(datos.mensaje, 'success');
+                        });
+                    }
+                    if (response.status === 400) {
+                        // Formulario con errores
+                        return response.text().then(mostrarFormulario);
+                    }
+                    throw new Error(response.status);
+                })
+                .catch(() => {
+                    showNotification('No se pudieron guardar los cambios', 'danger');
+                })
+                .finally(() => {
+                    if (submitBtn) submitBtn.disabled = false;
+                });
+        });
+    }
 
-        const data = JSON.parse(saved);
-        
-        Object.keys(data).forEach(key => {
-            const input = form.querySelector(`[name="${key}"]`);
-            if (input) {
-                input.value = data[key];
-            }
+    // ========================================
+    // Reordenar - Arrastrar y soltar filas de una sección
+    // ========================================
+    function initReordenar() {
+        const contenedor = document.querySelector('[data-reordenar-url]');
+        if (!contenedor) return;
+
+        const csrfInput = document.querySelector('input[name="csrfmiddlewaretoken"]');
+        let arrastrada = null;
+        let ordenInicial = '';
+
+        function ordenActual() {
+            return Array.from(contenedor.querySelectorAll(':scope > [data-id]')).map(fila => fila.dataset.id);
+        }
+
+        contenedor.addEventListener('dragstart', function(e) {
+            arrastrada = e.target.closest('[data-id]');
+            if (!arrastrada) return;
+            ordenInicial = ordenActual().join(',');
+            e.dataTransfer.effectAllowed = 'move';
+            arrastrada.style.opacity = '0.5';
         });
 
-        return true;
-    };
+        contenedor.addEventListener('dragover', function(e) {
+            const destino = e.target.closest('[data-id]');
+            if (!arrastrada || !destino || destino === arrastrada) return;
+
+            e.preventDefault();
+            const caja = destino.getBoundingClientRect();
+            const despues = e.clientY > caja.top + caja.height / 2;
+            destino.parentNode.insertBefore(arrastrada, despues ? destino.nextSibling : destino);
+        });
+
+        contenedor.addEventListener('dragend', function() {
+            if (!arrastrada) return;
+            arrastrada.style.opacity = '';
+            arrastrada = null;
+
+            const ids = ordenActual();
+            if (ids.join(',') === ordenInicial) return;
+
+            fetch(contenedor.dataset.reordenarUrl, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': csrfInput ? csrfInput.value : ''
+                },
+                body: JSON.stringify({ ids: ids })
+            })
+                .then(response => response.json().then(datos => {
+                    if (!response.ok) throw new Error(datos.error);
+                    showNotification('Orden guardado', 'success');
+                }))
+                .catch(error => {
+                    showNotification(error.message || 'No se pudo guardar el orden', 'danger');
+                    setTimeout(() => window.location.reload(), 1500);
+                });
+        });
+    }
 
     // ========================================
     // Form Wizard (multi-step forms)
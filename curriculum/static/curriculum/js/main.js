@@ -21,6 +21,29 @@
         initProgressBars();
         initSkillBars();
         initFormValidation();
+        initCsrfDiferido();
+    }
+
+    // ========================================
+    // Token CSRF de páginas cacheadas
+    // ========================================
+    function initCsrfDiferido() {
+        const pendientes = document.querySelectorAll('input[name="csrfmiddlewaretoken"][value="csrf-pendiente"]');
+        if (!pendientes.length) {
+            return;
+        }
+
+        // Sin token el envío fallaría: los botones se activan al recibirlo
+        const botones = [...pendientes].flatMap(input => [...input.form.querySelectorAll('[type="submit"]')]);
+        botones.forEach(boton => boton.disabled = true);
+
+        fetch(document.body.dataset.csrfUrl, { credentials: 'same-origin' })
+            .then(response => response.json())
+            .then(data => {
+                pendientes.forEach(input => input.value = data.token);
+                botones.forEach(boton => boton.disabled = false);
+            })
+            .catch(error => console.error('Error al obtener el token CSRF:', error));
     }
 
     // ========================================
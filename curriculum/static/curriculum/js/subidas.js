@@ -0,0 +1,158 @@
+// ============================================
+// SUBIDAS - Certificados por fragmentos reanudables
+// ============================================
+
+(function() {
+    'use strict';
+
+    const MAX_REINTENTOS = 4;
+
+    document.addEventListener('DOMContentLoaded', function() {
+        initSubidas(document);
+    });
+
+    function esperar(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+
+    function leerJSON(response) {
+        return response.json().catch(() => ({}));
+    }
+
+    function iniciarCampo(input) {
+        if (input.dataset.subidaIniciada) return;
+        input.dataset.subidaIniciada = '1';
+
+        const form = input.form;
+        const oculto = form && form.querySelector('input[name="certificado_subida"]');
+        if (!oculto) return;
+
+        const url = input.dataset.subidaUrl;
+        const csrfInput = form.querySelector('input[name="csrfmiddlewaretoken"]');
+        const csrf = csrfInput ? csrfInput.value : '';
+
+        const progreso = document.createElement('div');
+        progreso.className = 'progress mt-2 d-none';
+        progreso.style.height = '6px';
+        progreso.innerHTML = '<div class="progress-bar" role="progressbar" style="width: 0%"></div>';
+        const estado = document.createElement('div');
+        estado.className = 'form-text';
+        input.after(progreso, estado);
+
+        function mostrar(recibidos, total) {
+            progreso.classList.remove('d-none');
+            progreso.firstElementChild.style.width = `${Math.round(recibidos * 100 / total)}%`;
+        }
+
+        // Una subida interrumpida se reanuda al volver a elegir el mismo archivo
+        function claveDe(archivo) {
+            return `subida:${archivo.name}:${archivo.size}:${archivo.lastModified}`;
+        }
+
+        function crear(archivo) {
+            return fetch(url, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrf },
+                body: JSON.stringify({ nombre: archivo.name, tamano: archivo.size })
+            }).then(response => leerJSON(response).then(datos => {
+                if (!response.ok) throw new Error(datos.error || 'No se pudo iniciar la subida');
+                return datos;
+            }));
+        }
+
+        function retomar(archivo) {
+            const id = sessionStorage.getItem(claveDe(archivo));
+            if (!id) return crear(archivo);
+            return fetch(`${url}${id}/`, { headers: { 'Accept': 'application/json' } })
+                .then(response => response.ok ? response.json() : crear(archivo));
+        }
+
+        async function subir(archivo) {
+            let subida = await retomar(archivo);
+            sessionStorage.setItem(claveDe(archivo), subida.id);
+            let recibidos = subida.recibidos;
+            let fallos = 0;
+
+            while (recibidos < archivo.size) {
+                mostrar(recibidos, archivo.size);
+                const fin = Math.min(recibidos + subida.tamano_fragmento, archivo.size);
+                let response;
+                try {
+                    response = await fetch(`${url}${subida.id}/`, {
+                        method: 'PUT',
+                        headers: {
+                            'Content-Range': `bytes ${recibidos}-${fin - 1}/${archivo.size}`,
+                            'X-CSRFToken': csrf
+                        },
+                        body: archivo.slice(recibidos, fin)
+                    });
+                } catch (error) {
+                    // Sin conexión: reintentar desde lo que el servidor tenga
+                    if (++fallos > MAX_REINTENTOS) throw new Error('Se perdió la conexión durante la subida');
+                    await esperar(1000 * 2 ** fallos);
+                    const datos = await fetch(`${url}${subida.id}/`).then(leerJSON);
+                    if (datos.recibidos !== undefined) recibidos = datos.recibidos;
+                    continue;
+                }
+
+                const datos = await leerJSON(response);
+                if (response.status === 409) {
+                    recibidos = datos.recibidos;
+                } else if (response.ok) {
+                    recibidos = datos.recibidos;
+                    fallos = 0;
+                } else {
+                    sessionStorage.removeItem(claveDe(archivo));
+                    throw new Error(datos.error || 'No se pudo subir el archivo');
+                }
+            }
+
+            mostrar(archivo.size, archivo.size);
+            sessionStorage.removeItem(claveDe(archivo));
+            return subida.id;
+        }
+
+        input.addEventListener('change', function() {
+            const archivo = input.files[0];
+            // Otro archivo reemplaza al ya subido: liberar el anterior en el servidor
+            if (oculto.value) {
+                fetch(`${url}${oculto.value}/`, { method: 'DELETE', headers: { 'X-CSRFToken': csrf } })
+                    .catch(() => {});
+            }
+            oculto.value = '';
+            if (!archivo) return;
+
+            form.dataset.subiendo = '1';
+            estado.textContent = `Subiendo ${archivo.name}...`;
+            subir(archivo)
+                .then(id => {
+                    oculto.value = id;
+                    // El archivo ya está en el servidor: no se vuelve a enviar con el formulario
+                    input.value = '';
+                    estado.textContent = `${archivo.name} listo para guardar.`;
+                })
+                .catch(error => {
+                    input.value = '';
+                    progreso.classList.add('d-none');
+                    estado.textContent = '';
+                    if (window.showNotification) showNotification(error.message, 'danger');
+                })
+                .finally(() => {
+                    delete form.dataset.subiendo;
+                });
+        });
+
+        // No enviar el formulario a medias (antes que el envío por fragmentos de forms.js)
+        form.addEventListener('submit', function(e) {
+            if (!form.dataset.subiendo) return;
+            e.preventDefault();
+            e.stopImmediatePropagation();
+            if (window.showNotification) showNotification('Espera a que termine de subir el certificado', 'warning');
+        }, true);
+    }
+
+    window.initSubidas = function(raiz) {
+        (raiz || document).querySelectorAll('input[type="file"][data-subida-url]').forEach(iniciarCampo);
+    };
+
+})();
@@ -2,16 +2,47 @@
 Backends de almacenamiento para archivos media
 """
 
-from storages.backends.azure_storage import AzureStorage
+import time
+from urllib.parse import urlencode
+
 from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.crypto import salted_hmac
+
+try:
+    from storages.backends.azure_storage import AzureStorage
+except ImportError:
+    # Sin el SDK de Azure sigue disponible LocalFirmadoStorage
+    AzureStorage = None
+
 
+if AzureStorage is not None:
+    class AzureMediaStorage(AzureStorage):
+        """
+        Storage personalizado para Azure Blob Storage
+        """
+        # getattr: el módulo se importa aunque Azure no esté configurado
+        account_name = getattr(settings, 'AZURE_ACCOUNT_NAME', None)
+        account_key = getattr(settings, 'AZURE_ACCOUNT_KEY', None)
+        azure_container = getattr(settings, 'AZURE_CONTAINER', None)
+        expiration_secs = None
+        overwrite_files = True
 
-class AzureMediaStorage(AzureStorage):
+
+class LocalFirmadoStorage(FileSystemStorage):
     """
-    Storage personalizado para Azure Blob Storage
+    Storage local con URLs firmadas que expiran, como Azure con
+    expiration_secs: permite probar curriculum.cache_media sin Azure ni
+    Cloudinary (CV_MEDIA_STORAGE=curriculum.storage_backends.LocalFirmadoStorage).
+    Solo cambia la URL: los archivos se sirven igual (static() en
+    config/urls.py) y la firma no se comprueba.
     """
-    account_name = settings.AZURE_ACCOUNT_NAME
-    account_key = settings.AZURE_ACCOUNT_KEY
-    azure_container = settings.AZURE_CONTAINER
-    expiration_secs = None
-    overwrite_files = True
+    expiration_secs = 3600
+    salt = 'curriculum.storage_backends.LocalFirmadoStorage'
+
+    def _firma(self, name, expira):
+        return salted_hmac(self.salt, f'{name}:{expira}').hexdigest()
+
+    def url(self, name):
+        expira = int(time.time()) + self.expiration_secs
+        return f"{super().url(name)}?{urlencode({'expira': expira, 'firma': self._firma(name, expira)})}"
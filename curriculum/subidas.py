@@ -0,0 +1,270 @@
+"""
+Subidas reanudables de certificados por fragmentos
+
+Un certificado en PDF puede pesar hasta 10 MB, el doble de
+FILE_UPLOAD_MAX_MEMORY_SIZE y DATA_UPLOAD_MAX_MEMORY_SIZE. subidas.js lo
+envía en fragmentos de TAMANO_FRAGMENTO:
+
+1. POST {nombre, tamano}: se validan la extensión y el tamaño declarado y
+   se crea una SubidaFragmentada.
+2. PUT con `Content-Range: bytes <inicio>-<fin>/<total>` por fragmento. El
+   cuerpo se copia al archivo temporal en bloques de BLOQUE bytes, sin
+   cargarlo en memoria. El primer fragmento valida la firma del formato
+   (%PDF-, JPEG, PNG). Un fragmento que no empieza donde terminó el
+   anterior recibe 409 con lo recibido y el cliente reanuda desde ahí,
+   también tras recargar la página.
+3. Con el último fragmento se valida la estructura del archivo completo
+   (pypdf o Pillow) leyéndolo desde el disco.
+
+El formulario recibe el id de la subida en lugar del archivo (ver
+forms.SubidaFragmentadaMixin). ArchivoEnsamblado expone la ruta temporal,
+así FileSystemStorage mueve el archivo a su destino sin volver a leerlo;
+los demás storages lo copian por bloques.
+"""
+
+import os
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation, ValidationError
+from django.core.files import File
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+from PIL import Image
+from pypdf import PdfReader
+from pypdf.errors import PyPdfError
+
+from .models import SubidaFragmentada
+
+
+TAMANO_FRAGMENTO = 1024 * 1024
+BLOQUE = 64 * 1024
+# Subidas sin usar por usuario (en curso o completas): como máximo ~50 MB en disco
+MAX_PENDIENTES = 5
+RETENCION_HORAS = 24
+
+# Mismos límites que utils.validar_tamano_pdf / validar_tamano_imagen
+LIMITES_MB = {
+    'pdf': 10,
+    'jpg': 5,
+    'jpeg': 5,
+    'png': 5,
+}
+
+FIRMAS = {
+    'pdf': b'%PDF-',
+    'jpg': b'\xff\xd8\xff',
+    'jpeg': b'\xff\xd8\xff',
+    'png': b'\x89PNG\r\n\x1a\n',
+}
+
+# %%EOF debe aparecer en los últimos bytes de un PDF
+COLA_PDF = 1024
+
+
+class FragmentoFueraDeOrden(Exception):
+    """
+    El fragmento no empieza donde terminó el último recibido
+    """
+    def __init__(self, recibidos):
+        super().__init__(recibidos)
+        self.recibidos = recibidos
+
+
+class ArchivoEnsamblado(File):
+    """
+    Archivo ensamblado en disco; con temporary_file_path() FileSystemStorage
+    lo mueve en lugar de copiarlo (como a un TemporaryUploadedFile)
+    """
+    def __init__(self, camino, nombre):
+        super().__init__(open(camino, 'rb'), name=nombre)
+        self.camino = camino
+
+    def temporary_file_path(self):
+        return self.camino
+
+
+def _extension(nombre):
+    return os.path.splitext(nombre)[1].lower().lstrip('.')
+
+
+def directorio():
+    return os.path.join(settings.FILE_UPLOAD_TEMP_DIR or tempfile.gettempdir(), 'cv_subidas')
+
+
+def ruta(subida):
+    return os.path.join(directorio(), f'{subida.pk}.parte')
+
+
+# ======================================
+# RECEPCIÓN
+# ======================================
+
+def iniciar(usuario, nombre, tamano):
+    """
+    Crea la subida tras validar extensión y tamaño declarado
+    """
+    try:
+        nombre = get_valid_filename(os.path.basename(str(nombre)))[-255:]
+    except SuspiciousFileOperation:
+        raise ValidationError('Nombre de archivo no válido.')
+
+    extension = _extension(nombre)
+    if extension not in LIMITES_MB:
+        raise ValidationError('Solo se permiten archivos PDF, JPG o PNG.')
+    limite_mb = LIMITES_MB[extension]
+    if not 0 < tamano <= limite_mb * 1024 * 1024:
+        raise ValidationError(f'El archivo no puede superar {limite_mb}MB')
+
+    # Las completas también ocupan disco hasta que un formulario las usa
+    # (finalizar) o purgar() las elimina: cuentan todas las del usuario
+    if SubidaFragmentada.objects.filter(usuario=usuario).count() >= MAX_PENDIENTES:
+        raise ValidationError('Tienes demasiados archivos subidos sin guardar. Inténtalo más tarde.')
+
+    return SubidaFragmentada.objects.create(usuario=usuario, nombre=nombre, tamano=tamano)
+
+
+def agregar_fragmento(subida, inicio, flujo, longitud):
+    """
+    Copia `longitud` bytes de `flujo` (Ej: el request) al archivo temporal
+    a partir de `inicio`.
+
+    Raises:
+        FragmentoFueraDeOrden: `inicio` no coincide con lo ya recibido
+        ValidationError: fragmento o archivo no válido (la subida se descarta
+            si el contenido no es del formato declarado)
+    """
+    if subida.completa or inicio != subida.recibidos:
+        raise FragmentoFueraDeOrden(subida.recibidos)
+    if not 0 < longitud <= TAMANO_FRAGMENTO or inicio + longitud > subida.tamano:
+        raise ValidationError('Fragmento no válido.')
+
+    os.makedirs(directorio(), exist_ok=True)
+    camino = ruta(subida)
+    firma = FIRMAS[_extension(subida.nombre)]
+    cabecera = b''
+    escritos = 0
+
+    with open(camino, 'r+b' if os.path.exists(camino) else 'wb') as destino:
+        # Descarta lo que haya dejado un fragmento interrumpido
+        destino.seek(inicio)
+        destino.truncate()
+        while escritos < longitud:
+            bloque = flujo.read(min(BLOQUE, longitud - escritos))
+            if not bloque:
+                break
+            if inicio == 0 and len(cabecera) < len(firma):
+                cabecera += bloque[:len(firma) - len(cabecera)]
+            destino.write(bloque)
+            escritos += len(bloque)
+
+    if escritos != longitud:
+        raise ValidationError('El fragmento llegó incompleto.')
+
+    recibidos = inicio + escritos
+    completa = recibidos == subida.tamano
+    try:
+        if inicio == 0 and cabecera != firma:
+            raise ValidationError('El contenido del archivo no corresponde a su extensión.')
+        if completa:
+            _validar_archivo(camino, _extension(subida.nombre))
+    except ValidationError:
+        descartar(subida)
+        raise
+
+    # Condicionado a lo recibido: dos envíos del mismo fragmento no lo suman dos veces
+    if not SubidaFragmentada.objects.filter(pk=subida.pk, recibidos=inicio, completa=False).update(
+        recibidos=recibidos, completa=completa, fecha_actualizacion=timezone.now()
+    ):
+        subida.refresh_from_db()
+        raise FragmentoFueraDeOrden(subida.recibidos)
+
+    subida.recibidos = recibidos
+    subida.completa = completa
+    return subida
+
+
+def _validar_archivo(camino, extension):
+    """
+    Estructura del archivo completo, leído desde el disco
+    """
+    if extension != 'pdf':
+        try:
+            with Image.open(camino) as imagen:
+                imagen.verify()
+        except (OSError, SyntaxError, Image.DecompressionBombError):
+            raise ValidationError('La imagen está dañada o no es válida.')
+        return
+
+    with open(camino, 'rb') as archivo:
+        archivo.seek(max(0, os.path.getsize(camino) - COLA_PDF))
+        if b'%%EOF' not in archivo.read():
+            raise ValidationError('El PDF está incompleto o dañado.')
+
+    try:
+        lector = PdfReader(camino)
+        if lector.is_encrypted and not lector.decrypt(''):
+            raise ValidationError('El PDF está protegido con contraseña.')
+        if not len(lector.pages):
+            raise ValidationError('El PDF no tiene páginas.')
+    except (PyPdfError, ValueError, KeyError, OSError):
+        raise ValidationError('El PDF está dañado o no es válido.')
+
+
+# ======================================
+# USO EN FORMULARIOS
+# ======================================
+
+def obtener_completa(usuario, subida_id):
+    """
+    Subida terminada del usuario, o None
+    """
+    return SubidaFragmentada.objects.filter(pk=subida_id, usuario=usuario, completa=True).first()
+
+
+def archivo(subida):
+    """
+    Archivo para asignar al FileField (Ej: certificacion.certificado)
+    """
+    return ArchivoEnsamblado(ruta(subida), subida.nombre)
+
+
+def descartar(subida):
+    """
+    Elimina la subida y su archivo temporal (si el storage no lo movió ya)
+    """
+    try:
+        os.remove(ruta(subida))
+    except FileNotFoundError:
+        pass
+    subida.delete()
+
+
+def finalizar(subida, ensamblado):
+    """
+    Tras guardar el modelo con el archivo ensamblado
+    """
+    ensamblado.close()
+    descartar(subida)
+
+
+def purgar(retencion_horas=RETENCION_HORAS):
+    """
+    Elimina las subidas abandonadas y los archivos temporales huérfanos.
+    Devuelve cuántas subidas se eliminaron.
+    """
+    limite = timezone.now() - timedelta(hours=retencion_horas)
+    antiguas = list(SubidaFragmentada.objects.filter(fecha_actualizacion__lt=limite))
+    for subida in antiguas:
+        descartar(subida)
+
+    # Archivos de subidas eliminadas en cascada con su usuario
+    if os.path.isdir(directorio()):
+        vigentes = {f'{pk}.parte' for pk in SubidaFragmentada.objects.values_list('pk', flat=True)}
+        for nombre in os.listdir(directorio()):
+            camino = os.path.join(directorio(), nombre)
+            if nombre not in vigentes and os.path.getmtime(camino) < limite.timestamp():
+                os.remove(camino)
+
+    return len(antiguas)
@@ -0,0 +1,92 @@
+"""
+Etiquetas para mostrar imágenes con sus variantes (ver curriculum/imagenes.py)
+
+Uso:
+    {% load imagenes %}
+    {% imagen_responsiva perfil.foto perfil.foto_variantes tamanos="180px" alt=perfil.nombre_completo class="rounded-circle" width=180 height=180 %}
+    <a href="{{ cert.certificado|url_media }}">
+
+Por defecto las imágenes se cargan con loading="lazy" y decoding="async";
+la imagen principal visible al abrir la página debe pasar loading="eager"
+(y fetchpriority="high") para no retrasar el LCP.
+"""
+
+from django import template
+from django.forms.utils import flatatt
+from django.utils.html import format_html, format_html_join
+
+from curriculum import cache_media
+from curriculum.imagenes import version_variantes
+
+
+register = template.Library()
+
+TIPOS = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+}
+
+
+def _srcset(direcciones, versiones):
+    return ', '.join(f"{direcciones[version['nombre']]} {version['ancho']}w" for version in versiones)
+
+
+@register.filter
+def url_media(archivo):
+    """
+    archivo.url a través de curriculum.cache_media
+    """
+    return cache_media.url(archivo.storage, archivo.name) if archivo else ''
+
+
+@register.simple_tag
+def imagen_responsiva(archivo, variantes, tamanos='100vw', **atributos):
+    """
+    <picture> con un srcset por formato y width/height de las dimensiones
+    guardadas; sin variantes (Ej: aún en la cola de curriculum.media), un
+    <img> con el archivo original
+    """
+    if not archivo:
+        return ''
+
+    atributos.setdefault('loading', 'lazy')
+    atributos.setdefault('decoding', 'async')
+
+    versiones = (variantes or {}).get('versiones', {})
+    if not versiones.get('jpeg'):
+        return format_html(
+            '<img src="{}"{}>', cache_media.url(archivo.storage, archivo.name), flatatt(atributos)
+        )
+
+    # Las dimensiones guardadas dan la proporción aunque el CSS fije otro tamaño
+    if 'width' in atributos and 'height' not in atributos:
+        atributos['height'] = round(int(atributos['width']) * variantes['alto'] / variantes['ancho'])
+    atributos.setdefault('width', variantes['ancho'])
+    atributos.setdefault('height', variantes['alto'])
+
+    # Marcador borroso de fondo mientras se descarga (no en las eager: ya vienen primero)
+    if variantes.get('lqip') and atributos['loading'] == 'lazy':
+        fondo = f"background: center / cover no-repeat url({variantes['lqip']});"
+        atributos['style'] = f"{fondo} {atributos['style']}" if atributos.get('style') else fondo
+
+    # Todas las URLs de la imagen en una consulta a la caché
+    direcciones = cache_media.urls(
+        archivo.storage,
+        [version['nombre'] for lista in versiones.values() for version in lista],
+        version_variantes(variantes)
+    )
+    fuentes = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (TIPOS[formato], _srcset(direcciones, versiones[formato]), tamanos)
+            for formato in TIPOS if versiones.get(formato)
+        )
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}"{}></picture>',
+        fuentes,
+        direcciones[versiones['jpeg'][-1]['nombre']],
+        _srcset(direcciones, versiones['jpeg']),
+        tamanos,
+        flatatt(atributos)
+    )
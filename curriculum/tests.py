@@ -0,0 +1,496 @@
+"""
+Pruebas del sistema de CV
+
+Uso:
+    python manage.py test curriculum
+"""
+
+import json
+import os
+import re
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from curriculum import analitica, borradores, cache_media, subidas
+from curriculum.cache_paginas import cache_anonima
+from curriculum.models import (
+    BorradorFormulario, EstadisticasPerfil, EventoCV, Habilidad, PerfilProfesional, SubidaFragmentada
+)
+from curriculum.paginacion import CursorInvalido, PaginadorKeyset, codificar_cursor, paginar_lista
+from curriculum.storage_backends import LocalFirmadoStorage
+
+
+CLAVE = 'clave-segura-123'
+
+
+def crear_perfil(username='ana', **campos):
+    """
+    Usuario con un perfil válido
+    """
+    usuario = User.objects.create_user(username, f'{username}@example.com', CLAVE)
+    datos = {
+        'nombres': 'Ana',
+        'apellidos': 'Pérez',
+        'email': f'{username}@example.com',
+        'ciudad': 'Quito',
+        'provincia': 'Pichincha',
+        'titulo_profesional': 'Desarrolladora Web',
+        'resumen_profesional': 'Desarrolladora web con experiencia en Django.',
+    }
+    datos.update(campos)
+    return PerfilProfesional.objects.create(usuario=usuario, **datos)
+
+
+class PerfilActualTests(TestCase):
+    """
+    request.perfil (PerfilActualMiddleware + PerfilBackend): el perfil llega
+    en la misma consulta que el usuario de la sesión
+    """
+    def setUp(self):
+        crear_perfil()
+        self.client.login(username='ana', password=CLAVE)
+
+    def consultas_perfil(self, url):
+        """
+        Consultas de la petición que leen la tabla de perfiles
+        """
+        tabla = connection.ops.quote_name(PerfilProfesional._meta.db_table)
+        with CaptureQueriesContext(connection) as contexto:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [
+            consulta['sql'] for consulta in contexto.captured_queries
+            if f'FROM {tabla}' in consulta['sql'] or f'JOIN {tabla}' in consulta['sql']
+        ]
+
+    def test_formulario_de_seccion(self):
+        # Sesión y usuario con su perfil: nada más
+        with self.assertNumQueries(2):
+            self.client.get(reverse('curriculum:crear_experiencia'))
+        self.assertEqual(len(self.consultas_perfil(reverse('curriculum:crear_experiencia'))), 1)
+
+    def test_dashboard(self):
+        consultas = self.consultas_perfil(reverse('curriculum:dashboard'))
+        self.assertEqual(len(consultas), 1)
+        self.assertIn('auth_user', consultas[0])
+
+
+class EdicionMasivaTests(TestCase):
+    """
+    edicion_masiva.guardar(): escrituras por lotes con los mismos efectos
+    que los receptores de las secciones (signals.seccion_modificada)
+    """
+    def setUp(self):
+        self.perfil = crear_perfil()
+        self.client.login(username='ana', password=CLAVE)
+        self.url = reverse('curriculum:edicion_masiva', kwargs={'seccion': 'habilidades'})
+
+    def datos(self, existentes=(), nuevas=(), eliminar=()):
+        """
+        POST del formset de habilidades
+        """
+        filas = [(habilidad.pk, habilidad.nombre) for habilidad in existentes] + [('', nombre) for nombre in nuevas]
+        datos = {
+            'form-TOTAL_FORMS': len(filas),
+            'form-INITIAL_FORMS': len(existentes),
+            'form-MIN_NUM_FORMS': 0,
+            'form-MAX_NUM_FORMS': 1000,
+        }
+        for indice, (pk, nombre) in enumerate(filas):
+            datos.update({
+                f'form-{indice}-id': pk,
+                f'form-{indice}-nombre': nombre,
+                f'form-{indice}-tipo': 'tecnica',
+                f'form-{indice}-nivel': 60,
+                f'form-{indice}-anos_experiencia': 1,
+            })
+            if pk in eliminar:
+                datos[f'form-{indice}-DELETE'] = 'on'
+        return datos
+
+    def test_consultas_con_veinte_filas_nuevas(self):
+        datos = self.datos(nuevas=[f'Habilidad {numero}' for numero in range(20)])
+        # Sesión, usuario, SAVEPOINT, alias, canónicas (INSERT y SELECT), un
+        # INSERT de filas, estadísticas, completitud (SELECT y UPDATE),
+        # versión y RELEASE; el índice y las facetas van tras el commit
+        with self.assertNumQueries(12):
+            response = self.client.post(self.url, datos)
+        self.assertRedirects(response, reverse('curriculum:dashboard'), fetch_redirect_response=False)
+        self.assertEqual(self.perfil.habilidades.count(), 20)
+        self.assertEqual(EstadisticasPerfil.objects.get(perfil=self.perfil).habilidades, 20)
+
+    def test_bajas_con_los_efectos_de_las_senales(self):
+        habilidades = [
+            Habilidad.objects.create(perfil=self.perfil, nombre=nombre, tipo='tecnica', nivel=50)
+            for nombre in ('Python', 'Django', 'SQL')
+        ]
+        self.perfil.refresh_from_db()
+        version = self.perfil.version
+
+        datos = self.datos(existentes=habilidades, eliminar={habilidades[0].pk, habilidades[1].pk})
+        response = self.client.post(self.url, datos)
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(list(self.perfil.habilidades.values_list('nombre', flat=True)), ['SQL'])
+        # Una sola vez por edición, no por fila eliminada
+        self.assertEqual(EstadisticasPerfil.objects.get(perfil=self.perfil).habilidades, 1)
+        self.perfil.refresh_from_db()
+        self.assertEqual(self.perfil.version, version + 1)
+
+
+class ImportCVsTests(TestCase):
+
+    def test_filas_json_numeradas_por_linea(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as f:
+            f.write('[1]\n\n   \n[2]\n')
+        self.addCleanup(os.remove, f.name)
+        errores = StringIO()
+        call_command('import_cvs', f.name, procesos=1, lote=1, stdout=StringIO(), stderr=errores)
+        self.assertEqual(re.findall(r'^fila (\d+):', errores.getvalue(), re.M), ['1', '4'])
+
+
+class DescarteBorradoresTests(TestCase):
+
+    def setUp(self):
+        self.usuario = User.objects.create_user('ana', password=CLAVE)
+
+    def test_formulario_sin_borrador_no_escribe(self):
+        with CaptureQueriesContext(connection) as consultas:
+            borradores.descartar(self.usuario.pk, '/perfil/editar/')
+        self.assertEqual(len(consultas), 1)
+        self.assertTrue(consultas[0]['sql'].startswith('UPDATE'))
+        self.assertFalse(BorradorFormulario.objects.exists())
+
+    def test_borrador_guardado_se_vacia(self):
+        BorradorFormulario.objects.create(
+            usuario=self.usuario, clave='/perfil/editar/', datos={'titulo': 'a'}, marcas={'titulo': 1}
+        )
+        borradores.descartar(self.usuario.pk, '/perfil/editar/')
+        borrador = BorradorFormulario.objects.get()
+        self.assertEqual(borrador.datos, {})
+        self.assertIsNotNone(borrador.fecha_descarte)
+
+    def test_parches_en_el_buffer_dejan_el_descarte(self):
+        borradores.guardar_parche(self.usuario.pk, '/perfil/editar/', {'titulo': 'a'})
+        borradores.descartar(self.usuario.pk, '/perfil/editar/')
+        self.assertIsNotNone(BorradorFormulario.objects.get().fecha_descarte)
+        self.assertEqual(borradores.obtener(self.usuario.pk, '/perfil/editar/'), {})
+
+
+class AgregacionEventosTests(TestCase):
+
+    def test_evento_confirmado_tarde_se_agrega_antes_de_podarse(self):
+        perfil = crear_perfil()
+        ahora = timezone.now()
+        EventoCV.objects.create(id=100, perfil=perfil, tipo='visita', fecha=ahora)
+        self.assertEqual(analitica.agregar_eventos(), (1, 0))
+
+        # Id menor que el ya agregado y fecha fuera de la retención
+        EventoCV.objects.create(id=50, perfil=perfil, tipo='visita', fecha=ahora - timedelta(days=40))
+        self.assertEqual(analitica.agregar_eventos(), (1, 1))
+        self.assertEqual(analitica.total_visitas(perfil), 2)
+        self.assertEqual(analitica.agregar_eventos(), (0, 0))
+
+
+class CachePaginasTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.renderizados = 0
+
+        @cache_anonima
+        def vista(request):
+            self.renderizados += 1
+            return HttpResponse('pagina')
+        self.vista = vista
+
+    def get(self, url):
+        request = RequestFactory().get(url)
+        request.user = AnonymousUser()
+        return self.vista(request)
+
+    def test_parametros_permitidos_forman_la_clave(self):
+        self.get('/login/?next=/dashboard/')
+        self.get('/login/?next=/dashboard/')
+        self.assertEqual(self.renderizados, 1)
+        self.get('/login/?next=/mi-cv/')
+        self.assertEqual(self.renderizados, 2)
+
+    def test_otros_parametros_no_usan_la_cache(self):
+        self.get('/login/')
+        self.get('/login/?x=1')
+        self.get('/login/?x=1')
+        self.assertEqual(self.renderizados, 3)
+        self.get('/login/')
+        self.assertEqual(self.renderizados, 3)
+
+
+class StorageContado(FileSystemStorage):
+    """
+    Storage que registra cada URL que resuelve
+    """
+    def __init__(self, expiration_secs=None, **kwargs):
+        super().__init__(**kwargs)
+        self.expiration_secs = expiration_secs
+        self.resueltas = []
+
+    def url(self, name):
+        self.resueltas.append(name)
+        return f'/media/{name}?n={len(self.resueltas)}'
+
+
+@override_settings(CV_MEDIA_URL_TTL=100, CV_MEDIA_URL_MAX=3)
+class CacheMediaTests(SimpleTestCase):
+    """
+    curriculum.cache_media: vencimiento, LRU, versión y resolución por lotes
+    """
+    def setUp(self):
+        cache_media.limpiar()
+        self.addCleanup(cache_media.limpiar)
+        self.ahora = 1000.0
+        reloj = mock.patch('curriculum.cache_media.time.monotonic', side_effect=lambda: self.ahora)
+        reloj.start()
+        self.addCleanup(reloj.stop)
+
+    def test_vence_pasado_el_ttl(self):
+        storage = StorageContado()
+        primera = cache_media.url(storage, 'a.jpg')
+        self.ahora += 99
+        self.assertEqual(cache_media.url(storage, 'a.jpg'), primera)
+        self.ahora += 2
+        self.assertNotEqual(cache_media.url(storage, 'a.jpg'), primera)
+        self.assertEqual(storage.resueltas, ['a.jpg', 'a.jpg'])
+
+    def test_urls_firmadas_vencen_a_la_mitad_de_su_duracion(self):
+        storage = StorageContado(expiration_secs=60)
+        cache_media.url(storage, 'a.jpg')
+        self.ahora += 29
+        cache_media.url(storage, 'a.jpg')
+        self.assertEqual(len(storage.resueltas), 1)
+        self.ahora += 2
+        cache_media.url(storage, 'a.jpg')
+        self.assertEqual(len(storage.resueltas), 2)
+
+    def test_descarta_la_menos_usada_al_llegar_al_maximo(self):
+        storage = StorageContado()
+        cache_media.urls(storage, ['a.jpg', 'b.jpg', 'c.jpg'])
+        cache_media.url(storage, 'a.jpg')  # b pasa a ser la menos usada
+        cache_media.url(storage, 'd.jpg')
+        storage.resueltas.clear()
+
+        cache_media.urls(storage, ['a.jpg', 'c.jpg', 'd.jpg'])
+        self.assertEqual(storage.resueltas, [])
+        cache_media.url(storage, 'b.jpg')
+        self.assertEqual(storage.resueltas, ['b.jpg'])
+
+    def test_otra_version_no_usa_la_entrada_guardada(self):
+        storage = StorageContado()
+        cache_media.url(storage, 'a.jpg', '1')
+        cache_media.url(storage, 'a.jpg', '1')
+        cache_media.url(storage, 'a.jpg', '2')
+        cache_media.urls(storage, {'a.jpg': '2'})
+        self.assertEqual(storage.resueltas, ['a.jpg', 'a.jpg'])
+
+    def test_urls_resuelve_solo_las_que_faltan(self):
+        storage = StorageContado()
+        cache_media.url(storage, 'a.jpg')
+        resultado = cache_media.urls(storage, ['a.jpg', 'b.jpg', 'b.jpg'])
+        self.assertEqual(storage.resueltas, ['a.jpg', 'b.jpg'])
+        self.assertEqual(set(resultado), {'a.jpg', 'b.jpg'})
+
+    def test_local_firmado_agrega_firma_y_vencimiento(self):
+        storage = LocalFirmadoStorage(location='/tmp', base_url='/media/')
+        url = urlparse(storage.url('a.jpg'))
+        self.assertEqual(url.path, '/media/a.jpg')
+        self.assertEqual(set(parse_qs(url.query)), {'expira', 'firma'})
+
+
+class CamposModificadosTests(TestCase):
+    """
+    CamposModificadosMixin: un save() sin cambios no escribe ni invalida nada
+    y uno con cambios escribe solo esas columnas
+    """
+    def setUp(self):
+        perfil = crear_perfil()
+        Habilidad.objects.create(perfil=perfil, nombre='Python', tipo='tecnica', nivel=50)
+        # Instancias leídas de la BD, como en un formulario de edición
+        self.perfil = PerfilProfesional.objects.get(pk=perfil.pk)
+        self.habilidad = Habilidad.objects.get(perfil=perfil)
+
+    def columnas_actualizadas(self, instancia):
+        """
+        Columnas de cada UPDATE a la tabla de la instancia al guardarla
+        """
+        tabla = connection.ops.quote_name(instancia._meta.db_table)
+        with CaptureQueriesContext(connection) as contexto:
+            instancia.save()
+        return [
+            set(re.findall(r'"(\w+)" = ', consulta['sql'].split(' SET ', 1)[1].split(' WHERE ', 1)[0]))
+            for consulta in contexto.captured_queries
+            if consulta['sql'].startswith(f'UPDATE {tabla} ')
+        ]
+
+    def test_perfil_sin_cambios(self):
+        version, fecha = self.perfil.version, self.perfil.fecha_actualizacion
+        with self.assertNumQueries(0):
+            self.perfil.save()
+        self.perfil.refresh_from_db()
+        self.assertEqual((self.perfil.version, self.perfil.fecha_actualizacion), (version, fecha))
+
+    def test_habilidad_sin_cambios(self):
+        version, fecha = self.perfil.version, self.perfil.fecha_actualizacion
+        with self.assertNumQueries(0):
+            self.habilidad.save()
+        self.perfil.refresh_from_db()
+        self.assertEqual((self.perfil.version, self.perfil.fecha_actualizacion), (version, fecha))
+
+    def test_perfil_con_un_campo_modificado(self):
+        self.perfil.titulo_profesional = 'Arquitecta de Software'
+        actualizaciones = self.columnas_actualizadas(self.perfil)
+        # El save() y, después, el incremento de versión de la señal
+        self.assertEqual(actualizaciones, [
+            {'titulo_profesional', 'completitud', 'completitud_detalle', 'fecha_actualizacion'},
+            {'version'},
+        ])
+
+    def test_habilidad_con_un_campo_modificado(self):
+        self.habilidad.nivel = 80
+        self.assertEqual(self.columnas_actualizadas(self.habilidad), [{'nivel', 'canonica_id'}])
+
+
+class PaginacionKeysetTests(TestCase):
+    """
+    PaginadorKeyset: desempate por id, última página y cursores no válidos
+    """
+    def setUp(self):
+        self.perfiles = [
+            crear_perfil(f'usuario{numero}', nombres=f'Persona {numero}', cv_publico=True)
+            for numero in range(5)
+        ]
+        # Todos con la misma fecha: el orden lo decide solo el id
+        PerfilProfesional.objects.update(fecha_actualizacion=timezone.now())
+        self.paginador = PaginadorKeyset(PerfilProfesional.objects.filter(cv_publico=True), 2)
+
+    def test_limite_de_pagina_entre_claves_iguales(self):
+        recorridos, cursor, paginas = [], None, []
+        while True:
+            pagina = self.paginador.pagina(cursor)
+            paginas.append(pagina)
+            recorridos += [perfil.pk for perfil in pagina]
+            if not pagina.tiene_siguiente:
+                break
+            cursor = pagina.cursor_siguiente
+
+        self.assertEqual(recorridos, sorted((perfil.pk for perfil in self.perfiles), reverse=True))
+        anterior = self.paginador.pagina(paginas[2].cursor_anterior)
+        self.assertEqual([perfil.pk for perfil in anterior], [perfil.pk for perfil in paginas[1]])
+
+    def test_ultima_pagina(self):
+        primera = self.paginador.pagina()
+        ultima = self.paginador.pagina(self.paginador.pagina(primera.cursor_siguiente).cursor_siguiente)
+        self.assertEqual([perfil.pk for perfil in ultima], [self.perfiles[0].pk])
+        self.assertFalse(ultima.tiene_siguiente)
+        self.assertTrue(ultima.tiene_anterior)
+        self.assertFalse(primera.tiene_anterior)
+
+    def test_cursores_no_validos(self):
+        cursores = [
+            'no-es-un-cursor',
+            self.paginador.pagina().cursor_siguiente[:-2] + 'xx',
+            # Firmados pero con valores que no corresponden al orden
+            codificar_cursor(['no es una fecha', 1]),
+            codificar_cursor([1]),
+            codificar_cursor('texto'),
+        ]
+        for cursor in cursores:
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(CursorInvalido):
+                    self.paginador.pagina(cursor)
+                self.assertEqual(self.client.get(reverse('curriculum:directorio'), {'cursor': cursor}).status_code, 404)
+                self.assertEqual(self.client.get(reverse('curriculum:api_perfiles'), {'cursor': cursor}).status_code, 404)
+
+    def test_cursor_no_valido_en_la_busqueda(self):
+        with self.assertRaises(CursorInvalido):
+            paginar_lista([1, 2, 3], 2, codificar_cursor(['1']))
+
+
+class SubidasFragmentadasTests(TestCase):
+    """
+    Subidas por fragmentos (curriculum.subidas) a través de sus vistas
+    """
+    def setUp(self):
+        crear_perfil()
+        self.client.login(username='ana', password=CLAVE)
+        temporal = tempfile.TemporaryDirectory()
+        self.addCleanup(temporal.cleanup)
+        ajustes = override_settings(FILE_UPLOAD_TEMP_DIR=temporal.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+    def iniciar(self, nombre='certificado.pdf', tamano=100):
+        return self.client.post(
+            reverse('curriculum:iniciar_subida'),
+            json.dumps({'nombre': nombre, 'tamano': tamano}),
+            content_type='application/json'
+        )
+
+    def enviar(self, subida, inicio, contenido):
+        return self.client.put(
+            reverse('curriculum:fragmento_subida', kwargs={'pk': subida['id']}),
+            contenido,
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f"bytes {inicio}-{inicio + len(contenido) - 1}/{subida['tamano']}"
+        )
+
+    def test_fragmento_fuera_de_orden(self):
+        subida = self.iniciar(tamano=20).json()
+        response = self.enviar(subida, 10, b'x' * 10)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['recibidos'], 0)
+
+        self.assertEqual(self.enviar(subida, 0, b'%PDF-1.4\n0').status_code, 200)
+        # Reenvío del mismo fragmento: el cliente reanuda desde lo recibido
+        response = self.enviar(subida, 0, b'%PDF-1.4\n0')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['recibidos'], 10)
+
+    def test_contenido_distinto_a_la_extension(self):
+        subida = self.iniciar(tamano=20).json()
+        response = self.enviar(subida, 0, b'GIF89a' + b'\x00' * 4)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(SubidaFragmentada.objects.filter(pk=subida['id']).exists())
+        self.assertFalse(os.listdir(subidas.directorio()))
+
+    def test_pdf_truncado_se_rechaza_al_completar(self):
+        contenido = b'%PDF-1.4\n' + b'1 0 obj << >> endobj\n' * 3
+        subida = self.iniciar(tamano=len(contenido)).json()
+        response = self.enviar(subida, 0, contenido)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('incompleto', response.json()['error'])
+        self.assertFalse(SubidaFragmentada.objects.filter(pk=subida['id']).exists())
+
+    def test_limite_de_subidas_sin_usar(self):
+        for _ in range(subidas.MAX_PENDIENTES):
+            self.assertEqual(self.iniciar().status_code, 201)
+        response = self.iniciar()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(SubidaFragmentada.objects.count(), subidas.MAX_PENDIENTES)
+
+        # Cancelar una libera el lugar
+        subida = SubidaFragmentada.objects.first()
+        self.client.delete(reverse('curriculum:fragmento_subida', kwargs={'pk': subida.pk}))
+        self.assertEqual(self.iniciar().status_code, 201)
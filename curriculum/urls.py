@@ -3,7 +3,7 @@ URLs del módulo curriculum
 """
 
 from django.urls import path
-from . import views
+from . import views, api
 
 app_name = 'curriculum'
 
@@ -12,7 +12,13 @@ urlpatterns = [
     # PÚBLICAS
     # ======================================
     path('', views.HomeView.as_view(), name='home'),
+    path('cvs/', views.DirectorioCVView.as_view(), name='directorio'),
     path('cv/<slug:slug>/', views.CVPublicoView.as_view(), name='cv_publico'),
+    path('cv/<slug:slug>/og.png', views.imagen_og_view, name='cv_imagen_og'),
+    path('cv/<slug:slug>/pdf/', views.descargar_cv_publico_pdf, name='cv_publico_pdf'),
+    path('sitemap.xml', views.sitemap_indice, name='sitemap'),
+    path('sitemap-cvs-<int:pagina>.xml', views.sitemap_cvs, name='sitemap_cvs'),
+    path('robots.txt', views.robots_txt, name='robots'),
     
     # ======================================
     # AUTENTICACIÓN
@@ -20,11 +26,13 @@ urlpatterns = [
     path('registro/', views.registro_view, name='registro'),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
+    path('csrf/', views.token_csrf, name='csrf'),
     
     # ======================================
     # DASHBOARD
     # ======================================
     path('dashboard/', views.DashboardView.as_view(), name='dashboard'),
+    path('dashboard/fragmentos/<str:nombre>/', views.fragmento_dashboard, name='fragmento_dashboard'),
     path('mi-cv/', views.VerCVView.as_view(), name='ver_cv'),
     
     # ======================================
@@ -77,9 +85,38 @@ urlpatterns = [
     path('certificacion/<int:pk>/editar/', views.EditarCertificacionView.as_view(), name='editar_certificacion'),
     path('certificacion/<int:pk>/eliminar/', views.EliminarCertificacionView.as_view(), name='eliminar_certificacion'),
     
+    # ======================================
+    # EDICIÓN MASIVA DE SECCIONES
+    # ======================================
+    path('secciones/<str:seccion>/', views.edicion_masiva_view, name='edicion_masiva'),
+    path('secciones/<str:seccion>/orden/', views.reordenar_seccion, name='reordenar_seccion'),
+    
+    # ======================================
+    # BORRADORES DE FORMULARIOS
+    # ======================================
+    path('borradores/', views.borrador_formulario, name='borrador_formulario'),
+    
+    # ======================================
+    # SUBIDAS DE CERTIFICADOS POR FRAGMENTOS
+    # ======================================
+    path('subidas/', views.iniciar_subida, name='iniciar_subida'),
+    path('subidas/<uuid:pk>/', views.fragmento_subida, name='fragmento_subida'),
+    
     # ======================================
     # GENERACIÓN DE PDF
     # ======================================
     path('descargar-cv/', views.descargar_cv_pdf, name='descargar_cv'),
     path('visualizar-cv/', views.visualizar_cv_pdf, name='visualizar_cv'),
+    
+    # ======================================
+    # EXPORTACIÓN JSON RESUME
+    # ======================================
+    path('exportar/json-resume/', views.exportar_json_resume, name='exportar_json_resume'),
+    path('cvs/exportar.jsonl', views.exportar_cvs_publicos, name='exportar_cvs_publicos'),
+    
+    # ======================================
+    # API (SOLO LECTURA)
+    # ======================================
+    path('api/v1/perfiles/', api.PerfilListAPIView.as_view(), name='api_perfiles'),
+    path('api/v1/perfiles/<slug:slug>/', api.PerfilDetailAPIView.as_view(), name='api_perfil'),
 ]
@@ -2,6 +2,9 @@
 Vistas para el Sistema de CV Profesional
 """
 
+import json
+import re
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
@@ -10,9 +13,16 @@ from django.contrib import messages
 from django.views.generic import (
     ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
 )
-from django.urls import reverse_lazy
-from django.http import HttpResponse, FileResponse, Http404
+from django.urls import reverse, reverse_lazy
+from django.utils.http import urlencode
+from django.template.defaultfilters import pluralize
+from django.http import HttpResponse, FileResponse, Http404, StreamingHttpResponse, JsonResponse
+from django.middleware.csrf import get_token
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_POST, require_http_methods
 from django.db.models import Q, Count
+from django.core.exceptions import ValidationError
 from .models import (
     PerfilProfesional,
     FormacionAcademica,
@@ -20,7 +30,8 @@ from .models import (
     Habilidad,
     Proyecto,
     ReferenciaProfesional,
-    Certificacion
+    Certificacion,
+    SubidaFragmentada
 )
 from .forms import (
     RegistroUsuarioForm,
@@ -34,12 +45,22 @@ from .forms import (
     CertificacionForm
 )
 from .pdf_generator import generar_cv_pdf
+from . import contadores, imagen_og, sitemap
+from .busqueda import buscar_perfiles
+from .habilidades import filtrar_por_habilidad, facetas_habilidades
+from .paginacion import CursorInvalido, PaginadorKeyset, paginar_lista
+from .json_resume import exportar_json_lines
+from .analitica import registrar_evento, actividad_diaria, total_visitas
+from .cache_paginas import cache_anonima
+from . import borradores, edicion_masiva, fragmentos, orden, subidas
+from .fragmentos import FragmentosSeccionMixin
 
 
 # ======================================
 # VISTAS PÚBLICAS
 # ======================================
 
+@method_decorator(cache_anonima, name='dispatch')
 class HomeView(TemplateView):
     """
     Página principal
@@ -48,8 +69,9 @@ class HomeView(TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['total_usuarios'] = PerfilProfesional.objects.count()
-        context['cvs_publicos'] = PerfilProfesional.objects.filter(cv_publico=True).count()
+        totales = contadores.obtener()
+        context['total_usuarios'] = totales['perfiles']
+        context['cvs_publicos'] = totales['cvs_publicos']
         return context
 
 
@@ -66,17 +88,105 @@ class CVPublicoView(DetailView):
     def get_queryset(self):
         return PerfilProfesional.objects.filter(cv_publico=True)
     
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        # El dueño revisando su propio CV no cuenta como visita
+        if self.object.usuario_id != request.user.pk:
+            registrar_evento(self.object.pk, 'visita')
+        return response
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         perfil = self.object
         
         context['formacion'] = perfil.formacion_academica.all()[:5]
         context['experiencias'] = perfil.experiencias.all()[:10]
-        context['habilidades'] = perfil.habilidades.all()[:20]
+        context['habilidades'] = list(perfil.habilidades.all()[:20])
         context['proyectos'] = perfil.proyectos.filter(destacado=True)[:6]
         context['certificaciones'] = perfil.certificaciones.all()[:10]
         context['referencias'] = perfil.referencias.all()[:3]
         
+        # Imagen para redes sociales: URL directa si ya está generada, si no la vista que la genera
+        og_url = imagen_og.url_vigente(perfil, imagen_og.habilidades_principales(context['habilidades']))
+        context['og_imagen_url'] = self.request.build_absolute_uri(
+            og_url or reverse('curriculum:cv_imagen_og', kwargs={'slug': perfil.slug})
+        )
+        
+        return context
+
+
+def imagen_og_view(request, slug):
+    """
+    Imagen Open Graph de un CV público; se genera solo si cambió lo que muestra
+    """
+    perfil = get_object_or_404(PerfilProfesional, slug=slug, cv_publico=True)
+    habilidades = imagen_og.habilidades_principales(perfil.habilidades.all()[:imagen_og.MAX_HABILIDADES])
+    response = redirect(imagen_og.obtener_imagen_og(perfil, habilidades))
+    response['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+
+class DirectorioCVView(ListView):
+    """
+    Directorio de CVs públicos con búsqueda de texto completo.
+    Paginado por cursor (keyset), sin OFFSET.
+    """
+    model = PerfilProfesional
+    template_name = 'curriculum/cv/directorio.html'
+    context_object_name = 'perfiles'
+    paginate_by = 20
+
+    def get_queryset(self):
+        self.consulta = self.request.GET.get('q', '').strip()
+        self.habilidad = self.request.GET.get('habilidad', '').strip()
+        try:
+            self.nivel_minimo = max(0, min(100, int(self.request.GET.get('nivel', 0))))
+        except ValueError:
+            self.nivel_minimo = 0
+
+        queryset = PerfilProfesional.objects.filter(cv_publico=True).only(
+            'nombres', 'apellidos', 'foto', 'foto_variantes', 'titulo_profesional',
+            'ciudad', 'pais', 'slug', 'fecha_actualizacion'
+        )
+
+        if self.habilidad:
+            queryset = filtrar_por_habilidad(queryset, self.habilidad, self.nivel_minimo)
+
+        return queryset
+
+    def paginate_queryset(self, queryset, page_size):
+        cursor = self.request.GET.get('cursor')
+
+        try:
+            if self.consulta:
+                # Los ids llegan ordenados por relevancia desde el índice (lista acotada)
+                ids = buscar_perfiles(self.consulta)
+                visibles = set(queryset.filter(pk__in=ids).values_list('id', flat=True)) if ids else set()
+                pagina = paginar_lista([pk for pk in ids if pk in visibles], page_size, cursor)
+                perfiles = queryset.in_bulk(pagina.objetos)
+                pagina.objetos = [perfiles[pk] for pk in pagina.objetos if pk in perfiles]
+            else:
+                paginador = PaginadorKeyset(queryset, page_size)
+                pagina = paginador.pagina(cursor)
+        except CursorInvalido as error:
+            # Igual que MultipleObjectMixin con una página inválida
+            raise Http404(str(error))
+
+        return None, pagina, pagina.objetos, pagina.tiene_siguiente or pagina.tiene_anterior
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['consulta'] = self.consulta
+        context['habilidad'] = self.habilidad
+        context['nivel_minimo'] = self.nivel_minimo
+        context['facetas'] = facetas_habilidades()
+        context['filtros'] = urlencode({
+            clave: valor for clave, valor in (
+                ('q', self.consulta),
+                ('habilidad', self.habilidad),
+                ('nivel', self.nivel_minimo or ''),
+            ) if valor
+        })
         return context
 
 
@@ -84,6 +194,7 @@ class CVPublicoView(DetailView):
 # AUTENTICACIÓN
 # ======================================
 
+@cache_anonima
 def registro_view(request):
     """
     Registro de nuevos usuarios
@@ -104,6 +215,7 @@ def registro_view(request):
     return render(request, 'curriculum/auth/register.html', {'form': form})
 
 
+@cache_anonima
 def login_view(request):
     """
     Login de usuarios
@@ -137,6 +249,14 @@ def login_view(request):
     return render(request, 'curriculum/auth/login.html', {'form': form})
 
 
+@never_cache
+def token_csrf(request):
+    """
+    Token CSRF para los formularios de páginas servidas desde la caché
+    """
+    return JsonResponse({'token': get_token(request)})
+
+
 @login_required
 def logout_view(request):
     """
@@ -161,43 +281,33 @@ class DashboardView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        try:
-            perfil = self.request.user.perfil
-            context['tiene_perfil'] = True
+        perfil = self.request.perfil
+        context['tiene_perfil'] = bool(perfil)
+        if perfil:
             context['perfil'] = perfil
             
-            # Estadísticas
-            context['stats'] = {
-                'formacion': perfil.formacion_academica.count(),
-                'experiencias': perfil.experiencias.count(),
-                'habilidades': perfil.habilidades.count(),
-                'proyectos': perfil.proyectos.count(),
-                'certificaciones': perfil.certificaciones.count(),
-                'referencias': perfil.referencias.count(),
-            }
-            
-            # Progreso del CV (porcentaje de completitud)
-            total_secciones = 6
-            secciones_completas = sum([
-                1 if context['stats']['formacion'] > 0 else 0,
-                1 if context['stats']['experiencias'] > 0 else 0,
-                1 if context['stats']['habilidades'] > 0 else 0,
-                1 if context['stats']['proyectos'] > 0 else 0,
-                1 if perfil.resumen_profesional else 0,
-                1 if perfil.foto else 0,
-            ])
-            context['progreso'] = int((secciones_completas / total_secciones) * 100)
-            
-            # Últimas actualizaciones
-            context['ultimas_experiencias'] = perfil.experiencias.all()[:3]
-            context['ultimos_proyectos'] = perfil.proyectos.all()[:3]
-            
-        except PerfilProfesional.DoesNotExist:
-            context['tiene_perfil'] = False
+            # Estadísticas, progreso y últimas actualizaciones: los mismos
+            # fragmentos que se refrescan en el lugar tras cada edición
+            context.update(fragmentos.contexto(perfil))
+            context['visitas'] = total_visitas(perfil)
+            context['actividad'] = actividad_diaria(perfil)
         
         return context
 
 
+@login_required
+def fragmento_dashboard(request, nombre):
+    """
+    Un fragmento HTML del dashboard (Ej: para refrescarlo con loadContent)
+    """
+    if nombre not in fragmentos.FRAGMENTOS:
+        raise Http404
+    try:
+        return HttpResponse(fragmentos.renderizar(request, [nombre])[nombre])
+    except PerfilProfesional.DoesNotExist:
+        raise Http404
+
+
 # ======================================
 # PERFIL PROFESIONAL
 # ======================================
@@ -212,13 +322,14 @@ class CrearPerfilView(LoginRequiredMixin, CreateView):
     success_url = reverse_lazy('curriculum:dashboard')
     
     def dispatch(self, request, *args, **kwargs):
-        if hasattr(request.user, 'perfil'):
+        if request.perfil:
             messages.warning(request, 'Ya tienes un perfil creado.')
             return redirect('curriculum:editar_perfil')
         return super().dispatch(request, *args, **kwargs)
     
     def form_valid(self, form):
         form.instance.usuario = self.request.user
+        borradores.descartar(self.request.user.pk, self.request.path)
         messages.success(self.request, '¡Perfil creado exitosamente!')
         return super().form_valid(form)
 
@@ -230,15 +341,16 @@ class EditarPerfilView(LoginRequiredMixin, UpdateView):
     success_url = reverse_lazy('curriculum:dashboard')
 
     def dispatch(self, request, *args, **kwargs):
-        if not hasattr(request.user, 'perfil'):
+        if not request.perfil:
             messages.warning(request, "Debes crear tu perfil primero.")
             return redirect('curriculum:crear_perfil')
         return super().dispatch(request, *args, **kwargs)
 
     def get_object(self):
-        return self.request.user.perfil
+        return self.request.perfil
 
     def form_valid(self, form):
+        borradores.descartar(self.request.user.pk, self.request.path)
         messages.success(self.request, 'Perfil actualizado correctamente.')
         return super().form_valid(form)
 
@@ -251,8 +363,14 @@ class VerCVView(LoginRequiredMixin, DetailView):
     template_name = 'curriculum/cv/view_cv.html'
     context_object_name = 'perfil'
     
+    def dispatch(self, request, *args, **kwargs):
+        if request.user.is_authenticated and not request.perfil:
+            messages.warning(request, "Debes crear tu perfil primero.")
+            return redirect('curriculum:crear_perfil')
+        return super().dispatch(request, *args, **kwargs)
+    
     def get_object(self):
-        return self.request.user.perfil
+        return self.request.perfil
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -272,220 +390,379 @@ class VerCVView(LoginRequiredMixin, DetailView):
 # FORMACIÓN ACADÉMICA
 # ======================================
 
-class CrearFormacionView(LoginRequiredMixin, CreateView):
+class CrearFormacionView(LoginRequiredMixin, FragmentosSeccionMixin, CreateView):
     model = FormacionAcademica
     form_class = FormacionAcademicaForm
     template_name = 'curriculum/sections/educacion_form.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Formación académica agregada.'
     
     def form_valid(self, form):
-        form.instance.perfil = self.request.user.perfil
-        messages.success(self.request, 'Formación académica agregada.')
+        form.instance.perfil = self.request.perfil
         return super().form_valid(form)
 
 
-class EditarFormacionView(LoginRequiredMixin, UpdateView):
+class EditarFormacionView(LoginRequiredMixin, FragmentosSeccionMixin, UpdateView):
     model = FormacionAcademica
     form_class = FormacionAcademicaForm
     template_name = 'curriculum/sections/educacion_form.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Formación académica actualizada.'
     
     def get_queryset(self):
-        return FormacionAcademica.objects.filter(perfil=self.request.user.perfil)
-    
-    def form_valid(self, form):
-        messages.success(self.request, 'Formación académica actualizada.')
-        return super().form_valid(form)
+        return FormacionAcademica.objects.filter(perfil=self.request.perfil)
 
 
-class EliminarFormacionView(LoginRequiredMixin, DeleteView):
+class EliminarFormacionView(LoginRequiredMixin, FragmentosSeccionMixin, DeleteView):
     model = FormacionAcademica
+    template_name = 'curriculum/sections/confirmar_eliminar.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Formación académica eliminada.'
     
     def get_queryset(self):
-        return FormacionAcademica.objects.filter(perfil=self.request.user.perfil)
-    
-    def delete(self, request, *args, **kwargs):
-        messages.success(request, 'Formación académica eliminada.')
-        return super().delete(request, *args, **kwargs)
+        return FormacionAcademica.objects.filter(perfil=self.request.perfil)
 
 
 # ======================================
 # EXPERIENCIA PROFESIONAL
 # ======================================
 
-class CrearExperienciaView(LoginRequiredMixin, CreateView):
+class CrearExperienciaView(LoginRequiredMixin, FragmentosSeccionMixin, CreateView):
     model = ExperienciaProfesional
     form_class = ExperienciaProfesionalForm
     template_name = 'curriculum/sections/experiencia_form.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Experiencia profesional agregada.'
+    fragmentos = ['estadisticas', 'progreso', 'experiencias']
     
     def form_valid(self, form):
-        form.instance.perfil = self.request.user.perfil
-        messages.success(self.request, 'Experiencia profesional agregada.')
+        form.instance.perfil = self.request.perfil
         return super().form_valid(form)
 
 
-class EditarExperienciaView(LoginRequiredMixin, UpdateView):
+class EditarExperienciaView(LoginRequiredMixin, FragmentosSeccionMixin, UpdateView):
     model = ExperienciaProfesional
     form_class = ExperienciaProfesionalForm
     template_name = 'curriculum/sections/experiencia_form.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Experiencia profesional actualizada.'
+    fragmentos = ['estadisticas', 'progreso', 'experiencias']
     
     def get_queryset(self):
-        return ExperienciaProfesional.objects.filter(perfil=self.request.user.perfil)
-    
-    def form_valid(self, form):
-        messages.success(self.request, 'Experiencia profesional actualizada.')
-        return super().form_valid(form)
+        return ExperienciaProfesional.objects.filter(perfil=self.request.perfil)
 
 
-class EliminarExperienciaView(LoginRequiredMixin, DeleteView):
+class EliminarExperienciaView(LoginRequiredMixin, FragmentosSeccionMixin, DeleteView):
     model = ExperienciaProfesional
+    template_name = 'curriculum/sections/confirmar_eliminar.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Experiencia profesional eliminada.'
+    fragmentos = ['estadisticas', 'progreso', 'experiencias']
     
     def get_queryset(self):
-        return ExperienciaProfesional.objects.filter(perfil=self.request.user.perfil)
-    
-    def delete(self, request, *args, **kwargs):
-        messages.success(request, 'Experiencia profesional eliminada.')
-        return super().delete(request, *args, **kwargs)
+        return ExperienciaProfesional.objects.filter(perfil=self.request.perfil)
 
 
 # ======================================
 # HABILIDADES
 # ======================================
 
-class CrearHabilidadView(LoginRequiredMixin, CreateView):
+class CrearHabilidadView(LoginRequiredMixin, FragmentosSeccionMixin, CreateView):
     model = Habilidad
     form_class = HabilidadForm
     template_name = 'curriculum/sections/habilidades_form.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Habilidad agregada.'
     
     def form_valid(self, form):
-        form.instance.perfil = self.request.user.perfil
-        messages.success(self.request, 'Habilidad agregada.')
+        form.instance.perfil = self.request.perfil
         return super().form_valid(form)
 
 
-class EditarHabilidadView(LoginRequiredMixin, UpdateView):
+class EditarHabilidadView(LoginRequiredMixin, FragmentosSeccionMixin, UpdateView):
     model = Habilidad
     form_class = HabilidadForm
     template_name = 'curriculum/sections/habilidades_form.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Habilidad actualizada.'
     
     def get_queryset(self):
-        return Habilidad.objects.filter(perfil=self.request.user.perfil)
+        return Habilidad.objects.filter(perfil=self.request.perfil)
 
 
-class EliminarHabilidadView(LoginRequiredMixin, DeleteView):
+class EliminarHabilidadView(LoginRequiredMixin, FragmentosSeccionMixin, DeleteView):
     model = Habilidad
+    template_name = 'curriculum/sections/confirmar_eliminar.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Habilidad eliminada.'
     
     def get_queryset(self):
-        return Habilidad.objects.filter(perfil=self.request.user.perfil)
+        return Habilidad.objects.filter(perfil=self.request.perfil)
 
 
 # ======================================
 # PROYECTOS
 # ======================================
 
-class CrearProyectoView(LoginRequiredMixin, CreateView):
+class CrearProyectoView(LoginRequiredMixin, FragmentosSeccionMixin, CreateView):
     model = Proyecto
     form_class = ProyectoForm
     template_name = 'curriculum/sections/proyectos_form.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Proyecto agregado.'
+    fragmentos = ['estadisticas', 'progreso', 'proyectos']
     
     def form_valid(self, form):
-        form.instance.perfil = self.request.user.perfil
-        messages.success(self.request, 'Proyecto agregado.')
+        form.instance.perfil = self.request.perfil
         return super().form_valid(form)
 
 
-class EditarProyectoView(LoginRequiredMixin, UpdateView):
+class EditarProyectoView(LoginRequiredMixin, FragmentosSeccionMixin, UpdateView):
     model = Proyecto
     form_class = ProyectoForm
     template_name = 'curriculum/sections/proyectos_form.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Proyecto actualizado.'
+    fragmentos = ['estadisticas', 'progreso', 'proyectos']
     
     def get_queryset(self):
-        return Proyecto.objects.filter(perfil=self.request.user.perfil)
+        return Proyecto.objects.filter(perfil=self.request.perfil)
 
 
-class EliminarProyectoView(LoginRequiredMixin, DeleteView):
+class EliminarProyectoView(LoginRequiredMixin, FragmentosSeccionMixin, DeleteView):
     model = Proyecto
+    template_name = 'curriculum/sections/confirmar_eliminar.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Proyecto eliminado.'
+    fragmentos = ['estadisticas', 'progreso', 'proyectos']
     
     def get_queryset(self):
-        return Proyecto.objects.filter(perfil=self.request.user.perfil)
+        return Proyecto.objects.filter(perfil=self.request.perfil)
 
 
 # ======================================
 # REFERENCIAS
 # ======================================
 
-class CrearReferenciaView(LoginRequiredMixin, CreateView):
+class CrearReferenciaView(LoginRequiredMixin, FragmentosSeccionMixin, CreateView):
     model = ReferenciaProfesional
     form_class = ReferenciaProfesionalForm
     template_name = 'curriculum/sections/referencias_form.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Referencia agregada.'
     
     def form_valid(self, form):
-        form.instance.perfil = self.request.user.perfil
-        messages.success(self.request, 'Referencia agregada.')
+        form.instance.perfil = self.request.perfil
         return super().form_valid(form)
 
 
-class EditarReferenciaView(LoginRequiredMixin, UpdateView):
+class EditarReferenciaView(LoginRequiredMixin, FragmentosSeccionMixin, UpdateView):
     model = ReferenciaProfesional
     form_class = ReferenciaProfesionalForm
     template_name = 'curriculum/sections/referencias_form.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Referencia actualizada.'
     
     def get_queryset(self):
-        return ReferenciaProfesional.objects.filter(perfil=self.request.user.perfil)
+        return ReferenciaProfesional.objects.filter(perfil=self.request.perfil)
 
 
-class EliminarReferenciaView(LoginRequiredMixin, DeleteView):
+class EliminarReferenciaView(LoginRequiredMixin, FragmentosSeccionMixin, DeleteView):
     model = ReferenciaProfesional
+    template_name = 'curriculum/sections/confirmar_eliminar.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Referencia eliminada.'
     
     def get_queryset(self):
-        return ReferenciaProfesional.objects.filter(perfil=self.request.user.perfil)
+        return ReferenciaProfesional.objects.filter(perfil=self.request.perfil)
 
 
 # ======================================
 # CERTIFICACIONES
 # ======================================
 
-class CrearCertificacionView(LoginRequiredMixin, CreateView):
+class CrearCertificacionView(LoginRequiredMixin, FragmentosSeccionMixin, CreateView):
     model = Certificacion
     form_class = CertificacionForm
     template_name = 'curriculum/sections/certificacion_form.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Certificación agregada.'
     
     def form_valid(self, form):
-        form.instance.perfil = self.request.user.perfil
-        messages.success(self.request, 'Certificación agregada.')
+        form.instance.perfil = self.request.perfil
         return super().form_valid(form)
 
 
-class EditarCertificacionView(LoginRequiredMixin, UpdateView):
+class EditarCertificacionView(LoginRequiredMixin, FragmentosSeccionMixin, UpdateView):
     model = Certificacion
     form_class = CertificacionForm
     template_name = 'curriculum/sections/certificacion_form.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Certificación actualizada.'
     
     def get_queryset(self):
-        return Certificacion.objects.filter(perfil=self.request.user.perfil)
+        return Certificacion.objects.filter(perfil=self.request.perfil)
 
 
-class EliminarCertificacionView(LoginRequiredMixin, DeleteView):
+class EliminarCertificacionView(LoginRequiredMixin, FragmentosSeccionMixin, DeleteView):
     model = Certificacion
+    template_name = 'curriculum/sections/confirmar_eliminar.html'
     success_url = reverse_lazy('curriculum:dashboard')
+    mensaje_exito = 'Certificación eliminada.'
     
     def get_queryset(self):
-        return Certificacion.objects.filter(perfil=self.request.user.perfil)
+        return Certificacion.objects.filter(perfil=self.request.perfil)
+
+
+# ======================================
+# EDICIÓN MASIVA DE SECCIONES
+# ======================================
+
+@login_required
+def edicion_masiva_view(request, seccion):
+    """
+    Edita todas las filas de una sección en un solo formulario
+    """
+    FormSet = edicion_masiva.formset_de(seccion)
+    if FormSet is None:
+        raise Http404
+    if not request.perfil:
+        messages.warning(request, "Debes crear tu perfil primero.")
+        return redirect('curriculum:crear_perfil')
+    
+    perfil = request.perfil
+    if request.method == 'POST':
+        formset = FormSet(request.POST, request.FILES, perfil=perfil)
+        if formset.is_valid():
+            creadas, actualizadas, eliminadas = edicion_masiva.guardar(formset)
+            messages.success(
+                request,
+                f'Cambios guardados: {creadas} agregada{pluralize(creadas)}, '
+                f'{actualizadas} actualizada{pluralize(actualizadas)}, '
+                f'{eliminadas} eliminada{pluralize(eliminadas)}.'
+            )
+            return redirect('curriculum:dashboard')
+    else:
+        formset = FormSet(perfil=perfil)
+    
+    return render(request, 'curriculum/sections/edicion_masiva.html', {
+        'formset': formset,
+        'titulo': edicion_masiva.SECCIONES[seccion][2],
+        'seccion': seccion,
+    })
+
+
+@login_required
+@require_POST
+def reordenar_seccion(request, seccion):
+    """
+    Guarda el orden de una sección tras arrastrar y soltar.
+    Recibe JSON {"ids": [...]} con todas las filas de la sección en el nuevo orden.
+    """
+    if seccion not in edicion_masiva.SECCIONES or not request.perfil:
+        raise Http404
+    try:
+        ids = [int(pk) for pk in json.loads(request.body)['ids']]
+        reescritas = orden.reordenar(request.perfil, edicion_masiva.SECCIONES[seccion][0], ids)
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'Orden no válido. Recarga la página e inténtalo de nuevo.'}, status=400)
+    return JsonResponse({'reescritas': reescritas})
+
+
+# ======================================
+# BORRADORES DE FORMULARIOS
+# ======================================
+
+@never_cache
+@login_required
+@require_http_methods(['GET', 'POST', 'DELETE'])
+def borrador_formulario(request):
+    """
+    Borrador autoguardado del formulario de la página `clave`.
+    GET ?clave= devuelve {"datos": {...}}; POST recibe JSON {"clave", "cambios"}
+    con solo los campos modificados; DELETE ?clave= lo descarta.
+    """
+    if request.method == 'POST':
+        try:
+            datos = json.loads(request.body)
+            borradores.guardar_parche(request.user.pk, datos['clave'], datos['cambios'])
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({'error': 'Borrador no válido.'}, status=400)
+        return HttpResponse(status=202)
+
+    clave = request.GET.get('clave', '')
+    if request.method == 'DELETE':
+        borradores.descartar(request.user.pk, clave)
+        return HttpResponse(status=204)
+    return JsonResponse({'datos': borradores.obtener(request.user.pk, clave)})
+
+
+# ======================================
+# SUBIDAS DE CERTIFICADOS POR FRAGMENTOS
+# ======================================
+
+RANGO_FRAGMENTO = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+def _estado_subida(subida, status=200):
+    return JsonResponse({
+        'id': str(subida.pk),
+        'recibidos': subida.recibidos,
+        'tamano': subida.tamano,
+        'completa': subida.completa,
+        'tamano_fragmento': subidas.TAMANO_FRAGMENTO,
+    }, status=status)
+
+
+@never_cache
+@login_required
+@require_POST
+def iniciar_subida(request):
+    """
+    Crea una subida por fragmentos. Recibe JSON {"nombre", "tamano"}.
+    """
+    try:
+        datos = json.loads(request.body)
+        subida = subidas.iniciar(request.user, datos['nombre'], int(datos['tamano']))
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'Subida no válida.'}, status=400)
+    except ValidationError as error:
+        return JsonResponse({'error': error.messages[0]}, status=400)
+    return _estado_subida(subida, status=201)
+
+
+@never_cache
+@login_required
+@require_http_methods(['GET', 'PUT', 'DELETE'])
+def fragmento_subida(request, pk):
+    """
+    GET devuelve cuánto se recibió (para reanudar); PUT agrega un fragmento
+    con Content-Range: bytes <inicio>-<fin>/<total>; DELETE cancela la subida.
+    El cuerpo del PUT se lee por bloques, nunca completo en memoria.
+    """
+    subida = get_object_or_404(SubidaFragmentada, pk=pk, usuario=request.user)
+
+    if request.method == 'DELETE':
+        subidas.descartar(subida)
+        return HttpResponse(status=204)
+    if request.method == 'GET':
+        return _estado_subida(subida)
+
+    rango = RANGO_FRAGMENTO.match(request.headers.get('Content-Range', ''))
+    try:
+        longitud = int(request.headers.get('Content-Length') or 0)
+    except ValueError:
+        longitud = 0
+    if not rango or int(rango[3]) != subida.tamano or int(rango[2]) - int(rango[1]) + 1 != longitud:
+        return JsonResponse({'error': 'Content-Range no válido.'}, status=400)
+
+    try:
+        subidas.agregar_fragmento(subida, int(rango[1]), request, longitud)
+    except subidas.FragmentoFueraDeOrden as error:
+        return JsonResponse({'error': 'Fragmento fuera de orden.', 'recibidos': error.recibidos}, status=409)
+    except ValidationError as error:
+        return JsonResponse({'error': error.messages[0]}, status=400)
+    return _estado_subida(subida)
 
 
 # ======================================
@@ -497,33 +774,115 @@ def descargar_cv_pdf(request):
     """
     Descargar CV en formato PDF
     """
-    try:
-        perfil = request.user.perfil
-        pdf_buffer = generar_cv_pdf(perfil)
-        
-        response = HttpResponse(pdf_buffer, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="CV_{perfil.nombre_completo}.pdf"'
-        
-        return response
-    
-    except PerfilProfesional.DoesNotExist:
+    perfil = request.perfil
+    if not perfil:
         messages.error(request, 'Debes crear tu perfil primero.')
         return redirect('curriculum:crear_perfil')
+    
+    pdf_buffer = generar_cv_pdf(perfil)
+    
+    response = HttpResponse(pdf_buffer, content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="CV_{perfil.nombre_completo}.pdf"'
+    
+    return response
+
+def descargar_cv_publico_pdf(request, slug):
+    """
+    Descargar en PDF un CV público
+    """
+    perfil = get_object_or_404(PerfilProfesional, slug=slug, cv_publico=True)
+    # Sin teléfono: solo los datos de contacto que muestra el CV público
+    pdf_buffer = generar_cv_pdf(perfil, publico=True)
+    if perfil.usuario_id != request.user.pk:
+        registrar_evento(perfil.pk, 'descarga_pdf')
+    
+    response = HttpResponse(pdf_buffer, content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="CV_{perfil.nombre_completo}.pdf"'
+    return response
 
 @login_required
 def visualizar_cv_pdf(request):
     """
     Visualizar CV en el navegador
     """
-    try:
-        perfil = request.user.perfil
-        pdf_buffer = generar_cv_pdf(perfil)
-        
-        return HttpResponse(pdf_buffer, content_type='application/pdf')
+    perfil = request.perfil
+    if not perfil:
+        messages.error(request, 'Debes crear tu perfil primero.')
+        return redirect('curriculum:crear_perfil')
     
-    except PerfilProfesional.DoesNotExist:
+    pdf_buffer = generar_cv_pdf(perfil)
+    
+    return HttpResponse(pdf_buffer, content_type='application/pdf')
+
+
+# ======================================
+# EXPORTACIÓN JSON RESUME
+# ======================================
+
+@login_required
+def exportar_json_resume(request):
+    """
+    Descargar el CV propio en formato JSON Resume (incluye teléfono y referencias)
+    """
+    if not request.perfil:
         messages.error(request, 'Debes crear tu perfil primero.')
         return redirect('curriculum:crear_perfil')
+    perfil = PerfilProfesional.objects.filter(pk=request.perfil.pk)
+
+    response = StreamingHttpResponse(
+        exportar_json_lines(perfil, publico=False, url_absoluta=request.build_absolute_uri),
+        content_type='application/x-ndjson; charset=utf-8'
+    )
+    response['Content-Disposition'] = 'attachment; filename="cv.jsonl"'
+    return response
+
+
+def exportar_cvs_publicos(request):
+    """
+    Todos los CVs públicos en JSON Resume, un CV por línea (streaming)
+    """
+    response = StreamingHttpResponse(
+        exportar_json_lines(
+            PerfilProfesional.objects.filter(cv_publico=True),
+            url_absoluta=request.build_absolute_uri
+        ),
+        content_type='application/x-ndjson; charset=utf-8'
+    )
+    response['Content-Disposition'] = 'attachment; filename="cvs-publicos.jsonl"'
+    return response
+
+
+# ======================================
+# SITEMAP
+# ======================================
+
+def _respuesta_sitemap(request, nombre, generar):
+    """
+    Sirve el XML desde la caché o lo genera en streaming (y lo cachea)
+    """
+    base = f"{request.scheme}://{request.get_host()}"
+    contenido = sitemap.contenido_en_cache(nombre, base)
+    if contenido is not None:
+        return HttpResponse(contenido, content_type='application/xml; charset=utf-8')
+    return StreamingHttpResponse(
+        sitemap.generar_y_cachear(nombre, base, generar(base)),
+        content_type='application/xml; charset=utf-8'
+    )
+
+
+def sitemap_indice(request):
+    return _respuesta_sitemap(request, 'indice', sitemap.xml_indice)
+
+
+def sitemap_cvs(request, pagina):
+    if pagina < 1:
+        raise Http404
+    return _respuesta_sitemap(request, f'cvs:{pagina}', lambda base: sitemap.xml_pagina(base, pagina))
+
+
+def robots_txt(request):
+    url = request.build_absolute_uri(reverse('curriculum:sitemap'))
+    return HttpResponse(f"User-agent: *\nDisallow: /admin/\n\nSitemap: {url}\n", content_type='text/plain')
 
 
 # ======================================